@@ -1,8 +1,11 @@
+import asyncio
 import importlib.util
 import logging
+import os
 import sys
 from contextlib import asynccontextmanager
-from typing import Callable, TypeVar
+from pathlib import Path
+from typing import Callable, Mapping, NamedTuple, Sequence, TypeVar
 
 import tomllib
 from fastapi import FastAPI
@@ -14,17 +17,25 @@ from langchain_tool_server import root
 from langchain_tool_server._version import __version__
 from langchain_tool_server.auth import Auth
 from langchain_tool_server.auth.middleware import (
+    NamespacedAuthenticationBackend,
     ServerAuthenticationBackend,
     on_auth_error,
 )
+from langchain_tool_server.cache import CachePolicy
 from langchain_tool_server.context import Context
+from langchain_tool_server.executors import ExecutorRegistry
 from langchain_tool_server.mcp_loader import load_mcp_servers_tools
+from langchain_tool_server.serialization import ORJSONResponse
+from langchain_tool_server.sessions import SessionStore
 from langchain_tool_server.splash import SPLASH
 from langchain_tool_server.tool import tool
 from langchain_tool_server.tools import (
+    CatalogChange,
     InjectedRequest,
+    ToolCallError,
     ToolHandler,
     create_tools_router,
+    tool_call_error_handler,
     validation_exception_handler,
 )
 
@@ -204,6 +215,288 @@ def _load_tools_object(path: str, package_dir) -> list:
         raise FileNotFoundError(f"Could not find tools file: {module_name}") from e
 
 
+TOOL_OPTIONS = {
+    "permissions",
+    "max_concurrency",
+    "max_queue",
+    "timeout",
+    "cache",
+    "coalesce",
+}
+"""Options that can be set per tool in the `[tools.<name>]` tables of toolkit.toml."""
+
+
+def _get_tool_options(toolkit_config: dict) -> dict[str, dict]:
+    """Get the per-tool options from a toolkit configuration.
+
+    Example:
+        [tools.search]
+        permissions = ["search"]
+        max_concurrency = 4
+        max_queue = 16
+        cache = { ttl = 300, max_entries = 1000 }
+
+    Raises:
+        ValueError: If an unknown option is set.
+    """
+    tool_options = {}
+    for name, options in toolkit_config.get("tools", {}).items():
+        unknown = set(options) - TOOL_OPTIONS
+        if unknown:
+            raise ValueError(
+                f"Unknown option(s) for tool '{name}' in toolkit.toml: "
+                f"{', '.join(sorted(unknown))}. "
+                f"Supported options: {', '.join(sorted(TOOL_OPTIONS))}"
+            )
+        options = dict(options)
+        if "cache" in options:
+            options["cache"] = CachePolicy(**options["cache"])
+        tool_options[name] = options
+    return tool_options
+
+
+IGNORED_DIRS = {"__pycache__", "node_modules", ".git", ".venv", "venv", "env"}
+"""Directories of a toolkit that hold no toolkit code."""
+
+
+def _read_toolkit_config(toolkit_path: Path) -> tuple[dict, str]:
+    """Read toolkit.toml without loading the tools it points to.
+
+    Returns:
+        Tuple of (toolkit_config, tools_path)
+
+    Raises:
+        ValueError: If no tools path is specified in toolkit.toml
+    """
+    with open(toolkit_path / "toolkit.toml", "rb") as f:
+        toolkit_config = tomllib.load(f)
+
+    tools_path = toolkit_config.get("toolkit", {}).get("tools")
+    if not tools_path:
+        raise ValueError(
+            "No tools path specified in toolkit.toml. "
+            "Please add: tools = './path/to/file.py:TOOLS'"
+        )
+
+    return toolkit_config, tools_path
+
+
+def _read_toolkit(toolkit_path: Path) -> tuple[dict, str, list]:
+    """Read toolkit.toml and load the tools it points to.
+
+    Returns:
+        Tuple of (toolkit_config, tools_path, tools)
+
+    Raises:
+        ValueError: If no tools path is specified in toolkit.toml
+    """
+    toolkit_config, tools_path = _read_toolkit_config(toolkit_path)
+    return toolkit_config, tools_path, _load_tools_object(tools_path, toolkit_path)
+
+
+TOOLKITS_FILE = "toolkits.toml"
+"""Manifest listing the toolkits served by one server."""
+
+
+class _Toolkit(NamedTuple):
+    """A toolkit served by a server."""
+
+    path: Path
+    namespace: str | None
+    """Prefix of the tool IDs and permissions, when a server hosts several toolkits."""
+
+
+def _find_toolkits(
+    toolkit_dir: str | Sequence[str],
+) -> tuple[list[tuple[Path, str | None]], bool]:
+    """Find the toolkits to load from a toolkit directory, a list of them, or a
+    directory with a toolkits.toml manifest.
+
+    Example of toolkits.toml:
+        [[toolkits]]
+        path = "./weather"
+        namespace = "weather"  # Optional, defaults to the toolkit name
+
+        [[toolkits]]
+        path = "./search"
+
+    Returns:
+        Tuple of (toolkit paths with their declared namespaces, whether the
+        toolkits are namespaced)
+
+    Raises:
+        ValueError: If the manifest is invalid
+    """
+    if not isinstance(toolkit_dir, (str, os.PathLike)):
+        return [(Path(path).resolve(), None) for path in toolkit_dir], True
+
+    toolkit_path = Path(toolkit_dir).resolve()
+    manifest_path = toolkit_path / TOOLKITS_FILE
+    if (toolkit_path / "toolkit.toml").exists() or not manifest_path.exists():
+        return [(toolkit_path, None)], False
+
+    with open(manifest_path, "rb") as f:
+        manifest = tomllib.load(f)
+    toolkits = []
+    for entry in manifest.get("toolkits", []):
+        if "path" not in entry:
+            raise ValueError(f"Missing path of a toolkit in {manifest_path}")
+        toolkits.append(
+            ((toolkit_path / entry["path"]).resolve(), entry.get("namespace"))
+        )
+    if not toolkits:
+        raise ValueError(f"No toolkits listed in {manifest_path}")
+    return toolkits, True
+
+
+class _LoadedToolkit(NamedTuple):
+    """A toolkit with its configuration, tools and auth handler."""
+
+    toolkit: _Toolkit
+    config: dict
+    tools_path: str
+    tools: list
+    auth: Auth | None
+
+
+def _toolkit_namespace(
+    namespace: str | None, toolkit_config: dict, package_name: str, namespaces: set
+) -> str:
+    """Resolve the namespace of a toolkit served alongside others.
+
+    Raises:
+        ValueError: If the namespace is invalid or already taken
+    """
+    namespace = (
+        namespace or toolkit_config.get("toolkit", {}).get("name") or package_name
+    )
+    if ":" in namespace:
+        raise ValueError(
+            f"Invalid toolkit namespace '{namespace}': must not contain ':'"
+        )
+    if namespace in namespaces:
+        raise ValueError(
+            f"Duplicate toolkit namespace '{namespace}'. "
+            "Set a distinct namespace for each toolkit."
+        )
+    namespaces.add(namespace)
+    return namespace
+
+
+def _load_toolkit_auth(toolkit_config: dict, toolkit_path: Path) -> Auth | None:
+    """Load the auth handler of a toolkit, if it has one."""
+    auth_path = toolkit_config.get("toolkit", {}).get("auth")
+    if not auth_path:
+        return None
+
+    logger.info(f"Loading auth from path: {auth_path}")
+    try:
+        auth_instance = _load_auth_instance(auth_path, toolkit_path)
+        logger.info(f"Successfully loaded auth handler from {auth_path}")
+        return auth_instance
+    except Exception as e:
+        logger.error(f"Failed to load auth from {auth_path}: {e}")
+        import traceback
+
+        logger.error(f"Auth loading traceback:\n{traceback.format_exc()}")
+        raise e
+
+
+def _find_package_dir(toolkit_path: Path) -> Path:
+    """Find the package directory of a toolkit.
+
+    Raises:
+        ValueError: If no toolkit package found
+    """
+    # Find package directory (has __init__.py and is not hidden/cache)
+    package_dirs = [
+        d
+        for d in toolkit_path.iterdir()
+        if d.is_dir()
+        and (d / "__init__.py").exists()
+        and not d.name.startswith(".")
+        and d.name not in IGNORED_DIRS
+    ]
+
+    if not package_dirs:
+        raise ValueError(f"No toolkit package found in {toolkit_path}")
+
+    return package_dirs[0]
+
+
+def _toolkit_entries(
+    toolkit_config: dict, tools: list, namespace: str | None
+) -> list[tuple[object, dict]]:
+    """Pair the tools of a toolkit with the options to register them with.
+
+    The permissions of the tools of a namespaced toolkit are prefixed with the
+    namespace, like the permissions its auth handler grants, and its tools
+    require the namespace itself, which only its handler grants. Toolkits
+    without an auth handler are served without permissions, as they would be
+    on their own.
+    """
+    tool_options = _get_tool_options(toolkit_config)
+    has_auth = bool(toolkit_config.get("toolkit", {}).get("auth"))
+    entries = []
+    for tool_item in tools:
+        options = dict(tool_options.get(getattr(tool_item, "name", ""), {}))
+        if namespace is not None:
+            options["namespace"] = namespace
+            if has_auth:
+                options["permissions"] = [namespace] + [
+                    f"{namespace}:{permission}"
+                    for permission in options.get("permissions", [])
+                ]
+            else:
+                options.pop("permissions", None)
+        entries.append((tool_item, options))
+    return entries
+
+
+def _unload_toolkit_modules(toolkit_path: Path) -> None:
+    """Forget the imported modules of a toolkit so that they are executed again."""
+    prefix = str(toolkit_path) + os.sep
+    for name, module in list(sys.modules.items()):
+        file = getattr(module, "__file__", None)
+        if file and file.startswith(prefix):
+            del sys.modules[name]
+
+
+def _toolkit_fingerprint(toolkit_paths: list[Path]) -> frozenset:
+    """Get the paths, modification times and sizes of the files of toolkits."""
+    files = set()
+    for toolkit_path in toolkit_paths:
+        for directory, dirs, names in os.walk(toolkit_path):
+            dirs[:] = [
+                d for d in dirs if not d.startswith(".") and d not in IGNORED_DIRS
+            ]
+            for name in names:
+                if name.endswith((".py", ".toml")):
+                    path = os.path.join(directory, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    files.add((path, stat.st_mtime_ns, stat.st_size))
+    return frozenset(files)
+
+
+async def _load_mcp_tools(toolkit_config: dict) -> list:
+    """Load the tools of the MCP servers configured in a toolkit.
+
+    Raises:
+        ImportError: If langchain-mcp-adapters is not installed
+    """
+    mcp_servers = toolkit_config.get("mcp_servers", [])
+    if not mcp_servers:
+        return []
+    logger.info(f"Found {len(mcp_servers)} MCP server configurations")
+    return await load_mcp_servers_tools(
+        mcp_servers,
+        prefix_tools=toolkit_config.get("mcp_prefix_tools", True),
+    )
+
+
 T = TypeVar("T", bound=Callable)
 
 logger = logging.getLogger(__name__)
@@ -221,33 +514,90 @@ class Server:
     """LangChain tool server."""
 
     def __init__(
-        self, *, lifespan: Lifespan | None = None, enable_mcp: bool = False
+        self,
+        *,
+        lifespan: Lifespan | None = None,
+        enable_mcp: bool = False,
+        max_workers: int | None = None,
+        executors: dict[str, int] | None = None,
+        process_workers: int | None = None,
+        default_timeout: float | None = None,
+        watch_interval: float | None = None,
+        mcp_session_store: SessionStore | None = None,
     ) -> None:
-        """Initialize the server."""
+        """Initialize the server.
+
+        Args:
+            lifespan: Optional lifespan context manager of the application.
+            enable_mcp: Whether to expose the tools over MCP under `/mcp`.
+            max_workers: Size of the thread pool synchronous tools run on.
+            executors: Sizes of additional named thread pools that tools can
+                opt into with `@tool(executor="name")`.
+            process_workers: Size of the process pool tools declared with
+                `@tool(execution="process")` run on. Defaults to the number of
+                CPUs.
+            default_timeout: Time limit in seconds of tool calls, for tools
+                that do not set their own. No limit by default.
+            watch_interval: For servers created from a toolkit, how often in
+                seconds to check the toolkit directory for changes and reload
+                the tools. Disabled by default; see `reload()`.
+            mcp_session_store: Store of the MCP sessions, e.g., a
+                `SQLiteSessionStore` shared by several worker processes.
+                Defaults to an in-memory store.
+        """
+        if watch_interval is not None and watch_interval <= 0:
+            raise ValueError("watch_interval must be positive")
+        self._watch_interval = watch_interval
+        # Set when the server is created from toolkits
+        self._toolkits: list[_Toolkit] = []
+        self._load_mcp = False
+        self._reload_lock = asyncio.Lock()
 
         @asynccontextmanager
         async def full_lifespan(app: FastAPI):
             """A lifespan event that is called when the server starts."""
             print(SPLASH)
-            # yield whatever is inside the context manager
-            if lifespan:
-                async with lifespan(app) as stateful:
-                    yield stateful
-            else:
-                yield
+            # Start process workers before taking traffic so they are warm
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.tool_handler.executors.start
+            )
+            watcher = None
+            if self._watch_interval is not None and self._toolkits:
+                watcher = asyncio.create_task(self._watch_toolkit())
+            try:
+                # yield whatever is inside the context manager
+                if lifespan:
+                    async with lifespan(app) as stateful:
+                        yield stateful
+                else:
+                    yield
+            finally:
+                if watcher is not None:
+                    watcher.cancel()
+                self.tool_handler.executors.shutdown(wait=False)
 
         self.app = FastAPI(
             version=__version__,
             lifespan=full_lifespan,
             title="LangChain Tool Server",
+            default_response_class=ORJSONResponse,
         )
 
         # Add a global exception handler for validation errors
         self.app.exception_handler(RequestValidationError)(validation_exception_handler)
+        # Report rejected tool calls in the shape of a failed call
+        self.app.exception_handler(ToolCallError)(tool_call_error_handler)
         # Routes that go under `/`
         self.app.include_router(root.router)
         # Create a tool handler
-        self.tool_handler = ToolHandler()
+        self.tool_handler = ToolHandler(
+            executors=ExecutorRegistry(
+                max_workers=max_workers,
+                executors=executors,
+                process_workers=process_workers,
+            ),
+            default_timeout=default_timeout,
+        )
         # Routes that go under `/tools`
         router = create_tools_router(self.tool_handler)
         self.app.include_router(router, prefix="/tools")
@@ -261,7 +611,9 @@ class Server:
         if enable_mcp:
             from langchain_tool_server.mcp import create_mcp_router
 
-            mcp_router = create_mcp_router(self.tool_handler)
+            mcp_router = create_mcp_router(
+                self.tool_handler, session_store=mcp_session_store
+            )
             self.app.include_router(mcp_router, prefix="/mcp")
 
     def _add_tool(
@@ -269,15 +621,17 @@ class Server:
         tool,
         *,
         permissions: list[str] | None = None,
+        **options,
     ) -> None:
         """Add a LangChain tool to the server (internal method).
 
         Args:
             tool: A BaseTool instance (created with @tool decorator).
             permissions: Permissions required to call the tool.
+            **options: Per-tool options from toolkit.toml (see `TOOL_OPTIONS`).
         """
         # Let ToolHandler.add() do the validation - it has better error messages
-        self.tool_handler.add(tool, permissions=permissions)
+        self.tool_handler.add(tool, permissions=permissions, **options)
         logger.info(f"Registered tool: {tool.name}")
 
     def _add_tools(self, *tools) -> None:
@@ -289,9 +643,28 @@ class Server:
         for tool_item in tools:
             self._add_tool(tool_item)
 
-    def _add_auth(self, auth: Auth) -> None:
-        """Add an authentication handler to the server (internal method)."""
-        if not isinstance(auth, Auth):
+    def _add_auth(
+        self, auth: Auth | Mapping[str, Auth], allow_anonymous: bool = False
+    ) -> None:
+        """Add an authentication handler to the server (internal method).
+
+        Args:
+            auth: The authentication handler, or the handlers of several
+                toolkits by namespace.
+            allow_anonymous: With handlers by namespace, whether requests that
+                no handler authenticates are let through (for toolkits served
+                without auth).
+        """
+        if isinstance(auth, Mapping):
+            for toolkit_auth in auth.values():
+                if not isinstance(toolkit_auth, Auth):
+                    raise TypeError(
+                        f"Expected an instance of Auth, got {type(toolkit_auth)}"
+                    )
+            backend = NamespacedAuthenticationBackend(auth, allow_anonymous)
+        elif isinstance(auth, Auth):
+            backend = ServerAuthenticationBackend(auth)
+        else:
             raise TypeError(f"Expected an instance of Auth, got {type(auth)}")
 
         if self._auth._authenticate_handler is not None:
@@ -306,103 +679,133 @@ class Server:
 
         self.app.add_middleware(
             AuthenticationMiddleware,
-            backend=ServerAuthenticationBackend(auth),
+            backend=backend,
             on_error=on_auth_error,
         )
 
     @classmethod
     def _load_toolkit_base(
-        cls, toolkit_dir: str = ".", **kwargs
-    ) -> tuple["Server", dict]:
+        cls, toolkit_dir: str | Sequence[str] = ".", **kwargs
+    ) -> tuple["Server", list[tuple[_Toolkit, dict]]]:
         """Load toolkit base configuration and create server with tools and auth.
 
         This is a shared helper method for both from_toolkit and afrom_toolkit
         that handles all the common toolkit loading logic.
 
         Args:
-            toolkit_dir: Path to toolkit directory (default: current directory)
+            toolkit_dir: Path to toolkit directory (default: current directory),
+                paths to several toolkit directories, or path to a directory
+                with a toolkits.toml manifest
             **kwargs: Additional arguments passed to Server constructor
 
         Returns:
-            Tuple of (server_instance, toolkit_config)
+            Tuple of (server_instance, toolkits with their toolkit_config)
 
         Raises:
             ValueError: If no toolkit package found or configuration is invalid
         """
-        from pathlib import Path
-
-        toolkit_path = Path(toolkit_dir).resolve()
-
-        # Find package directory (has __init__.py and is not hidden/cache)
-        package_dirs = [
-            d
-            for d in toolkit_path.iterdir()
-            if d.is_dir()
-            and (d / "__init__.py").exists()
-            and not d.name.startswith(".")
-            and d.name
-            not in {"__pycache__", "node_modules", ".git", ".venv", "venv", "env"}
-        ]
+        toolkit_paths, namespaced = _find_toolkits(toolkit_dir)
+        loaded = []
+        namespaces: set[str] = set()
 
-        if not package_dirs:
-            raise ValueError(f"No toolkit package found in {toolkit_path}")
+        for toolkit_path, namespace in toolkit_paths:
+            package_name = _find_package_dir(toolkit_path).name
 
-        package_dir = package_dirs[0]
-        package_name = package_dir.name
+            logger.info(f"Loading toolkit: {package_name}")
 
-        logger.info(f"Loading toolkit: {package_name}")
-
-        try:
-            with open(toolkit_path / "toolkit.toml", "rb") as f:
-                toolkit_config = tomllib.load(f)
-
-            tools_path = toolkit_config.get("toolkit", {}).get("tools")
-            if not tools_path:
-                raise ValueError(
-                    "No tools path specified in toolkit.toml. "
-                    "Please add: tools = './path/to/file.py:TOOLS'"
+            try:
+                toolkit_config, tools_path, tools = _read_toolkit(toolkit_path)
+                if namespaced:
+                    namespace = _toolkit_namespace(
+                        namespace, toolkit_config, package_name, namespaces
+                    )
+                auth_instance = _load_toolkit_auth(toolkit_config, toolkit_path)
+            except (ImportError, ModuleNotFoundError) as e:
+                raise ValueError(f"Error importing toolkit: {e}") from e
+
+            loaded.append(
+                _LoadedToolkit(
+                    _Toolkit(toolkit_path, namespace),
+                    toolkit_config,
+                    tools_path,
+                    tools,
+                    auth_instance,
                 )
+            )
 
-            tools = _load_tools_object(tools_path, toolkit_path)
-
-            auth_instance = None
-            auth_path = toolkit_config.get("toolkit", {}).get("auth")
-
-            if auth_path:
-                logger.info(f"Loading auth from path: {auth_path}")
-                try:
-                    auth_instance = _load_auth_instance(auth_path, toolkit_path)
-                    logger.info(f"Successfully loaded auth handler from {auth_path}")
-                except Exception as e:
-                    logger.error(f"Failed to load auth from {auth_path}: {e}")
-                    import traceback
+        # Create server and register tools
+        server = cls(**kwargs)
+        server._add_toolkits(loaded, namespaced)
 
-                    logger.error(f"Auth loading traceback:\n{traceback.format_exc()}")
-                    raise e
+        return server, [(item.toolkit, item.config) for item in loaded]
 
-            # Create server and register tools
-            server = cls(**kwargs)
+    def _warn_unknown_tool_options(self, toolkits: list[tuple[_Toolkit, dict]]) -> None:
+        """Warn about `[tools.<name>]` tables naming no tool of their toolkit.
 
-            # Add auth if found
-            if auth_instance:
-                server._add_auth(auth_instance)
+        Toolkits whose MCP servers are not loaded are skipped, since their
+        options may be for the tools of those servers.
+        """
+        for toolkit, toolkit_config in toolkits:
+            if toolkit_config.get("mcp_servers") and not self._load_mcp:
+                continue
+            names = {
+                tool["fn"].name
+                for tool in self.tool_handler.catalog.values()
+                if tool.get("namespace") == toolkit.namespace
+            }
+            for name in sorted(set(toolkit_config.get("tools", {})) - names):
+                logger.warning(
+                    f"Options for tool '{name}' in {toolkit.path / 'toolkit.toml'} "
+                    "match no tool of the toolkit"
+                )
 
-            for tool_item in tools:
-                server._add_tool(tool_item)
+    def _add_toolkits(self, loaded: list["_LoadedToolkit"], namespaced: bool) -> None:
+        """Add the auth handlers and tools of loaded toolkits (internal method)."""
+        self._toolkits = [item.toolkit for item in loaded]
+
+        # Add auth if found
+        if namespaced:
+            auths = {item.toolkit.namespace: item.auth for item in loaded if item.auth}
+            if auths:
+                # Toolkits without auth stay open to unauthenticated requests.
+                self._add_auth(
+                    auths, allow_anonymous=any(not item.auth for item in loaded)
+                )
+        elif loaded[0].auth:
+            self._add_auth(loaded[0].auth)
 
-            logger.info(f"Successfully registered {len(tools)} tools from {tools_path}")
+        for item in loaded:
+            # Process workers import the tools from the same path
+            self.tool_handler.executors.add_source(
+                item.tools_path, str(item.toolkit.path)
+            )
 
-            return server, toolkit_config
+            for tool_item, options in _toolkit_entries(
+                item.config, item.tools, item.toolkit.namespace
+            ):
+                self._add_tool(tool_item, **options)
 
-        except (ImportError, ModuleNotFoundError) as e:
-            raise ValueError(f"Error importing toolkit: {e}") from e
+            logger.info(
+                f"Successfully registered {len(item.tools)} tools from {item.tools_path}"
+            )
 
     @classmethod
-    def from_toolkit(cls, toolkit_dir: str = ".", **kwargs) -> "Server":
+    def from_toolkit(cls, toolkit_dir: str | Sequence[str] = ".", **kwargs) -> "Server":
         """Create server from toolkit directory.
 
+        Several toolkits can be served by one server, given a list of toolkit
+        directories or a directory with a toolkits.toml manifest. Their tool
+        IDs are then prefixed with the namespace of their toolkit (e.g.,
+        "weather.forecast"), which defaults to the `name` in its toolkit.toml.
+        Each toolkit keeps its own auth handler: the permissions it grants
+        (e.g., "read") are prefixed with its namespace ("weather:read"), as are
+        the permissions of its tools, so they only apply to its own tools.
+        Toolkits without an auth handler are open, as they would be alone.
+
         Args:
-            toolkit_dir: Path to toolkit directory (default: current directory)
+            toolkit_dir: Path to toolkit directory (default: current directory),
+                paths to several toolkit directories, or path to a directory
+                with a toolkits.toml manifest
             **kwargs: Additional arguments passed to Server constructor
 
         Returns:
@@ -412,28 +815,34 @@ class Server:
             ValueError: If no toolkit package found or TOOLS registry missing
         """
         # Load toolkit base configuration and create server
-        server, toolkit_config = cls._load_toolkit_base(toolkit_dir, **kwargs)
+        server, toolkits = cls._load_toolkit_base(toolkit_dir, **kwargs)
+        server._warn_unknown_tool_options(toolkits)
 
         # Check if MCP servers are configured
-        mcp_servers = toolkit_config.get("mcp_servers", [])
-        if mcp_servers:
-            logger.warning(
-                f"Found {len(mcp_servers)} MCP server configuration(s) in toolkit.toml. "
-                "MCP servers require async initialization. Please use Server.afrom_toolkit() "
-                "instead of Server.from_toolkit() to load MCP server tools."
-            )
+        for _, toolkit_config in toolkits:
+            mcp_servers = toolkit_config.get("mcp_servers", [])
+            if mcp_servers:
+                logger.warning(
+                    f"Found {len(mcp_servers)} MCP server configuration(s) in toolkit.toml. "
+                    "MCP servers require async initialization. Please use Server.afrom_toolkit() "
+                    "instead of Server.from_toolkit() to load MCP server tools."
+                )
 
         return server
 
     @classmethod
-    async def afrom_toolkit(cls, toolkit_dir: str = ".", **kwargs) -> "Server":
+    async def afrom_toolkit(
+        cls, toolkit_dir: str | Sequence[str] = ".", **kwargs
+    ) -> "Server":
         """Create server from toolkit directory with async MCP server support.
 
         This async version supports loading tools from MCP servers configured in
         toolkit.toml. Use this method when your toolkit includes MCP servers.
 
         Args:
-            toolkit_dir: Path to toolkit directory (default: current directory)
+            toolkit_dir: Path to toolkit directory (default: current directory),
+                paths to several toolkit directories, or path to a directory
+                with a toolkits.toml manifest (see `from_toolkit`)
             **kwargs: Additional arguments passed to Server constructor
 
         Returns:
@@ -443,22 +852,22 @@ class Server:
             ValueError: If no toolkit package found or configuration is invalid
         """
         # Load toolkit base configuration and create server
-        server, toolkit_config = cls._load_toolkit_base(toolkit_dir, **kwargs)
+        server, toolkits = cls._load_toolkit_base(toolkit_dir, **kwargs)
+        server._load_mcp = True
 
         # Load MCP server tools if configured
-        mcp_servers = toolkit_config.get("mcp_servers", [])
-        if mcp_servers:
-            logger.info(f"Found {len(mcp_servers)} MCP server configurations")
+        for toolkit, toolkit_config in toolkits:
+            if not toolkit_config.get("mcp_servers"):
+                continue
             try:
                 # Load tools from MCP servers
-                mcp_tools = await load_mcp_servers_tools(
-                    mcp_servers,
-                    prefix_tools=toolkit_config.get("mcp_prefix_tools", True),
-                )
+                mcp_tools = await _load_mcp_tools(toolkit_config)
 
                 # Register MCP tools
-                for tool in mcp_tools:
-                    server._add_tool(tool)
+                for tool, options in _toolkit_entries(
+                    toolkit_config, mcp_tools, toolkit.namespace
+                ):
+                    server._add_tool(tool, **options)
 
                 logger.info(f"Successfully registered {len(mcp_tools)} MCP tools")
 
@@ -471,11 +880,140 @@ class Server:
                 # Don't fail the entire server if MCP loading fails
                 # This allows graceful degradation
 
+        server._warn_unknown_tool_options(toolkits)
+        return server
+
+    @classmethod
+    def from_catalog(cls, catalog_path: str = "catalog.json", **kwargs) -> "Server":
+        """Create server from a catalog built ahead of time.
+
+        The tools are registered from the catalog, so the server can serve
+        listings without importing the toolkit modules or connecting to MCP
+        servers: each tool is loaded on its first call. Build the catalog with:
+
+            python -m langchain_tool_server.catalog ./my_toolkit -o catalog.json
+
+        Toolkits that changed since the catalog was built are imported at
+        startup instead.
+
+        Args:
+            catalog_path: Path to the catalog (default: catalog.json)
+            **kwargs: Additional arguments passed to Server constructor
+
+        Returns:
+            Server instance with the tools of the catalog registered
+
+        Raises:
+            ValueError: If the catalog or a toolkit configuration is invalid
+        """
+        from langchain_tool_server.catalog import load_catalog_toolkit, read_catalog
+
+        catalog = read_catalog(catalog_path)
+        try:
+            loaded = [load_catalog_toolkit(toolkit) for toolkit in catalog["toolkits"]]
+        except (ImportError, ModuleNotFoundError) as e:
+            raise ValueError(f"Error importing toolkit: {e}") from e
+
+        server = cls(**kwargs)
+        server._load_mcp = catalog["mcp"]
+        server._add_toolkits(loaded, catalog["namespaced"])
+        server._warn_unknown_tool_options(
+            [(item.toolkit, item.config) for item in loaded]
+        )
         return server
 
+    async def reload(self) -> list[CatalogChange]:
+        """Reload the tools of the toolkits the server was created from.
+
+        toolkit.toml and the toolkit modules are loaded again, along with the
+        tools of the MCP servers for servers created with `afrom_toolkit()`.
+        The new tools then replace the catalog at once: calls in flight finish
+        on the tools they started with. If loading fails, the current tools
+        are kept. Authentication is not reloaded.
+
+        Returns:
+            The changes of the catalog.
+
+        Raises:
+            ValueError: If the server was not created from a toolkit.
+        """
+        toolkits = self._toolkits
+        if not toolkits:
+            raise ValueError("Only servers created from a toolkit can be reloaded")
+
+        async with self._reload_lock:
+            logger.info(
+                f"Reloading toolkits: {', '.join(str(t.path) for t in toolkits)}"
+            )
+
+            def load() -> list[tuple[_Toolkit, dict, list]]:
+                loaded = []
+                for toolkit in toolkits:
+                    _unload_toolkit_modules(toolkit.path)
+                    try:
+                        toolkit_config, _, tools = _read_toolkit(toolkit.path)
+                    except (ImportError, ModuleNotFoundError) as e:
+                        raise ValueError(f"Error importing toolkit: {e}") from e
+                    loaded.append((toolkit, toolkit_config, tools))
+                return loaded
+
+            loop = asyncio.get_running_loop()
+            entries = []
+            configs = []
+            for toolkit, toolkit_config, tools in await loop.run_in_executor(
+                None, load
+            ):
+                configs.append((toolkit, toolkit_config))
+                if self._load_mcp:
+                    try:
+                        tools.extend(await _load_mcp_tools(toolkit_config))
+                    except ImportError as e:
+                        logger.warning(
+                            f"langchain-mcp-adapters not installed, skipping MCP servers: {e}"
+                        )
+                entries.extend(
+                    _toolkit_entries(toolkit_config, tools, toolkit.namespace)
+                )
+
+            changes = self.tool_handler.replace_all(entries)
+            self._warn_unknown_tool_options(configs)
+            # Process workers import the new version of the tools
+            self.tool_handler.executors.reload()
+
+            logger.info(f"Reloaded {len(entries)} tools ({len(changes)} changed)")
+            return changes
+
+    async def _watch_toolkit(self) -> None:
+        """Reload the toolkits when their files change."""
+        loop = asyncio.get_running_loop()
+        paths = [toolkit.path for toolkit in self._toolkits]
+        fingerprint = await loop.run_in_executor(None, _toolkit_fingerprint, paths)
+        pending = False
+        while True:
+            await asyncio.sleep(self._watch_interval)
+            current = await loop.run_in_executor(None, _toolkit_fingerprint, paths)
+            if current != fingerprint:
+                # Wait until the files stop changing (e.g., while being saved)
+                fingerprint = current
+                pending = True
+            elif pending:
+                pending = False
+                try:
+                    await self.reload()
+                except Exception:
+                    logger.exception("Failed to reload toolkit, keeping current tools")
+
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """ASGI Application"""
         return await self.app.__call__(scope, receive, send)
 
 
-__all__ = ["__version__", "Server", "Auth", "InjectedRequest", "tool", "Context"]
+__all__ = [
+    "__version__",
+    "Server",
+    "Auth",
+    "InjectedRequest",
+    "tool",
+    "Context",
+    "CachePolicy",
+]
@@ -1,3 +1,4 @@
+import asyncio
 import copy
 import functools
 import inspect
@@ -86,6 +87,95 @@ class ServerAuthenticationBackend(AuthenticationBackend):
             raise
 
 
+class NamespacedAuthenticationBackend(AuthenticationBackend):
+    """Authenticates requests with the auth handlers of several toolkits.
+
+    Permissions granted by the handler of a toolkit are prefixed with its
+    namespace (e.g., "weather:read") so that they only grant access to the tools
+    of that toolkit, and the handler grants the namespace itself ("weather"),
+    which all the tools of the toolkit require. The user authenticated by each
+    handler is kept for the tools of its toolkit (see `NamespacedUser`).
+    """
+
+    def __init__(
+        self, auths: Mapping[str, Auth], allow_anonymous: bool = False
+    ) -> None:
+        """Initializes the authentication backend.
+
+        Args:
+            auths: Auth handlers by namespace.
+            allow_anonymous: Whether requests that no handler authenticates are
+                let through, for the toolkits served without auth.
+        """
+        self.backends = {
+            namespace: ServerAuthenticationBackend(auth)
+            for namespace, auth in auths.items()
+        }
+        self.allow_anonymous = allow_anonymous
+
+    async def authenticate(
+        self, conn: HTTPConnection
+    ) -> tuple[AuthCredentials, BaseUser] | None:
+        """Authenticate the request with every toolkit and merge the permissions."""
+        results = await asyncio.gather(
+            *(backend.authenticate(conn) for backend in self.backends.values()),
+            return_exceptions=True,
+        )
+        scopes: list[str] = []
+        users: dict[str, BaseUser] = {}
+        error: AuthenticationError | None = None
+        for namespace, result in zip(self.backends, results, strict=True):
+            if isinstance(result, AuthenticationError):
+                # The request may still be authenticated by another toolkit.
+                error = error or result
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            if result is None:
+                continue
+            credentials, user = result
+            scopes.append(namespace)
+            scopes.extend(f"{namespace}:{scope}" for scope in credentials.scopes)
+            users[namespace] = user
+        if not users:
+            if error is not None and not self.allow_anonymous:
+                raise error
+            return None
+        return AuthCredentials(scopes), NamespacedUser(users)
+
+
+class NamespacedUser(BaseUser):
+    """Users authenticated by the auth handlers of several toolkits.
+
+    Behaves as the user of the first toolkit that authenticated the request;
+    tools get the user of their own toolkit with `for_namespace`.
+    """
+
+    def __init__(self, users: Mapping[str, BaseUser]) -> None:
+        self.users = dict(users)
+        self._user = next(iter(self.users.values()))
+
+    def for_namespace(self, namespace: str) -> BaseUser | None:
+        """Get the user authenticated by the handler of a toolkit, if any."""
+        return self.users.get(namespace)
+
+    @property
+    def identity(self) -> str:
+        return self._user.identity
+
+    @property
+    def is_authenticated(self) -> bool:
+        return self._user.is_authenticated
+
+    @property
+    def display_name(self) -> str:
+        return self._user.display_name
+
+    def __getattr__(self, name: str) -> Any:
+        """Proxy any other attributes to the user of the first toolkit."""
+        return getattr(self._user, name)
+
+
 def _extract_arguments_from_scope(
     scope: dict[str, Any],
     param_names: set[str],
@@ -0,0 +1,162 @@
+"""Memoization and coalescing of tool calls."""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from langchain_tool_server.serialization import dumps
+
+
+def call_key(args: Dict[str, Any], user_id: Optional[str] = None) -> str:
+    """Compute a key identifying a call from a canonical form of its arguments."""
+    canonical = dumps([user_id, args], sort_keys=True)
+    return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+
+
+class CachePolicy:
+    """Policy for caching the results of a tool.
+
+    Only use it for tools that are pure or nearly pure (e.g., lookups, math):
+    a cached result is returned for any call with the same arguments until it
+    expires.
+
+    Example:
+        @tool(cache=CachePolicy(ttl=300, max_entries=1000))
+        def lookup(key: str) -> str:
+            '''Look up a key.'''
+            ...
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = 60,
+        max_entries: int = 1024,
+        per_user: bool = False,
+    ) -> None:
+        """Initialize the policy.
+
+        Args:
+            ttl: Time in seconds a result is reused for. None to never expire.
+            max_entries: Maximum number of results kept; the least recently used
+                results are evicted first.
+            per_user: Whether to cache results separately for each user
+                (`request.user.identity`). Always the case for tools with an
+                auth provider.
+        """
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.per_user = per_user
+
+
+class ResultCache:
+    """Bounded in-memory LRU cache of tool results with a time to live."""
+
+    def __init__(self, policy: CachePolicy, per_user: bool = False) -> None:
+        """Initialize the cache.
+
+        Args:
+            policy: The caching policy of the tool.
+            per_user: Whether to key results by user regardless of the policy.
+        """
+        self.policy = policy
+        self.per_user = per_user or policy.per_user
+        self.hits = 0
+        self.misses = 0
+        # key -> (expiry time, value)
+        self._entries: OrderedDict[str, Tuple[Optional[float], Any]] = OrderedDict()
+
+    def key(self, args: Dict[str, Any], user_id: Optional[str]) -> str:
+        """Compute the cache key of a call."""
+        return call_key(args, user_id if self.per_user else None)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Get a cached result.
+
+        Returns:
+            Whether a live result was found, and the result.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, value
+            del self._entries[key]
+        self.misses += 1
+        return False, None
+
+    def set(self, key: str, value: Any) -> None:
+        """Cache a result, evicting the least recently used one if full."""
+        ttl = self.policy.ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.policy.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the hit/miss counters and the number of cached results."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+class _Flight:
+    """An execution shared by concurrent identical calls."""
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs concurrent identical calls of a tool once.
+
+    The first call starts the execution and calls made while it is in flight
+    await the same result. Each caller can give up (e.g., at its deadline)
+    without affecting the others; the execution is only cancelled once no
+    caller is waiting for it anymore.
+    """
+
+    def __init__(self, per_user: bool = False) -> None:
+        """Initialize the coalescer.
+
+        Args:
+            per_user: Whether calls of different users are kept separate.
+        """
+        self.per_user = per_user
+        self.coalesced = 0
+        self._flights: Dict[str, _Flight] = {}
+
+    def key(self, args: Dict[str, Any], user_id: Optional[str]) -> str:
+        """Compute the key identical calls share."""
+        return call_key(args, user_id if self.per_user else None)
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `fn`, or join the execution in flight for the same key."""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = _Flight(asyncio.ensure_future(fn()))
+            flight.task.add_done_callback(lambda _: self._land(key, flight))
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Nobody is waiting for the result anymore.
+                flight.task.cancel()
+                self._land(key, flight)
+
+    def _land(self, key: str, flight: _Flight) -> None:
+        """Stop sharing an execution with new calls."""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
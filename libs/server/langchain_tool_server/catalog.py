@@ -0,0 +1,380 @@
+"""Precompiled catalog of toolkits for fast server starts.
+
+Building the catalog imports the toolkits and lists the tools of their MCP
+servers once, ahead of time (e.g., when building a container image):
+
+    python -m langchain_tool_server.catalog ./my_toolkit -o catalog.json
+
+`Server.from_catalog("catalog.json")` then registers the tools from the catalog
+without importing the toolkit modules or connecting to the MCP servers. Each
+tool is loaded on its first call.
+"""
+
+import argparse
+import asyncio
+import functools
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Union
+
+from langchain_tool_server import (
+    IGNORED_DIRS,
+    _find_package_dir,
+    _find_toolkits,
+    _load_mcp_tools,
+    _load_toolkit_auth,
+    _load_tools_object,
+    _LoadedToolkit,
+    _read_toolkit,
+    _read_toolkit_config,
+    _Toolkit,
+    _toolkit_namespace,
+)
+from langchain_tool_server.cache import CachePolicy
+from langchain_tool_server.mcp_loader import load_mcp_servers_tools
+from langchain_tool_server.serialization import dumps, loads
+from langchain_tool_server.tool import Tool
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILE = "catalog.json"
+"""Default path of the catalog."""
+
+CATALOG_VERSION = 1
+"""Version of the catalog format."""
+
+
+def toolkit_digest(toolkit_path: Path) -> str:
+    """Hash the Python and TOML files of a toolkit.
+
+    Used to detect catalogs built from another version of a toolkit.
+    """
+    paths = []
+    for directory, dirs, names in os.walk(toolkit_path):
+        dirs[:] = [d for d in dirs if not d.startswith(".") and d not in IGNORED_DIRS]
+        paths.extend(
+            Path(directory, name) for name in names if name.endswith((".py", ".toml"))
+        )
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sorted(paths):
+        digest.update(path.relative_to(toolkit_path).as_posix().encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _tool_entry(tool: Tool) -> Dict[str, Any]:
+    """Describe a tool the way it is registered, without its function."""
+    if not isinstance(tool, Tool):
+        raise TypeError(
+            f"Expected a tool created with the @tool decorator, got {type(tool)}"
+        )
+    entry = {
+        "name": tool.name,
+        "description": tool.description,
+        "input_schema": tool.input_schema,
+        "output_schema": tool.output_schema,
+        "auth_provider": tool.auth_provider,
+        "scopes": tool.scopes,
+        "executor": tool.executor,
+        "execution": tool.execution,
+        "max_concurrency": tool.max_concurrency,
+        "max_queue": tool.max_queue,
+        "timeout": tool.timeout,
+        "coalesce": tool.coalesce,
+    }
+    if tool.cache is not None:
+        entry["cache"] = {
+            "ttl": tool.cache.ttl,
+            "max_entries": tool.cache.max_entries,
+            "per_user": tool.cache.per_user,
+        }
+    return entry
+
+
+async def build_catalog(
+    toolkit_dir: Union[str, Sequence[str]] = ".", *, mcp: bool = True
+) -> Dict[str, Any]:
+    """Build the catalog of toolkits.
+
+    Args:
+        toolkit_dir: Toolkit directory, toolkit directories, or directory with
+            a toolkits.toml manifest, as accepted by `Server.from_toolkit`.
+        mcp: Whether to list the tools of the MCP servers of the toolkits, as
+            `Server.afrom_toolkit` does.
+
+    Returns:
+        The catalog, to be saved with `write_catalog`.
+    """
+    toolkit_paths, namespaced = _find_toolkits(toolkit_dir)
+    namespaces: set[str] = set()
+    toolkits = []
+
+    for toolkit_path, namespace in toolkit_paths:
+        package_name = _find_package_dir(toolkit_path).name
+        logger.info(f"Building the catalog of toolkit: {package_name}")
+
+        toolkit_config, _, tools = _read_toolkit(toolkit_path)
+        if namespaced:
+            namespace = _toolkit_namespace(
+                namespace, toolkit_config, package_name, namespaces
+            )
+
+        mcp_tools = []
+        if mcp and toolkit_config.get("mcp_servers"):
+            for adapter in await _load_mcp_tools(toolkit_config):
+                entry = _tool_entry(adapter)
+                entry["mcp_server"] = adapter.base_tool.metadata["mcp_server"]
+                mcp_tools.append(entry)
+
+        toolkits.append(
+            {
+                "path": str(toolkit_path),
+                "namespace": namespace,
+                "digest": toolkit_digest(toolkit_path),
+                "tools": [_tool_entry(tool) for tool in tools],
+                "mcp_tools": mcp_tools,
+            }
+        )
+
+    return {
+        "version": CATALOG_VERSION,
+        "namespaced": namespaced,
+        "mcp": mcp,
+        "toolkits": toolkits,
+    }
+
+
+def write_catalog(catalog: Dict[str, Any], path: str = CATALOG_FILE) -> None:
+    """Save a catalog, with toolkit paths relative to it."""
+    directory = Path(path).resolve().parent
+    catalog = {
+        **catalog,
+        "toolkits": [
+            {
+                **toolkit,
+                "path": Path(os.path.relpath(toolkit["path"], directory)).as_posix(),
+            }
+            for toolkit in catalog["toolkits"]
+        ],
+    }
+    Path(path).write_bytes(dumps(catalog))
+
+
+def read_catalog(path: str = CATALOG_FILE) -> Dict[str, Any]:
+    """Read a catalog, resolving the paths of its toolkits.
+
+    Raises:
+        ValueError: If the catalog was built with another version of the format.
+    """
+    catalog = loads(Path(path).read_bytes())
+    if catalog.get("version") != CATALOG_VERSION:
+        raise ValueError(
+            f"Unsupported catalog version {catalog.get('version')} in {path}. "
+            "Rebuild the catalog with `python -m langchain_tool_server.catalog`."
+        )
+    directory = Path(path).resolve().parent
+    for toolkit in catalog["toolkits"]:
+        toolkit["path"] = (directory / toolkit["path"]).resolve()
+    return catalog
+
+
+class LazyTool(Tool):
+    """Tool registered from a catalog entry and loaded on its first call."""
+
+    def __init__(
+        self, entry: Dict[str, Any], load: Callable[[], Awaitable[Tool]]
+    ) -> None:
+        """Initialize the tool.
+
+        Args:
+            entry: Description of the tool in the catalog.
+            load: Loads the actual tool.
+        """
+        # Don't call super().__init__: the schemas come from the catalog.
+        self.func = None
+        self.name = entry["name"]
+        self.description = entry["description"]
+        self.auth_provider = entry["auth_provider"]
+        self.scopes = entry["scopes"]
+        self.executor = entry["executor"]
+        self.execution = entry["execution"]
+        self.max_concurrency = entry["max_concurrency"]
+        self.max_queue = entry["max_queue"]
+        self.timeout = entry["timeout"]
+        self.cache = CachePolicy(**entry["cache"]) if "cache" in entry else None
+        self.coalesce = entry["coalesce"]
+        self._executor = None
+        # The loaded tool takes care of its context.
+        self.takes_context = False
+        # Input is validated by the loaded tool's validator (see ToolHandler).
+        self.lazy = True
+        self.input_model = None
+        self.input_schema = entry["input_schema"]
+        self.output_schema = entry["output_schema"]
+        self._load = load
+        self._tool: Optional[Tool] = None
+        self._lock = asyncio.Lock()
+
+    async def load(self) -> Tool:
+        """Load the actual tool, once."""
+        if self._tool is None:
+            async with self._lock:
+                if self._tool is None:
+                    tool = await self._load()
+                    # Run on the executor the tool was registered with
+                    tool._executor = self._executor
+                    self._tool = tool
+        return self._tool
+
+    async def __call__(self, *args, user_id: str = None, **kwargs) -> Any:
+        """Load the tool if needed and call it."""
+        tool = await self.load()
+        return await tool(*args, user_id=user_id, **kwargs)
+
+
+class _ToolkitTools:
+    """Imports the tools of a toolkit on first use."""
+
+    def __init__(self, tools_path: str, toolkit_path: Path) -> None:
+        self.tools_path = tools_path
+        self.toolkit_path = toolkit_path
+        self._tools: Optional[Dict[str, Tool]] = None
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Tool:
+        with self._lock:
+            if self._tools is None:
+                tools = _load_tools_object(self.tools_path, self.toolkit_path)
+                self._tools = {getattr(tool, "name", ""): tool for tool in tools}
+        tool = self._tools.get(name)
+        if tool is None:
+            raise ValueError(
+                f"Tool {name} not found in {self.tools_path}. Rebuild the catalog."
+            )
+        return tool
+
+
+class _MCPServerTools:
+    """Lists the tools of an MCP server on first use."""
+
+    def __init__(self, config: Dict[str, Any], prefix_tools: bool) -> None:
+        self.config = config
+        self.prefix_tools = prefix_tools
+        self._tools: Optional[Dict[str, Tool]] = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, name: str) -> Tool:
+        async with self._lock:
+            if self._tools is None:
+                tools = await load_mcp_servers_tools(
+                    [self.config], prefix_tools=self.prefix_tools
+                )
+                if not tools:
+                    # Failures are logged by the loader; retry on the next call.
+                    raise RuntimeError(
+                        f"Failed to load tools from MCP server '{self.config['name']}'"
+                    )
+                self._tools = {tool.name: tool for tool in tools}
+        tool = self._tools.get(name)
+        if tool is None:
+            raise ValueError(
+                f"Tool {name} not found on MCP server '{self.config['name']}'. "
+                "Rebuild the catalog."
+            )
+        return tool
+
+
+def load_catalog_toolkit(toolkit: Dict[str, Any]) -> _LoadedToolkit:
+    """Load a toolkit from its catalog entry, with lazy tools.
+
+    Tools of toolkits that changed since the catalog was built are imported
+    right away instead.
+    """
+    toolkit_path = toolkit["path"]
+    tools: List[Tool]
+    if toolkit_digest(toolkit_path) == toolkit["digest"]:
+        toolkit_config, tools_path = _read_toolkit_config(toolkit_path)
+        module = _ToolkitTools(tools_path, toolkit_path)
+        tools = [
+            LazyTool(
+                entry, functools.partial(asyncio.to_thread, module.get, entry["name"])
+            )
+            for entry in toolkit["tools"]
+        ]
+    else:
+        logger.warning(
+            f"Toolkit {toolkit_path} changed since the catalog was built, "
+            "importing its tools. Rebuild the catalog for faster starts."
+        )
+        toolkit_config, tools_path, tools = _read_toolkit(toolkit_path)
+
+    auth_instance = _load_toolkit_auth(toolkit_config, toolkit_path)
+
+    servers = {
+        config["name"]: _MCPServerTools(
+            config, toolkit_config.get("mcp_prefix_tools", True)
+        )
+        for config in toolkit_config.get("mcp_servers", [])
+        if "name" in config
+    }
+    for entry in toolkit["mcp_tools"]:
+        server = servers.get(entry["mcp_server"])
+        if server is None:
+            logger.warning(
+                f"MCP server '{entry['mcp_server']}' of tool {entry['name']} is "
+                "no longer configured, skipping the tool"
+            )
+            continue
+        tools.append(LazyTool(entry, functools.partial(server.get, entry["name"])))
+
+    return _LoadedToolkit(
+        _Toolkit(toolkit_path, toolkit["namespace"]),
+        toolkit_config,
+        tools_path,
+        tools,
+        auth_instance,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Build a catalog from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m langchain_tool_server.catalog",
+        description="Build the catalog of toolkits for fast server starts.",
+    )
+    parser.add_argument(
+        "toolkit_dir",
+        nargs="*",
+        default=["."],
+        help="Toolkit directories, or a directory with a toolkits.toml manifest.",
+    )
+    parser.add_argument(
+        "-o", "--output", default=CATALOG_FILE, help="Path of the catalog to write."
+    )
+    parser.add_argument(
+        "--no-mcp",
+        action="store_true",
+        help="Do not list the tools of the MCP servers of the toolkits.",
+    )
+    args = parser.parse_args(argv)
+
+    toolkit_dir = (
+        args.toolkit_dir[0] if len(args.toolkit_dir) == 1 else args.toolkit_dir
+    )
+    catalog = asyncio.run(build_catalog(toolkit_dir, mcp=not args.no_mcp))
+    write_catalog(catalog, args.output)
+    count = sum(
+        len(toolkit["tools"]) + len(toolkit["mcp_tools"])
+        for toolkit in catalog["toolkits"]
+    )
+    logger.info(f"Wrote {count} tools to {args.output}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
@@ -1,10 +1,45 @@
 """Tool execution context."""
 
-from typing import Optional
+import contextvars
+from typing import Callable, Optional
+
+ProgressCallback = Callable[[float, Optional[float], Optional[str]], None]
+"""Receives the progress, total and message reported by a tool."""
+
+progress_callback: contextvars.ContextVar[Optional[ProgressCallback]] = (
+    contextvars.ContextVar("progress_callback", default=None)
+)
+"""Where the progress of the current tool call goes, if the caller listens."""
 
 
 class Context:
-    """Context passed to tools during execution."""
+    """Context passed to tools during execution.
+
+    Tools get it as their first parameter, `context: Context`.
+    """
 
-    def __init__(self, token: Optional[str] = None):
+    def __init__(
+        self, token: Optional[str] = None, progress: Optional[ProgressCallback] = None
+    ):
         self.token = token
+        self._progress = progress
+
+    def report_progress(
+        self,
+        progress: float,
+        total: Optional[float] = None,
+        message: Optional[str] = None,
+    ) -> None:
+        """Report the progress of the call, or a partial output as `message`.
+
+        Sent to MCP clients that asked for progress notifications; ignored
+        otherwise. Can be called from synchronous tools running on a thread.
+        Tools running on a process pool cannot report progress.
+
+        Args:
+            progress: Progress so far; it should increase with each report.
+            total: Total to reach, if known.
+            message: Human-readable description of the progress.
+        """
+        if self._progress is not None:
+            self._progress(progress, total, message)
@@ -0,0 +1,245 @@
+"""Executors used to run synchronous tools off the event loop."""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain_tool_server.serialization import dumps, loads
+
+DEFAULT_EXECUTOR = "default"
+
+# (tools path, package directory) as passed to `_load_tools_object`
+ToolSource = Tuple[str, str]
+
+
+class ProcessPool(Executor):
+    """Process pool for CPU-bound tools (`@tool(execution="process")`).
+
+    Workers import the toolkit modules once when they start, so calls only send
+    the tool name and its encoded arguments. The pool is started on first use,
+    or ahead of time with `start()` so that workers are warm before traffic.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.sources: List[ToolSource] = []
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _ensure_pool(self) -> Tuple[ProcessPoolExecutor, bool]:
+        """Create the underlying pool if needed; return it and whether it is new."""
+        with self._lock:
+            if self._pool is not None:
+                return self._pool, False
+            methods = multiprocessing.get_all_start_methods()
+            # Forking a process running an event loop and threads is unsafe.
+            method = "forkserver" if "forkserver" in methods else "spawn"
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(method),
+                initializer=_initialize_worker,
+                initargs=(list(self.sources),),
+            )
+            return self._pool, True
+
+    def start(self) -> None:
+        """Start all the workers and wait until they have imported the tools."""
+        pool, created = self._ensure_pool()
+        if created:
+            # Submitting one task per worker before any is idle spawns them all.
+            wait_futures([pool.submit(os.getpid) for _ in range(self.max_workers)])
+
+    def submit(self, fn: Callable, /, *args: Any, **kwargs: Any) -> Future:
+        pool, _ = self._ensure_pool()
+        try:
+            return pool.submit(fn, *args, **kwargs)
+        except BrokenProcessPool:
+            # A worker died abruptly (e.g., killed or `os._exit`), which leaves
+            # the pool unusable; the calls it was running failed with it.
+            self._discard(pool)
+            pool, _ = self._ensure_pool()
+            return pool.submit(fn, *args, **kwargs)
+
+    def _discard(self, pool: ProcessPoolExecutor) -> None:
+        """Stop using a pool, so that the next call starts a new one."""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False)
+
+    def restart(self) -> None:
+        """Replace the workers so that they import the tools again.
+
+        Calls in flight finish on the old workers, which exit afterwards. New
+        workers start on first use.
+        """
+        pool = self._pool
+        if pool is not None:
+            self._discard(pool)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+class ExecutorRegistry:
+    """Named thread pools that synchronous tools are run on.
+
+    Every synchronous tool runs on the default pool unless it opts into a named
+    pool with `@tool(executor="name")`. Pools are created on first use. Tools
+    with `@tool(execution="process")` run on a shared process pool instead.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        executors: Optional[Dict[str, int]] = None,
+        process_workers: Optional[int] = None,
+    ) -> None:
+        """Initialize the registry.
+
+        Args:
+            max_workers: Size of the default pool. Defaults to the
+                `ThreadPoolExecutor` default.
+            executors: Sizes of additional named pools.
+            process_workers: Size of the process pool. Defaults to the number
+                of CPUs.
+        """
+        self._sizes: Dict[str, Optional[int]] = {DEFAULT_EXECUTOR: max_workers}
+        for name, size in (executors or {}).items():
+            if size < 1:
+                raise ValueError(f"Executor '{name}' must have at least one worker")
+            self._sizes[name] = size
+        self._executors: Dict[str, Executor] = {}
+        self._process_workers = process_workers
+        self._process_pool: Optional[ProcessPool] = None
+        self._sources: List[ToolSource] = []
+
+    def add_source(self, tools_path: str, package_dir: str) -> None:
+        """Register a tools module that process workers import when they start.
+
+        Args:
+            tools_path: Path in the format used by `toolkit.toml`, e.g.
+                './path/to/file.py:TOOLS'.
+            package_dir: Base directory for resolving relative paths.
+        """
+        self._sources.append((tools_path, package_dir))
+        if self._process_pool is not None:
+            self._process_pool.sources.append((tools_path, package_dir))
+
+    def get(self, name: Optional[str] = None) -> Executor:
+        """Get the executor with the given name (the default pool if None).
+
+        Raises:
+            ValueError: If no executor with that name is configured.
+        """
+        name = name or DEFAULT_EXECUTOR
+        executor = self._executors.get(name)
+        if executor is None:
+            if name not in self._sizes:
+                raise ValueError(
+                    f"Unknown executor '{name}'. "
+                    f"Configured executors: {', '.join(sorted(self._sizes))}"
+                )
+            executor = ThreadPoolExecutor(
+                max_workers=self._sizes[name], thread_name_prefix=f"tool-{name}"
+            )
+            self._executors[name] = executor
+        return executor
+
+    def get_process_pool(self) -> ProcessPool:
+        """Get the process pool. Workers are not started until first used."""
+        if self._process_pool is None:
+            self._process_pool = ProcessPool(self._process_workers)
+            self._process_pool.sources.extend(self._sources)
+        return self._process_pool
+
+    def reload(self) -> None:
+        """Restart the process pool, if any, after the toolkit modules changed."""
+        if self._process_pool is not None:
+            self._process_pool.restart()
+
+    def start(self) -> None:
+        """Pre-start the process pool if any tool needs it."""
+        if self._process_pool is not None:
+            self._process_pool.start()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down all the pools that were created."""
+        executors, self._executors = self._executors, {}
+        for executor in executors.values():
+            executor.shutdown(wait=wait, cancel_futures=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Tools available in a process worker, by name and source file (tools of
+# different toolkits may have the same name).
+_WORKER_TOOLS: Dict[Tuple[str, str], Any] = {}
+
+
+def source_file(tool: Any) -> str:
+    """Get the file a tool function is defined in."""
+    return getattr(getattr(tool.func, "__code__", None), "co_filename", "")
+
+
+def _initialize_worker(sources: List[ToolSource]) -> None:
+    """Import the toolkit modules once when a process worker starts."""
+    from pathlib import Path
+
+    from langchain_tool_server import _load_tools_object
+
+    for tools_path, package_dir in sources:
+        for tool in _load_tools_object(tools_path, Path(package_dir)):
+            _WORKER_TOOLS[(tool.name, source_file(tool))] = tool
+
+
+def _find_worker_tool(name: str, filename: str, module: str, qualname: str) -> Any:
+    tool = _WORKER_TOOLS.get((name, filename))
+    if tool is None:
+        # Tools that were not loaded from a toolkit are imported by reference.
+        import importlib
+
+        target: Any = importlib.import_module(module)
+        for part in qualname.split("."):
+            target = getattr(target, part)
+        tool = _WORKER_TOOLS[(name, filename)] = target
+    return tool
+
+
+def call_in_worker(
+    name: str, filename: str, module: str, qualname: str, payload: bytes
+) -> bytes:
+    """Run a tool in a process worker.
+
+    Args:
+        name: Name of the tool.
+        filename: File the tool function is defined in.
+        module: Module the tool function is defined in.
+        qualname: Qualified name of the tool function in its module.
+        payload: JSON-encoded `{"input": ..., "token": ...}`, where `input`
+            holds the validated arguments and `token` the auth context token.
+
+    Returns:
+        The JSON-encoded result of the tool.
+    """
+    from langchain_tool_server.context import Context
+
+    tool = _find_worker_tool(name, filename, module, qualname)
+    data = loads(payload)
+    # Restore the argument types (e.g., Pydantic models) from their JSON form.
+    validated = tool.input_model.model_validate(data["input"])
+    kwargs = {field: getattr(validated, field) for field in validated.model_fields_set}
+    args = (Context(token=data["token"]),) if tool.takes_context else ()
+    result = tool.func(*args, **kwargs)
+    return dumps(result)
+
+
+def encode_arguments(kwargs: Dict[str, Any], token: Optional[str]) -> bytes:
+    """Encode the arguments of a tool call for `call_in_worker`."""
+    return dumps({"input": kwargs, "token": token})
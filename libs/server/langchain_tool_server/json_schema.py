@@ -0,0 +1,220 @@
+"""Compiled JSON schema validation.
+
+Tools proxied from MCP servers only come with a JSON schema describing their
+input. This module builds a `jsonschema` validator once per schema, so that
+validating the input of a call does not need to prepare the schema again.
+
+Usage:
+    validate = compile_schema({"type": "object", "required": ["x"]})
+    errors = validate({"y": 1})  # ["'x' is a required property"]
+"""
+
+import copy
+import functools
+import re
+from datetime import date
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import unquote
+
+import structlog
+from jsonschema import FormatChecker
+from jsonschema.exceptions import SchemaError, UnknownType
+from jsonschema.validators import validator_for
+from referencing import Registry
+from referencing.exceptions import Unresolvable
+from referencing.jsonschema import DRAFT202012, specification_with
+
+from langchain_tool_server.schemas import _subschemas
+from langchain_tool_server.serialization import dumps, loads
+
+logger = structlog.getLogger(__name__)
+
+SchemaValidator = Callable[[Any], List[str]]
+
+
+class InvalidSchemaError(ValueError):
+    """A JSON schema that cannot validate values (e.g., an unknown type)."""
+
+
+# Keywords whose schemas apply to the value itself, not to its items or properties
+_IN_PLACE_KEYWORDS = frozenset({"not", "if", "then", "else"})
+_IN_PLACE_LIST_KEYWORDS = frozenset({"allOf", "anyOf", "oneOf"})
+
+_DATE_TIME_RE = re.compile(
+    r"^(\d{4}-\d{2}-\d{2})[Tt ]([01]\d|2[0-3]):[0-5]\d:([0-5]\d|60)(\.\d+)?"
+    r"([Zz]|[+-]([01]\d|2[0-3]):[0-5]\d)$"
+)
+
+_FORMAT_CHECKER = FormatChecker()
+
+if "date-time" not in _FORMAT_CHECKER.checkers:
+    # jsonschema only checks date-times with the optional rfc3339-validator.
+    @_FORMAT_CHECKER.checks("date-time")
+    def _is_date_time(value: Any) -> bool:
+        if not isinstance(value, str):
+            return True
+        match = _DATE_TIME_RE.match(value)
+        if not match:
+            return False
+        try:
+            date.fromisoformat(match.group(1))
+        except ValueError:
+            return False
+        return True
+
+
+def _resolve_local_ref(root: Any, ref: str) -> Optional[Any]:
+    """Resolve a reference within the schema (e.g., `#/$defs/A`), if it is local."""
+    if not ref.startswith("#"):
+        return None
+    node = root
+    for token in ref[1:].split("/")[1:]:
+        token = unquote(token).replace("~1", "/").replace("~0", "~")
+        if isinstance(node, dict) and token in node:
+            node = node[token]
+        elif isinstance(node, list) and token.isdigit() and int(token) < len(node):
+            node = node[int(token)]
+        else:
+            return None
+    return node
+
+
+def _in_place_subschemas(root: Any, schema: Dict[str, Any]) -> Iterator[Any]:
+    """Yield the schemas applied to the same value as a schema."""
+    ref = schema.get("$ref")
+    if isinstance(ref, str):
+        target = _resolve_local_ref(root, ref)
+        if target is not None:
+            yield target
+    for keyword, value in schema.items():
+        if keyword in _IN_PLACE_KEYWORDS:
+            yield value
+        elif keyword in _IN_PLACE_LIST_KEYWORDS and isinstance(value, list):
+            yield from value
+
+
+def _break_ref_cycles(schema: Any) -> Any:
+    """Drop the references that lead back to themselves on the same value.
+
+    A cycle such as `{"$ref": "#"}` never moves on to a part of the value, so it
+    would recurse forever; such references constrain nothing and accept any value.
+    Cycles going through items or properties are kept, since they end with the
+    value.
+    """
+    if not isinstance(schema, dict):
+        return schema
+    root = copy.deepcopy(schema)
+
+    def nodes(node: Any) -> Iterator[Dict[str, Any]]:
+        if isinstance(node, dict):
+            yield node
+            for subschema in _subschemas(node):
+                yield from nodes(subschema)
+
+    def leads_back(start: Dict[str, Any]) -> bool:
+        seen = set()
+        pending = list(_in_place_subschemas(root, start))
+        while pending:
+            node = pending.pop()
+            if node is start:
+                return True
+            if not isinstance(node, dict) or id(node) in seen:
+                continue
+            seen.add(id(node))
+            pending.extend(_in_place_subschemas(root, node))
+        return False
+
+    for node in list(nodes(root)):
+        if isinstance(node.get("$ref"), str) and leads_back(node):
+            del node["$ref"]
+    return root
+
+
+def _check_refs(cls: Any, schema: Any) -> None:
+    """Resolve every reference of a schema, raising `Unresolvable` if one fails.
+
+    Only references within the schema resolve; nothing is retrieved.
+    """
+    if not isinstance(schema, dict):
+        return
+    specification = specification_with(cls.ID_OF(cls.META_SCHEMA), default=DRAFT202012)
+    root = specification.create_resource(schema)
+    base_uri = root.id() or ""
+    registry: Registry = Registry().with_resource(base_uri, root).crawl()
+
+    def check(node: Any, resolver: Any) -> None:
+        if not isinstance(node, dict):
+            return
+        resolver = resolver.in_subresource(specification.create_resource(node))
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            resolver.lookup(ref)
+        for subschema in _subschemas(node):
+            check(subschema, resolver)
+
+    check(schema, registry.resolver(base_uri=base_uri))
+
+
+def _format_error(path: str, message: str) -> str:
+    return f"{path}: {message}" if path else message
+
+
+def _compile(schema: Any) -> SchemaValidator:
+    schema = _break_ref_cycles(schema)
+    cls = validator_for(schema)
+    try:
+        cls.check_schema(schema)
+        _check_refs(cls, schema)
+    except SchemaError as error:
+        raise InvalidSchemaError(error.message) from error
+    except Unresolvable as error:
+        raise InvalidSchemaError(f"Unresolvable reference: {error}") from error
+    validator = cls(schema, format_checker=_FORMAT_CHECKER)
+
+    def validate(value: Any) -> List[str]:
+        try:
+            errors = [
+                _format_error(
+                    ".".join(str(part) for part in error.absolute_path), error.message
+                )
+                for error in validator.iter_errors(value)
+            ]
+        except RecursionError:
+            return ["Input is nested too deeply"]
+        except (SchemaError, UnknownType, Unresolvable, re.error) as error:
+            # The schema is at fault, not the input; leave it to the schema owner.
+            logger.warning("Input not validated, invalid schema", error=str(error))
+            return []
+        return sorted(errors)
+
+    return validate
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_canonical(key: bytes) -> SchemaValidator:
+    return _compile(loads(key))
+
+
+def compile_schema(schema: Any) -> SchemaValidator:
+    """Compile a JSON schema into a validator.
+
+    Compiled schemas are cached by their canonical JSON representation, so tools
+    sharing the same schema (e.g., from the same MCP server) share a validator.
+
+    Args:
+        schema: The JSON schema to compile.
+
+    Returns:
+        A function that validates a value and returns a list of error messages,
+        empty if the value is valid.
+
+    Raises:
+        InvalidSchemaError: If the schema is invalid or has a reference that
+            does not resolve.
+    """
+    try:
+        key = dumps(schema, sort_keys=True)
+    except TypeError:
+        # Not a JSON document (e.g., contains Python objects); compile uncached.
+        return _compile(schema)
+    return _compile_canonical(key)
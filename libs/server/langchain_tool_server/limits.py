@@ -0,0 +1,171 @@
+"""Admission control for tool calls."""
+
+import asyncio
+import contextvars
+import math
+import time
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, List, Optional
+
+DEFAULT_RETRY_AFTER_MS = 1000
+"""Suggested retry delay before the duration of calls is known."""
+
+_slot_work: contextvars.ContextVar[Optional[List[Future]]] = contextvars.ContextVar(
+    "slot_work", default=None
+)
+"""Work started on executors by the call holding the current slot."""
+
+
+def hold_slot(future: Future) -> None:
+    """Keep the slot of the current call until work on an executor completes.
+
+    Threads and processes cannot be interrupted, so a call that times out or is
+    cancelled leaves its work running; the slot is held until the work is done
+    so that no more than `max_concurrency` calls run at once. Does nothing
+    outside of a bulkhead slot.
+    """
+    work = _slot_work.get()
+    if work is not None:
+        work.append(future)
+
+
+class BulkheadFull(Exception):
+    """Raised when a tool is at capacity and its queue is full."""
+
+    def __init__(self, retry_after_ms: int) -> None:
+        super().__init__(f"At capacity, retry after {retry_after_ms}ms")
+        self.retry_after_ms = retry_after_ms
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a call does not complete within its time limit."""
+
+    def __init__(self, timeout: float) -> None:
+        super().__init__(f"Timed out after {timeout:g}s")
+        self.timeout = timeout
+
+
+async def run_with_timeout(aw: Awaitable[Any], timeout: Optional[float]) -> Any:
+    """Await `aw`, cancelling it if it does not complete within `timeout` seconds.
+
+    Unlike `asyncio.wait_for`, a `TimeoutError` raised by `aw` itself is not
+    mistaken for the time limit being hit, and the cancelled task is not
+    awaited, so the caller gets an answer as soon as the limit is hit.
+
+    Raises:
+        DeadlineExceeded: If the time limit is hit.
+    """
+    if timeout is None:
+        return await aw
+    task = asyncio.ensure_future(aw)
+    try:
+        done, _ = await asyncio.wait({task}, timeout=max(timeout, 0))
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    if task in done:
+        return task.result()
+    task.cancel()
+    # Retrieve the outcome so that errors raised while cancelling are not logged
+    # as never retrieved.
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    raise DeadlineExceeded(timeout)
+
+
+class Bulkhead:
+    """Limits the number of concurrent calls of a tool.
+
+    Up to `max_concurrency` calls run at once and up to `max_queue` more wait for
+    a slot. Calls beyond that are rejected right away with `BulkheadFull`, so a
+    burst against one slow tool does not pile up and starve the others.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int = 0) -> None:
+        """Initialize the bulkhead.
+
+        Args:
+            max_concurrency: Maximum number of calls running at once.
+            max_queue: Maximum number of calls waiting for a slot.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0
+        # Moving average of call durations, in seconds
+        self._average_duration: Optional[float] = None
+
+    @property
+    def waiting(self) -> int:
+        """Number of calls waiting for a slot."""
+        return self._waiting
+
+    def retry_after_ms(self) -> int:
+        """Estimate when a slot will be available, from the call durations."""
+        if self._average_duration is None:
+            return DEFAULT_RETRY_AFTER_MS
+        # Calls ahead of a new one, in rounds of `max_concurrency` calls
+        rounds = self._waiting // self.max_concurrency + 1
+        return max(1, math.ceil(self._average_duration * rounds * 1000))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait for a slot to run a call.
+
+        Raises:
+            BulkheadFull: If all slots are taken and the queue is full.
+        """
+        if self._semaphore.locked() and self._waiting >= self.max_queue:
+            raise BulkheadFull(self.retry_after_ms())
+
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        start = time.monotonic()
+        work: List[Future] = []
+        token = _slot_work.set(work)
+        try:
+            yield
+        finally:
+            _slot_work.reset(token)
+            pending = [future for future in work if not future.done()]
+            if pending:
+                self._release_after(pending, start)
+            else:
+                self._release(start)
+
+    def _release(self, start: float) -> None:
+        self._semaphore.release()
+        duration = time.monotonic() - start
+        if self._average_duration is None:
+            self._average_duration = duration
+        else:
+            self._average_duration = 0.8 * self._average_duration + 0.2 * duration
+
+    def _release_after(self, pending: List[Future], start: float) -> None:
+        """Release the slot once the pending work is done."""
+        loop = asyncio.get_running_loop()
+        remaining = len(pending)
+
+        def done() -> None:
+            nonlocal remaining
+            remaining -= 1
+            if remaining == 0:
+                self._release(start)
+
+        def on_done(_: Future) -> None:
+            # Called on the thread that completed the work
+            try:
+                loop.call_soon_threadsafe(done)
+            except RuntimeError:
+                pass  # The event loop is closed
+
+        for future in pending:
+            future.add_done_callback(on_done)
@@ -1,49 +1,196 @@
 from __future__ import annotations
 
-import json
-import uuid
-from typing import Any, Dict, Optional
-
-from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
-
-from langchain_tool_server.tools import CallToolRequest, ToolHandler
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, Optional, TypeVar
+
+import structlog
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import StreamingResponse
+
+from langchain_tool_server.context import progress_callback
+from langchain_tool_server.serialization import ORJSONResponse, dumps, loads
+from langchain_tool_server.sessions import (
+    InMemorySessionStore,
+    MCPSession,
+    SessionStore,
+)
+from langchain_tool_server.tools import (
+    MAX_BATCH_SIZE,
+    MAX_SEARCH_RESULTS,
+    CallToolRequest,
+    ToolCallError,
+    ToolDefinition,
+    ToolHandler,
+)
 
 MCP_APP_PREFIX = "/mcp"
 PROTOCOL_VERSION = "2025-03-26"
+MCP_PAGE_SIZE = 100
+MCP_KEEPALIVE_INTERVAL = 15.0
+"""Time in seconds between keep-alive comments on idle event streams."""
+MCP_EVENT_QUEUE_SIZE = 100
+"""Maximum number of pending events of a session; the oldest are dropped beyond."""
+
+logger = structlog.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def sse_event(data: bytes) -> bytes:
+    """Encode a JSON-RPC message as a server-sent event."""
+    return b"event: message\ndata: " + data + b"\n\n"
+
+
+def accepts_event_stream(request: Request) -> bool:
+    """Whether the client accepts server-sent events."""
+    return "text/event-stream" in request.headers.get("accept", "")
+
+
+def to_mcp_tool(tool: ToolDefinition) -> dict:
+    """Convert a tool definition to MCP format."""
+    mcp_tool = {
+        "name": tool["name"],
+        "description": tool["description"],
+        "inputSchema": tool["input_schema"],
+    }
+
+    # Add auth requirements if present
+    if "auth_provider" in tool:
+        mcp_tool["auth_provider"] = tool["auth_provider"]
+    if "scopes" in tool:
+        mcp_tool["scopes"] = tool["scopes"]
+
+    return mcp_tool
+
+
+def to_mcp_tools(tools: list[ToolDefinition]) -> list[dict]:
+    """Convert tool definitions to MCP format."""
+    # Only return latest version of each tool
+    tools_list = []
+    seen_names = set()
 
+    for tool in tools:
+        tool_name = tool["name"]
+        if tool_name not in seen_names:
+            tools_list.append(to_mcp_tool(tool))
+            seen_names.add(tool_name)
 
-class MCPSession:
-    """Represents an MCP session for streamable HTTP transport."""
+    return tools_list
 
-    def __init__(self, session_id: str):
-        self.session_id = session_id
-        self.initialized = False
-        self.capabilities = {"tools": {}}
+
+class _EventStream:
+    """Bounded queue of the events of a session, fed from any thread."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        # Encoded messages; None closes the stream.
+        self.queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue(MCP_EVENT_QUEUE_SIZE)
+
+    def put(self, data: Optional[bytes]) -> None:
+        self.loop.call_soon_threadsafe(self._put, data)
+
+    def close(self) -> None:
+        self.put(None)
+
+    def _put(self, data: Optional[bytes]) -> None:
+        if self.queue.full():
+            # The client does not keep up; drop the oldest event.
+            self.queue.get_nowait()
+            logger.warning("MCP event queue full, dropping an event")
+        self.queue.put_nowait(data)
 
 
 class MCPStreamableHandler:
     """Handler for MCP streamable HTTP transport."""
 
-    def __init__(self, tool_handler: ToolHandler):
+    def __init__(
+        self,
+        tool_handler: ToolHandler,
+        page_size: int = MCP_PAGE_SIZE,
+        session_store: Optional[SessionStore] = None,
+    ):
         self.tool_handler = tool_handler
-        self.sessions: Dict[str, MCPSession] = {}
-
-    def create_session(self) -> str:
+        # Number of tools per page of tools/list
+        self.page_size = page_size
+        if session_store is None:
+            session_store = InMemorySessionStore()
+        self.session_store = session_store
+        # Pending events of the sessions with an open event stream
+        self._streams: Dict[str, _EventStream] = {}
+        tool_handler.add_listener(self._tools_changed)
+
+    async def _run_store(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run an operation of the session store, off the loop if it blocks."""
+        if self.session_store.blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def create_session(self) -> MCPSession:
         """Create a new MCP session."""
-        session_id = str(uuid.uuid4())
-        self.sessions[session_id] = MCPSession(session_id)
-        return session_id
-
-    def get_session(self, session_id: Optional[str]) -> MCPSession:
-        """Get or create a session."""
-        if not session_id or session_id not in self.sessions:
-            session_id = self.create_session()
-        return self.sessions[session_id]
+        return await self._run_store(self.session_store.create)
+
+    async def get_session(self, session_id: Optional[str]) -> Optional[MCPSession]:
+        """Get a session and mark it as used. None if unknown or expired."""
+        if not session_id:
+            return None
+        return await self._run_store(self.session_store.get, session_id)
+
+    async def save_session(self, session: MCPSession) -> None:
+        """Persist the changes of a session."""
+        await self._run_store(self.session_store.save, session)
+
+    async def delete_session(self, session_id: str) -> bool:
+        """Terminate a session. Returns whether it existed."""
+        stream = self._streams.pop(session_id, None)
+        if stream is not None:
+            stream.close()
+        return await self._run_store(self.session_store.delete, session_id)
+
+    def broadcast(self, message: dict) -> None:
+        """Send a message to the event streams of all the sessions."""
+        data = dumps(message)
+        for stream in list(self._streams.values()):
+            stream.put(data)
+
+    def _tools_changed(self, version: int) -> None:
+        """Notify the sessions that the list of tools changed."""
+        self.broadcast({"jsonrpc": "2.0", "method": "notifications/tools/list_changed"})
+
+    async def open_stream(self, session_id: str) -> AsyncIterator[bytes]:
+        """Stream the messages sent to a session as server-sent events.
+
+        A session has one stream; opening a new one closes the previous one.
+        Keep-alive comments are sent while the stream is idle, and the stream
+        ends when the session is terminated or expires.
+        """
+        stream = _EventStream(asyncio.get_running_loop())
+        previous = self._streams.get(session_id)
+        if previous is not None:
+            previous.close()
+        self._streams[session_id] = stream
+        try:
+            while True:
+                try:
+                    data = await asyncio.wait_for(
+                        stream.queue.get(), MCP_KEEPALIVE_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    # Keep the session alive while its stream is open, and end
+                    # the stream if it was terminated (e.g., by another worker).
+                    if await self.get_session(session_id) is None:
+                        return
+                    yield b": keep-alive\n\n"
+                    continue
+                if data is None:
+                    return
+                yield sse_event(data)
+        finally:
+            if self._streams.get(session_id) is stream:
+                del self._streams[session_id]
 
     def create_response(
         self, request_id: Any, result: Any, session: Optional[MCPSession] = None
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """Create a JSON-RPC response."""
         response_data = {"jsonrpc": "2.0", "id": request_id, "result": result}
 
@@ -51,7 +198,7 @@ class MCPStreamableHandler:
         if session:
             headers["Mcp-Session-Id"] = session.session_id
 
-        return JSONResponse(response_data, headers=headers)
+        return ORJSONResponse(response_data, headers=headers)
 
     def create_error(
         self,
@@ -59,19 +206,22 @@ class MCPStreamableHandler:
         code: int,
         message: str,
         session: Optional[MCPSession] = None,
-    ) -> JSONResponse:
+        data: Any = None,
+    ) -> ORJSONResponse:
         """Create a JSON-RPC error response."""
         response_data = {
             "jsonrpc": "2.0",
             "id": request_id,
             "error": {"code": code, "message": message},
         }
+        if data is not None:
+            response_data["error"]["data"] = data
 
         headers = {"Content-Type": "application/json"}
         if session:
             headers["Mcp-Session-Id"] = session.session_id
 
-        return JSONResponse(response_data, status_code=200, headers=headers)
+        return ORJSONResponse(response_data, status_code=200, headers=headers)
 
     def convert_result_to_content(self, result: Any) -> list[dict]:
         """Convert tool result to MCP content format."""
@@ -83,56 +233,91 @@ class MCPStreamableHandler:
 
         # Convert non-string results to JSON string
         try:
-            result_str = json.dumps(result) if not isinstance(result, str) else result
+            result_str = dumps(result).decode()
         except Exception:
             result_str = str(result)
 
         return [{"type": "text", "text": result_str}]
 
-    async def handle_initialize(self, session: MCPSession, body: dict) -> JSONResponse:
+    async def handle_initialize(
+        self, session: Optional[MCPSession], body: dict
+    ) -> ORJSONResponse:
         """Handle MCP initialize request."""
-        session.initialized = True
+        if session is not None:
+            session.initialized = True
+            await self.save_session(session)
 
         result = {
             "protocolVersion": PROTOCOL_VERSION,
-            "capabilities": {},
+            "capabilities": {"tools": {"listChanged": True}},
             "serverInfo": {"name": "LangChain Tool Server", "version": "2.0.0"},
         }
 
         return self.create_response(body.get("id"), result, session)
 
-    async def handle_tools_list(self, session: MCPSession, body: dict) -> JSONResponse:
-        """Handle tools/list request."""
-        tools = await self.tool_handler.list_tools(request=None)
-
-        # Convert to MCP format - only return latest version of each tool
-        tools_list = []
-        seen_names = set()
-
-        for tool in tools:
-            tool_name = tool["name"]
-            if tool_name not in seen_names:
-                mcp_tool = {
-                    "name": tool_name,
-                    "description": tool["description"],
-                    "inputSchema": tool["input_schema"],
-                }
-
-                # Add auth requirements if present
-                if "auth_provider" in tool:
-                    mcp_tool["auth_provider"] = tool["auth_provider"]
-                if "scopes" in tool:
-                    mcp_tool["scopes"] = tool["scopes"]
-
-                tools_list.append(mcp_tool)
-                seen_names.add(tool_name)
-
-        result = {"tools": tools_list}
-        return self.create_response(body.get("id"), result, session)
+    async def handle_tools_list(
+        self, session: Optional[MCPSession], body: dict, request: Request
+    ) -> Response:
+        """Handle tools/list request, one page of `page_size` tools at a time."""
+        listing = self.tool_handler.get_listing(request)
+        cursor = body.get("params", {}).get("cursor")
+        try:
+            start, end = listing.page(cursor, self.page_size)
+        except ValueError as e:
+            return self.create_error(
+                body.get("id"), -32602, f"Invalid params: {e}", session
+            )
+
+        def encode_result() -> bytes:
+            result = {"tools": to_mcp_tools(listing.tools[start:end])}
+            next_cursor = listing.next_cursor(end)
+            if next_cursor is not None:
+                result["nextCursor"] = next_cursor
+            return dumps(result)
+
+        # Pages are encoded once per listing, only the envelope is not.
+        result, _ = listing.encode(("mcp", start, end), encode_result)
+        content = b"".join(
+            [
+                b'{"jsonrpc":"2.0","id":',
+                dumps(body.get("id")),
+                b',"result":',
+                result,
+                b"}",
+            ]
+        )
+        headers = {"Mcp-Session-Id": session.session_id} if session else None
+        return Response(content, media_type="application/json", headers=headers)
+
+    async def handle_tools_search(
+        self, session: Optional[MCPSession], body: dict, request: Request
+    ) -> ORJSONResponse:
+        """Handle tools/search request (extension): find the best matching tools."""
+        params = body.get("params", {})
+        query = params.get("query")
+        k = params.get("k", 10)
+
+        if not isinstance(query, str) or not query:
+            return self.create_error(
+                body.get("id"), -32602, "Invalid params: missing 'query' field", session
+            )
+        if not isinstance(k, int) or not 1 <= k <= MAX_SEARCH_RESULTS:
+            return self.create_error(
+                body.get("id"),
+                -32602,
+                f"Invalid params: 'k' must be between 1 and {MAX_SEARCH_RESULTS}",
+                session,
+            )
+
+        results = await self.tool_handler.search_tools(query, k, request)
+        tools = [
+            {**to_mcp_tool(result), "score": result["score"]} for result in results
+        ]
+        return self.create_response(body.get("id"), {"tools": tools}, session)
 
     async def handle_tools_call(
-        self, session: MCPSession, body: dict, request: Request
-    ) -> JSONResponse:
+        self, session: Optional[MCPSession], body: dict, request: Request
+    ) -> ORJSONResponse:
         """Handle tools/call request."""
         params = body.get("params", {})
         tool_name = params.get("name")
@@ -170,6 +355,11 @@ class MCPStreamableHandler:
             result = {"content": content}
             return self.create_response(body.get("id"), result, session)
 
+        except ToolCallError as e:
+            # Rejected calls carry a ToolError (e.g., with retry_after_ms)
+            return self.create_error(
+                body.get("id"), -32603, str(e.detail), session, data=e.error
+            )
         except Exception as e:
             # Check if it's an HTTPException from validation
             from fastapi import HTTPException
@@ -180,76 +370,255 @@ class MCPStreamableHandler:
                 body.get("id"), -32603, f"Tool execution failed: {str(e)}", session
             )
 
+    def stream_tools_call(
+        self, session: Optional[MCPSession], body: dict, request: Request
+    ) -> StreamingResponse:
+        """Handle tools/call request, streaming the response as server-sent events.
+
+        Progress reported by the tool through its `Context` is sent as
+        `notifications/progress` when the request has a progress token, then the
+        response ends the stream. Keep-alive comments are sent while the tool
+        is silent, so that proxies don't time out long calls.
+        """
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        meta = (body.get("params") or {}).get("_meta") or {}
+        progress_token = meta.get("progressToken")
+
+        def report_progress(
+            progress: float, total: Optional[float], message: Optional[str]
+        ) -> None:
+            params = {"progressToken": progress_token, "progress": progress}
+            if total is not None:
+                params["total"] = total
+            if message is not None:
+                params["message"] = message
+            notification = {
+                "jsonrpc": "2.0",
+                "method": "notifications/progress",
+                "params": params,
+            }
+            # Tools may report from a worker thread.
+            loop.call_soon_threadsafe(events.put_nowait, dumps(notification))
+
+        async def call() -> None:
+            # The task runs in a copy of the context; the callback is its own.
+            if progress_token is not None:
+                progress_callback.set(report_progress)
+            response = await self.handle_tools_call(session, body, request)
+            # Queued after the progress reported before the tool returned
+            events.put_nowait(response)
+
+        async def stream():
+            task = asyncio.create_task(call())
+            try:
+                while True:
+                    try:
+                        event = await asyncio.wait_for(
+                            events.get(), MCP_KEEPALIVE_INTERVAL
+                        )
+                    except asyncio.TimeoutError:
+                        yield b": keep-alive\n\n"
+                        continue
+                    if isinstance(event, Response):
+                        yield sse_event(event.body)
+                        return
+                    yield sse_event(event)
+            finally:
+                # The client went away; stop the call.
+                task.cancel()
+
+        headers = {"Cache-Control": "no-cache"}
+        if session:
+            headers["Mcp-Session-Id"] = session.session_id
+        return StreamingResponse(
+            stream(), media_type="text/event-stream", headers=headers
+        )
 
-def create_mcp_router(tool_handler: ToolHandler) -> APIRouter:
-    """Create a FastAPI router for MCP streamable HTTP transport."""
+    async def handle_message(
+        self, session: Optional[MCPSession], body: Any, request: Request
+    ) -> Response:
+        """Handle a JSON-RPC message."""
+        if not isinstance(body, dict):
+            return self.create_error(None, -32600, "Invalid Request", session)
 
-    router = APIRouter()
-    handler = MCPStreamableHandler(tool_handler)
+        # Handle different methods
+        method = body.get("method")
+        request_id = body.get("id")
 
-    @router.get("")
-    async def mcp_get_handler(request: Request):
-        """Handle GET requests - SSE not supported, only streamable HTTP."""
-        from fastapi.responses import Response
+        if method == "initialize":
+            return await self.handle_initialize(session, body)
 
-        # Return 501 Not Implemented to indicate SSE is not supported
+        elif method == "notifications/initialized":
+            # No response needed for notifications in streamable HTTP
+            headers = {"Mcp-Session-Id": session.session_id} if session else {}
+            return Response(status_code=204, headers=headers)
+
+        elif method == "tools/list":
+            return await self.handle_tools_list(session, body, request)
+
+        elif method == "tools/search":
+            return await self.handle_tools_search(session, body, request)
+
+        elif method == "tools/call":
+            if accepts_event_stream(request):
+                return self.stream_tools_call(session, body, request)
+            return await self.handle_tools_call(session, body, request)
+
+        else:
+            return self.create_error(
+                request_id, -32601, f"Method not found: {method}", session
+            )
+
+    async def handle_batch(
+        self, session: Optional[MCPSession], batch: list, request: Request
+    ) -> Response:
+        """Handle a batch of JSON-RPC messages, concurrently.
+
+        The responses to the requests of the batch are returned in one array;
+        notifications get no response.
+        """
+        if not batch:
+            return self.create_error(
+                None, -32600, "Invalid Request: empty batch", session
+            )
+        if len(batch) > MAX_BATCH_SIZE:
+            return self.create_error(
+                None,
+                -32600,
+                f"Invalid Request: batches are limited to {MAX_BATCH_SIZE} messages",
+                session,
+            )
+
+        async def handle(body: Any) -> Response:
+            if not isinstance(body, dict):
+                return self.create_error(None, -32600, "Invalid Request", session)
+            method = body.get("method")
+            if method == "initialize":
+                return self.create_error(
+                    body.get("id"),
+                    -32600,
+                    "Invalid Request: initialize cannot be batched",
+                    session,
+                )
+            if method == "tools/call":
+                # Responses of batches are not streamed.
+                return await self.handle_tools_call(session, body, request)
+            return await self.handle_message(session, body, request)
+
+        responses = await asyncio.gather(*(handle(body) for body in batch))
+        # Notifications (messages without an ID) get no response. Responses are
+        # already encoded; join them instead of re-encoding.
+        bodies = [
+            response.body
+            for body, response in zip(batch, responses, strict=True)
+            if not isinstance(body, dict) or "id" in body
+        ]
+        headers = {"Mcp-Session-Id": session.session_id} if session else None
+        if not bodies:
+            return Response(status_code=202, headers=headers)
         return Response(
-            status_code=501,
-            content="SSE not supported - use streamable HTTP only",
-            headers={"Content-Type": "text/plain"},
+            b"[" + b",".join(bodies) + b"]",
+            media_type="application/json",
+            headers=headers,
+        )
+
+
+def create_mcp_router(
+    tool_handler: ToolHandler, session_store: Optional[SessionStore] = None
+) -> APIRouter:
+    """Create a FastAPI router for MCP streamable HTTP transport.
+
+    Args:
+        tool_handler: Handler of the tools to expose.
+        session_store: Store of the MCP sessions. Defaults to an in-memory
+            store, local to the worker process.
+    """
+
+    router = APIRouter()
+    handler = MCPStreamableHandler(tool_handler, session_store=session_store)
+
+    def session_not_found(request_id: Any = None) -> ORJSONResponse:
+        """Respond to a request for an unknown or expired session."""
+        return ORJSONResponse(
+            {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "error": {"code": -32001, "message": "Session not found"},
+            },
+            status_code=404,
+        )
+
+    @router.get("")
+    async def mcp_get_handler(request: Request) -> Response:
+        """Open the stream of the messages the server sends to a session."""
+        if not accepts_event_stream(request):
+            return Response(
+                status_code=405,
+                content="GET requires Accept: text/event-stream",
+                headers={"Content-Type": "text/plain"},
+            )
+        session_id = request.headers.get("mcp-session-id")
+        if not session_id:
+            return ORJSONResponse(
+                {
+                    "jsonrpc": "2.0",
+                    "id": None,
+                    "error": {
+                        "code": -32600,
+                        "message": "Bad Request: missing Mcp-Session-Id header",
+                    },
+                },
+                status_code=400,
+            )
+        if await handler.get_session(session_id) is None:
+            return session_not_found()
+        return StreamingResponse(
+            handler.open_stream(session_id),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "Mcp-Session-Id": session_id},
         )
 
     @router.delete("")
     async def mcp_delete_handler(request: Request):
         """Handle DELETE requests for session termination."""
-        from fastapi.responses import Response
-
         session_id = request.headers.get("mcp-session-id")
-        if session_id and session_id in handler.sessions:
-            del handler.sessions[session_id]
+        if session_id and not await handler.delete_session(session_id):
+            return session_not_found()
         return Response(status_code=204)
 
     @router.post("")
-    async def mcp_streamable_handler(request: Request) -> JSONResponse:
+    async def mcp_streamable_handler(request: Request) -> Response:
         """Single endpoint for all MCP streamable HTTP communication."""
 
         # Parse JSON body
         try:
-            body = await request.json()
+            body = loads(await request.body())
         except Exception:
-            return JSONResponse(
+            return ORJSONResponse(
                 {"jsonrpc": "2.0", "error": {"code": -32700, "message": "Parse error"}},
                 status_code=400,
                 headers={"Content-Type": "application/json"},
             )
 
-        # Get or create session
-        session_id = request.headers.get("mcp-session-id")
-        session = handler.get_session(session_id)
-
-        # Handle different methods
-        method = body.get("method")
-        request_id = body.get("id")
-
-        if method == "initialize":
-            return await handler.handle_initialize(session, body)
-
-        elif method == "notifications/initialized":
-            # No response needed for notifications in streamable HTTP
-            from fastapi.responses import Response
-
-            headers = {"Mcp-Session-Id": session.session_id} if session else {}
-            return Response(status_code=204, headers=headers)
-
-        elif method == "tools/list":
-            return await handler.handle_tools_list(session, body)
-
-        elif method == "tools/call":
-            return await handler.handle_tools_call(session, body, request)
+        # Batches are arrays of messages; they cannot initialize sessions.
+        message = body if isinstance(body, dict) else {}
+        method = message.get("method")
 
+        # Sessions are created by initialize only; requests without a session
+        # ID are served statelessly.
+        session_id = request.headers.get("mcp-session-id")
+        if session_id:
+            session = await handler.get_session(session_id)
+            if session is None:
+                return session_not_found(message.get("id"))
+        elif method == "initialize":
+            session = await handler.create_session()
         else:
-            return handler.create_error(
-                request_id, -32601, f"Method not found: {method}", session
-            )
+            session = None
+
+        if isinstance(body, list):
+            return await handler.handle_batch(session, body, request)
+        return await handler.handle_message(session, body, request)
 
     return router
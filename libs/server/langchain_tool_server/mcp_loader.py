@@ -99,8 +99,19 @@ class MCPToolAdapter(Tool):
         self.description = base_tool.description or ""
         self.auth_provider = None  # MCP tools don't use built-in auth
         self.scopes = []
+        self.executor = None  # Wrapped tools are async
+        self.execution = "thread"
+        self._executor = None
+        self.takes_context = False
+        # Set from the MCP server configuration
+        self.max_concurrency = None
+        self.max_queue = None
+        self.timeout = None
+        self.cache = None
+        self.coalesce = False
 
         # Get schemas from the BaseTool
+        self.input_model = None  # Input is validated against the JSON schema
         self.input_schema = self._get_input_schema()
         self.output_schema = self._get_output_schema()
 
@@ -264,6 +275,7 @@ async def load_mcp_servers_tools(
 
     # Build connections dict for MultiServerMCPClient
     connections = {}
+    server_configs = {}
     for config in mcp_configs:
         try:
             name = config.get("name")
@@ -275,6 +287,7 @@ async def load_mcp_servers_tools(
             # Validate and normalize the configuration
             connection_config = validate_mcp_config(config)
             connections[name] = connection_config
+            server_configs[name] = config
 
         except MCPConfigError as e:
             logger.error(f"Invalid MCP server configuration: {e}")
@@ -292,6 +305,7 @@ async def load_mcp_servers_tools(
             # Use connection config instead of session to avoid session lifecycle issues
             # This allows tools to create fresh sessions with headers per call
             connection_config = connections[server_name]
+            config = server_configs[server_name]
             base_tools = await load_mcp_tools(
                 session=None, connection=connection_config
             )
@@ -310,6 +324,11 @@ async def load_mcp_servers_tools(
                     base_tool.name = f"{server_name}.{base_tool.name}"
                 # Create adapter wrapper
                 adapter = MCPToolAdapter(base_tool)
+                adapter.max_concurrency = config.get("max_concurrency")
+                adapter.max_queue = config.get("max_queue")
+                # `timeout` is the connection timeout, calls use `tool_timeout`
+                adapter.timeout = config.get("tool_timeout")
+                adapter.coalesce = config.get("coalesce", False)
                 adapted_tools.append(adapter)
 
             all_tools.extend(adapted_tools)
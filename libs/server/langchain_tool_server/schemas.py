@@ -0,0 +1,216 @@
+"""Deduplication of the JSON schemas of tools."""
+
+import hashlib
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Tuple
+
+from langchain_tool_server.serialization import dumps
+
+# Keywords whose value is a schema
+_SCHEMA_KEYWORDS = frozenset(
+    {
+        "items",
+        "additionalItems",
+        "additionalProperties",
+        "contains",
+        "propertyNames",
+        "not",
+        "if",
+        "then",
+        "else",
+        "unevaluatedItems",
+        "unevaluatedProperties",
+    }
+)
+# Keywords whose value is a list of schemas
+_SCHEMA_LIST_KEYWORDS = frozenset({"allOf", "anyOf", "oneOf", "prefixItems"})
+# Keywords whose value maps names to schemas
+_SCHEMA_MAP_KEYWORDS = frozenset(
+    {"properties", "patternProperties", "$defs", "definitions", "dependentSchemas"}
+)
+
+DEFS_PREFIX = "urn:langchain-tool-server:defs:"
+"""Prefix of the references to shared definitions.
+
+An absolute URI, so that references cannot clash with the `$defs` of the
+schemas they are in.
+"""
+
+MIN_SHARED_SIZE = 64
+"""Minimum encoded size of a sub-schema worth sharing, in bytes."""
+
+
+def _digest(value: Any) -> str:
+    """Hash the JSON form of a value.
+
+    Keys are not sorted: the order of properties is meaningful (e.g., the order
+    of the arguments of a tool), so values are only shared when it is the same.
+    """
+    return hashlib.blake2b(dumps(value), digest_size=8).hexdigest()
+
+
+class SchemaInterner:
+    """Stores identical schemas, and identical parts of schemas, once.
+
+    Interned schemas are shared between tools and must not be modified.
+    """
+
+    def __init__(self) -> None:
+        self._values: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def intern(self, value: Any) -> Any:
+        """Get the shared copy of a JSON value, interning its parts as well."""
+        if isinstance(value, dict):
+            value = {key: self.intern(item) for key, item in value.items()}
+        elif isinstance(value, list):
+            value = [self.intern(item) for item in value]
+        else:
+            return value
+        return self._values.setdefault(_digest(value), value)
+
+
+def _subschemas(schema: Any) -> Iterable[Any]:
+    """Yield the direct sub-schemas of a schema."""
+    if not isinstance(schema, dict):
+        return
+    for keyword, value in schema.items():
+        if keyword in _SCHEMA_KEYWORDS:
+            yield value
+        elif keyword in _SCHEMA_LIST_KEYWORDS and isinstance(value, list):
+            yield from value
+        elif keyword in _SCHEMA_MAP_KEYWORDS and isinstance(value, dict):
+            yield from value.values()
+
+
+class _Analysis:
+    """Digest, size and self-containment of sub-schemas, memoized by identity.
+
+    Interned schemas share objects, so most sub-schemas are analyzed once.
+    """
+
+    def __init__(self) -> None:
+        self._memo: Dict[int, Tuple[str, int, bool]] = {}
+        # Keep the analyzed objects alive so that their IDs are not reused.
+        self._objects: List[Any] = []
+
+    def __call__(self, schema: Dict[str, Any]) -> Tuple[str, int, bool]:
+        """Get the digest, encoded size, and whether the schema has no `$ref`."""
+        result = self._memo.get(id(schema))
+        if result is None:
+            # Keys are not sorted, see _digest.
+            encoded = dumps(schema)
+            result = (
+                hashlib.blake2b(encoded, digest_size=8).hexdigest(),
+                len(encoded),
+                b'"$ref"' not in encoded,
+            )
+            self._memo[id(schema)] = result
+            self._objects.append(schema)
+        return result
+
+
+def share_definitions(
+    tools: List[Dict[str, Any]],
+    fields: Tuple[str, ...] = ("input_schema", "output_schema"),
+    min_size: int = MIN_SHARED_SIZE,
+) -> Dict[str, Any]:
+    """Hoist sub-schemas repeated across tools into shared definitions.
+
+    Sub-schemas found more than once are replaced with
+    `{"$ref": "urn:langchain-tool-server:defs:<hash>"}`, which refers to
+    `$defs[<hash>]` of the returned document. Sub-schemas with
+    references of their own are left in place, since their references are
+    relative to the schema they belong to.
+
+    Args:
+        tools: Tool definitions.
+        fields: Fields of the tool definitions that hold schemas.
+        min_size: Minimum encoded size of a sub-schema worth sharing.
+
+    Returns:
+        A document with the shared `$defs` and the rewritten `tools`.
+    """
+    analyze = _Analysis()
+    counts: Counter[str] = Counter()
+
+    def count(schema: Any) -> None:
+        if not isinstance(schema, dict):
+            return
+        digest, size, self_contained = analyze(schema)
+        if self_contained and size >= min_size:
+            counts[digest] += 1
+        for subschema in _subschemas(schema):
+            count(subschema)
+
+    for tool in tools:
+        for field in fields:
+            count(tool.get(field))
+
+    definitions: Dict[str, Any] = {}
+
+    def rewrite(schema: Any) -> Any:
+        if not isinstance(schema, dict):
+            return schema
+        digest, _, _ = analyze(schema)
+        if counts[digest] > 1:
+            if digest not in definitions:
+                definitions[digest] = rewrite_children(schema)
+            return {"$ref": DEFS_PREFIX + digest}
+        return rewrite_children(schema)
+
+    def rewrite_children(schema: Dict[str, Any]) -> Dict[str, Any]:
+        rewritten = {}
+        for keyword, value in schema.items():
+            if keyword in _SCHEMA_KEYWORDS:
+                value = rewrite(value)
+            elif keyword in _SCHEMA_LIST_KEYWORDS and isinstance(value, list):
+                value = [rewrite(item) for item in value]
+            elif keyword in _SCHEMA_MAP_KEYWORDS and isinstance(value, dict):
+                value = {name: rewrite(item) for name, item in value.items()}
+            rewritten[keyword] = value
+        return rewritten
+
+    rewritten_tools = []
+    for tool in tools:
+        tool = dict(tool)
+        for field in fields:
+            if field in tool:
+                tool[field] = rewrite(tool[field])
+        rewritten_tools.append(tool)
+
+    return {"$defs": definitions, "tools": rewritten_tools}
+
+
+def expand_definitions(
+    document: Dict[str, Any],
+    fields: Tuple[str, ...] = ("input_schema", "output_schema"),
+) -> List[Dict[str, Any]]:
+    """Inline the shared definitions of a document made by `share_definitions`."""
+    definitions = document["$defs"]
+
+    def expand(value: Any) -> Any:
+        if isinstance(value, dict):
+            ref = value.get("$ref")
+            if (
+                len(value) == 1
+                and isinstance(ref, str)
+                and ref.startswith(DEFS_PREFIX)
+                and ref[len(DEFS_PREFIX) :] in definitions
+            ):
+                return expand(definitions[ref[len(DEFS_PREFIX) :]])
+            return {key: expand(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [expand(item) for item in value]
+        return value
+
+    tools = []
+    for tool in document["tools"]:
+        tool = dict(tool)
+        for field in fields:
+            if field in tool:
+                tool[field] = expand(tool[field])
+        tools.append(tool)
+    return tools
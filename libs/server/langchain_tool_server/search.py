@@ -0,0 +1,140 @@
+"""Ranked search over the tool catalog."""
+
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Words, split at camelCase boundaries (e.g., "getWeather" -> "get", "weather")
+_WORD = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+# Weight of a term found in each part of a tool
+NAME_WEIGHT = 3
+PROPERTY_WEIGHT = 2
+TEXT_WEIGHT = 1
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase terms."""
+    return [word.lower() for word in _WORD.findall(text)]
+
+
+def _schema_texts(schema: Any) -> Iterator[Tuple[str, int]]:
+    """Yield the property names and descriptions of a JSON schema, with weights."""
+    if isinstance(schema, dict):
+        properties = schema.get("properties")
+        if isinstance(properties, dict):
+            for name in properties:
+                yield name, PROPERTY_WEIGHT
+        description = schema.get("description")
+        if isinstance(description, str):
+            yield description, TEXT_WEIGHT
+        for value in schema.values():
+            if isinstance(value, (dict, list)):
+                yield from _schema_texts(value)
+    elif isinstance(schema, list):
+        for item in schema:
+            yield from _schema_texts(item)
+
+
+def tool_terms(
+    name: str, description: str, input_schema: Dict[str, Any]
+) -> Counter[str]:
+    """Get the weighted term frequencies of a tool."""
+    terms: Counter[str] = Counter()
+    texts = [(name, NAME_WEIGHT), (description, TEXT_WEIGHT)]
+    for text, weight in [*texts, *_schema_texts(input_schema)]:
+        for term in tokenize(text):
+            terms[term] += weight
+    return terms
+
+
+class SearchIndex:
+    """In-memory inverted index ranking tools with BM25.
+
+    Tools are indexed by name, description, and the names and descriptions of
+    their input properties. The index is updated incrementally as tools are
+    added and removed.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        """Initialize the index.
+
+        Args:
+            k1: Term frequency saturation.
+            b: Document length normalization.
+        """
+        self.k1 = k1
+        self.b = b
+        # term -> {tool ID -> weighted term frequency}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        # tool ID -> terms of the tool
+        self._documents: Dict[str, Counter[str]] = {}
+        # tool ID -> sum of the weighted term frequencies of the tool
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, tool_id: str, terms: Counter[str]) -> None:
+        """Index a tool, replacing its previous terms if any."""
+        self.remove(tool_id)
+        self._documents[tool_id] = terms
+        self._lengths[tool_id] = sum(terms.values())
+        self._total_length += self._lengths[tool_id]
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[tool_id] = frequency
+
+    def remove(self, tool_id: str) -> None:
+        """Remove a tool from the index."""
+        terms = self._documents.pop(tool_id, None)
+        if terms is None:
+            return
+        self._total_length -= self._lengths.pop(tool_id)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[tool_id]
+            if not postings:
+                del self._postings[term]
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        allowed: Optional[Callable[[str], bool]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Find the tools that best match a query.
+
+        Args:
+            query: Free text query.
+            k: Maximum number of results.
+            allowed: Filters the tools that can be returned, by ID.
+
+        Returns:
+            IDs of the best matching tools with their scores, best first.
+        """
+        if not self._documents:
+            return []
+        count = len(self._documents)
+        average_length = self._total_length / count
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for tool_id, frequency in postings.items():
+                length = self._lengths[tool_id]
+                norm = self.k1 * (1 - self.b + self.b * length / average_length)
+                score = idf * frequency * (self.k1 + 1) / (frequency + norm)
+                scores[tool_id] = scores.get(tool_id, 0.0) + score
+
+        candidates = (
+            (tool_id, score)
+            for tool_id, score in scores.items()
+            if allowed is None or allowed(tool_id)
+        )
+        # Ties are broken by tool ID so that results are stable.
+        return heapq.nsmallest(k, candidates, key=lambda item: (-item[1], item[0]))
@@ -0,0 +1,95 @@
+"""JSON encoding and decoding with orjson."""
+
+import json
+import re
+from typing import Any, Callable, Coroutine
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic_core import to_jsonable_python
+
+# Runs of digits that may be integers beyond 64 bits (or just long strings or
+# fractions, which the standard library decodes the same)
+_LONG_NUMBER = re.compile(rb"[0-9]{19,}")
+_LONG_NUMBER_STR = re.compile(r"[0-9]{19,}")
+
+
+def dumps(content: Any, *, sort_keys: bool = False) -> bytes:
+    """Encode content to JSON.
+
+    Types orjson does not support natively (e.g., Pydantic models) are converted
+    the way Pydantic would. Content orjson cannot encode, such as integers
+    beyond 64 bits, is encoded with the standard library instead.
+
+    Args:
+        content: The content to encode.
+        sort_keys: Whether to sort the keys of objects (e.g., for hashing).
+    """
+    option = orjson.OPT_NON_STR_KEYS
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    try:
+        return orjson.dumps(content, default=to_jsonable_python, option=option)
+    except orjson.JSONEncodeError as error:
+        if "64-bit" not in str(error):
+            raise
+        return json.dumps(
+            content,
+            default=to_jsonable_python,
+            sort_keys=sort_keys,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode()
+
+
+def loads(content: bytes | bytearray | memoryview | str) -> Any:
+    """Decode JSON.
+
+    orjson decodes integers beyond 64 bits as floats, losing precision, so
+    documents with such long numbers are decoded with the standard library.
+    """
+    if isinstance(content, str):
+        long_number = _LONG_NUMBER_STR.search(content)
+    else:
+        long_number = _LONG_NUMBER.search(content)
+    if long_number is None:
+        return orjson.loads(content)
+    if isinstance(content, memoryview):
+        content = bytes(content)
+    return json.loads(content)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson.
+
+    Endpoints return it directly to skip FastAPI's `jsonable_encoder` pass over
+    the content, which is costly for large tool outputs and catalogs.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class ORJSONRequest(Request):
+    """Request whose JSON body is decoded with orjson."""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, so FastAPI
+            # still reports invalid bodies as validation errors.
+            self._json = loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """Route that decodes request bodies with orjson."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            return await handler(ORJSONRequest(request.scope, request.receive))
+
+        return route_handler
@@ -0,0 +1,267 @@
+"""Stores of MCP sessions."""
+
+import abc
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from langchain_tool_server.serialization import dumps, loads
+
+MCP_SESSION_TTL = 3600.0
+"""Time in seconds after which an idle session expires."""
+MAX_MCP_SESSIONS = 10_000
+"""Maximum number of sessions; the least recently used are evicted beyond."""
+TOUCH_FRACTION = 0.1
+"""Fraction of the TTL after which the last use of a shared session is written."""
+
+
+class MCPSession:
+    """Represents an MCP session for streamable HTTP transport."""
+
+    def __init__(
+        self,
+        session_id: str,
+        initialized: bool = False,
+        capabilities: Optional[Dict[str, Any]] = None,
+    ):
+        self.session_id = session_id
+        self.initialized = initialized
+        self.capabilities = capabilities if capabilities is not None else {"tools": {}}
+        # Time of the last request of the session, on the clock of its store
+        self.last_seen = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the state of the session to persist."""
+        return {"initialized": self.initialized, "capabilities": self.capabilities}
+
+
+class SessionStore(abc.ABC):
+    """Store of MCP sessions.
+
+    Sessions expire after being idle for `session_ttl` seconds, and the least
+    recently used sessions are evicted beyond `max_sessions`.
+    """
+
+    blocking = False
+    """Whether the operations block (e.g., on I/O) and must run off the event loop."""
+
+    def __init__(
+        self,
+        max_sessions: int = MAX_MCP_SESSIONS,
+        session_ttl: float = MCP_SESSION_TTL,
+    ) -> None:
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        if session_ttl <= 0:
+            raise ValueError("session_ttl must be positive")
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
+
+    @abc.abstractmethod
+    def create(self) -> MCPSession:
+        """Create a new session."""
+
+    @abc.abstractmethod
+    def get(self, session_id: str) -> Optional[MCPSession]:
+        """Get a session and mark it as used. None if unknown or expired."""
+
+    @abc.abstractmethod
+    def save(self, session: MCPSession) -> None:
+        """Persist the changes of a session (e.g., once initialized)."""
+
+    @abc.abstractmethod
+    def delete(self, session_id: str) -> bool:
+        """Terminate a session. Returns whether it existed."""
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """Number of sessions, including expired ones not swept yet."""
+
+
+class InMemorySessionStore(SessionStore):
+    """Sessions in the memory of the process.
+
+    Only suitable for a single worker process, or with sticky routing.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = MAX_MCP_SESSIONS,
+        session_ttl: float = MCP_SESSION_TTL,
+    ) -> None:
+        super().__init__(max_sessions, session_ttl)
+        # Sessions from the least to the most recently used
+        self.sessions: OrderedDict[str, MCPSession] = OrderedDict()
+
+    def create(self) -> MCPSession:
+        self.sweep()
+        while len(self.sessions) >= self.max_sessions:
+            self.sessions.popitem(last=False)
+        session = MCPSession(str(uuid.uuid4()))
+        session.last_seen = time.monotonic()
+        self.sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id: str) -> Optional[MCPSession]:
+        self.sweep()
+        session = self.sessions.get(session_id)
+        if session is not None:
+            session.last_seen = time.monotonic()
+            self.sessions.move_to_end(session_id)
+        return session
+
+    def save(self, session: MCPSession) -> None:
+        # Sessions are stored by reference.
+        pass
+
+    def delete(self, session_id: str) -> bool:
+        return self.sessions.pop(session_id, None) is not None
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def sweep(self) -> None:
+        """Remove the sessions that have been idle for longer than the TTL."""
+        # Sessions are ordered by last use, so expired ones come first.
+        expired_before = time.monotonic() - self.session_ttl
+        while self.sessions:
+            session = next(iter(self.sessions.values()))
+            if session.last_seen > expired_before:
+                break
+            self.sessions.popitem(last=False)
+
+
+class SQLiteSessionStore(SessionStore):
+    """Sessions in a SQLite database shared by the worker processes of a host.
+
+    Lets several workers (e.g., `uvicorn --workers 4`) serve the same sessions
+    without sticky routing. To keep the workers from contending for the write
+    lock of the database on every request, the last use of a session is only
+    written once it is older than `TOUCH_FRACTION` of the TTL, so idle sessions
+    may expire up to that much earlier.
+
+    Example:
+        Server(
+            enable_mcp=True,
+            mcp_session_store=SQLiteSessionStore("/tmp/mcp-sessions.db"),
+        )
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        path: str,
+        max_sessions: int = MAX_MCP_SESSIONS,
+        session_ttl: float = MCP_SESSION_TTL,
+        sweep_interval: float = 60.0,
+    ) -> None:
+        """Initialize the store.
+
+        Args:
+            path: Path of the database file, created if needed.
+            max_sessions: Maximum number of sessions.
+            session_ttl: Time in seconds after which an idle session expires.
+            sweep_interval: Minimum time in seconds between two removals of
+                expired sessions by this process.
+        """
+        super().__init__(max_sessions, session_ttl)
+        self.path = path
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+        # Autocommit; each statement is its own transaction.
+        self._connection = sqlite3.connect(
+            path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        # WAL lets readers proceed while another process writes.
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS mcp_sessions ("
+            "id TEXT PRIMARY KEY, data BLOB NOT NULL, last_seen REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS mcp_sessions_last_seen "
+            "ON mcp_sessions (last_seen)"
+        )
+
+    def create(self) -> MCPSession:
+        session = MCPSession(str(uuid.uuid4()))
+        session.last_seen = time.time()
+        with self._lock:
+            self._sweep(session.last_seen)
+            self._connection.execute(
+                "INSERT INTO mcp_sessions (id, data, last_seen) VALUES (?, ?, ?)",
+                (session.session_id, dumps(session.to_dict()), session.last_seen),
+            )
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM mcp_sessions"
+            ).fetchone()
+            if count > self.max_sessions:
+                self._connection.execute(
+                    "DELETE FROM mcp_sessions WHERE id IN "
+                    "(SELECT id FROM mcp_sessions ORDER BY last_seen LIMIT ?)",
+                    (count - self.max_sessions,),
+                )
+        return session
+
+    def get(self, session_id: str) -> Optional[MCPSession]:
+        now = time.time()
+        with self._lock:
+            self._sweep(now)
+            row = self._connection.execute(
+                "SELECT data, last_seen FROM mcp_sessions "
+                "WHERE id = ? AND last_seen > ?",
+                (session_id, now - self.session_ttl),
+            ).fetchone()
+            if row is None:
+                return None
+            data, last_seen = row
+            if now - last_seen > self.session_ttl * TOUCH_FRACTION:
+                self._connection.execute(
+                    "UPDATE mcp_sessions SET last_seen = ? WHERE id = ?",
+                    (now, session_id),
+                )
+                last_seen = now
+        session = MCPSession(session_id, **loads(data))
+        session.last_seen = last_seen
+        return session
+
+    def save(self, session: MCPSession) -> None:
+        with self._lock:
+            self._connection.execute(
+                "UPDATE mcp_sessions SET data = ? WHERE id = ?",
+                (dumps(session.to_dict()), session.session_id),
+            )
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM mcp_sessions WHERE id = ?", (session_id,)
+            )
+        return cursor.rowcount > 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM mcp_sessions"
+            ).fetchone()
+        return count
+
+    def _sweep(self, now: float) -> None:
+        """Remove the expired sessions, at most once per sweep interval."""
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + self.sweep_interval
+        self._connection.execute(
+            "DELETE FROM mcp_sessions WHERE last_seen <= ?", (now - self.session_ttl,)
+        )
+
+    def close(self) -> None:
+        """Close the connection to the database."""
+        with self._lock:
+            self._connection.close()
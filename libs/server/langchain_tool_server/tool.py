@@ -1,16 +1,37 @@
 """Custom tool decorator and base class."""
 
+import asyncio
+import contextvars
+import functools
 import inspect
 import os
-from typing import Any, Callable, List, Optional
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, Callable, List, Literal, Optional
 
 import structlog
 
-from langchain_tool_server.context import Context
+from langchain_tool_server.context import Context, progress_callback
+from langchain_tool_server.limits import hold_slot
+
+if TYPE_CHECKING:
+    from langchain_tool_server.cache import CachePolicy
 
 logger = structlog.getLogger(__name__)
 
 
+def _takes_context(func: Callable) -> bool:
+    """Whether the first parameter of a function is `context: Context`."""
+    from typing import get_type_hints
+
+    params = list(inspect.signature(func).parameters)
+    if not params or params[0] != "context":
+        return False
+    try:
+        return get_type_hints(func).get("context") is Context
+    except Exception:
+        return False
+
+
 class Tool:
     """Simple tool class."""
 
@@ -19,27 +40,56 @@ class Tool:
         func: Callable,
         auth_provider: Optional[str] = None,
         scopes: Optional[List[str]] = None,
+        executor: Optional[str] = None,
+        execution: Literal["thread", "process"] = "thread",
+        max_concurrency: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        timeout: Optional[float] = None,
+        cache: Optional["CachePolicy"] = None,
+        coalesce: bool = False,
     ):
         self.func = func
         self.name = func.__name__
         self.description = func.__doc__ or ""
         self.auth_provider = auth_provider
         self.scopes = scopes or []
+        # Name of the thread pool synchronous functions run on.
+        self.executor = executor
+        # Whether synchronous functions run on a thread or a process pool.
+        self.execution = execution
+        # Admission control: concurrent calls and calls waiting for a slot.
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        # Time limit of a call in seconds.
+        self.timeout = timeout
+        # Policy for memoizing results, if any.
+        self.cache = cache
+        # Whether concurrent identical calls share one execution.
+        self.coalesce = coalesce
+        # Bound by the tool handler when the tool is registered.
+        self._executor: Optional[Executor] = None
+        # Whether a Context is passed as first argument (always for auth tools).
+        self.takes_context = bool(auth_provider) or _takes_context(func)
 
         # Generate JSON schemas using Pydantic (similar to LangChain Core)
+        self.input_model = self._create_input_model()
         self.input_schema = self._generate_input_schema()
         self.output_schema = self._generate_output_schema()
 
-    def _generate_input_schema(self) -> dict:
-        """Generate input schema from function signature using Pydantic."""
+    def _create_input_model(self) -> type:
+        """Create a Pydantic model from the function signature.
+
+        The model is built once per tool and is used both to generate the input
+        schema and to validate the arguments of every call.
+        """
         from pydantic import create_model
 
         sig = inspect.signature(self.func)
 
-        # Build fields dict for create_model, excluding context parameter for auth tools
+        # Build fields dict for create_model, excluding the context parameter
         fields = {}
         for name, param in sig.parameters.items():
-            if self.auth_provider and name == "context":
+            if self.takes_context and name == "context":
                 continue
 
             # Use parameter annotation and default value
@@ -53,8 +103,11 @@ class Tool:
             fields[name] = (annotation, default_value)
 
         # Create Pydantic model from filtered fields
-        InputModel = create_model("InputModel", **fields)
-        return InputModel.model_json_schema()
+        return create_model("InputModel", **fields)
+
+    def _generate_input_schema(self) -> dict:
+        """Generate input schema from function signature using Pydantic."""
+        return self.input_model.model_json_schema()
 
     def _generate_output_schema(self) -> dict:
         """Generate output schema from function return type using Pydantic."""
@@ -160,36 +213,121 @@ class Tool:
 
         # Auth successful or not required, execute the tool
         if callable(self.func):
-            # For auth tools, always inject context as first argument
+            token = None
             if self.auth_provider:
-                if hasattr(self, "_context"):
-                    # Prepend context to args
-                    args = (self._context,) + args
-                else:
+                if not hasattr(self, "_context"):
                     raise RuntimeError(
                         f"Tool {self.name} requires auth but no context available"
                     )
+                token = self._context.token
+
+            if self.execution == "process":
+                return await self._run_in_process(token, **kwargs)
+
+            # Inject the context as first argument
+            if self.takes_context:
+                context = Context(token=token, progress=progress_callback.get())
+                args = (context,) + args
+
+            if inspect.iscoroutinefunction(self.func):
+                return await self.func(*args, **kwargs)
 
-            result = self.func(*args, **kwargs)
-            # Handle both sync and async functions
+            # Run synchronous functions on a thread pool so that they do not
+            # block the event loop.
+            result = await self._run_sync(*args, **kwargs)
+            # Handle sync functions returning an awaitable
             if hasattr(result, "__await__"):
                 return await result
             return result
         raise RuntimeError(f"Tool {self.name} is not callable")
 
+    async def _submit(self, fn: Callable, /, *args: Any) -> Any:
+        """Run a function on the tool's executor.
+
+        The bulkhead slot of the call is held until the function returns, even
+        if the call times out first.
+        """
+        if self._executor is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, fn, *args)
+        future = self._executor.submit(fn, *args)
+        hold_slot(future)
+        return await asyncio.wrap_future(future)
+
+    async def _run_sync(self, *args, **kwargs) -> Any:
+        """Run the synchronous function on the tool's executor."""
+        # Propagate context variables (e.g., logging context) to the thread.
+        ctx = contextvars.copy_context()
+        return await self._submit(
+            functools.partial(ctx.run, self.func, *args, **kwargs)
+        )
+
+    async def _run_in_process(self, token: Optional[str], **kwargs) -> Any:
+        """Run the function on a process pool worker.
+
+        Arguments and results are sent as orjson-encoded bytes; the worker looks
+        up the tool by name in the toolkit modules it imported on start.
+        """
+        from langchain_tool_server.executors import (
+            call_in_worker,
+            encode_arguments,
+            source_file,
+        )
+        from langchain_tool_server.serialization import loads
+
+        result = await self._submit(
+            call_in_worker,
+            self.name,
+            source_file(self),
+            self.func.__module__,
+            self.func.__qualname__,
+            encode_arguments(kwargs, token),
+        )
+        return loads(result)
+
 
 def tool(
     func: Optional[Callable] = None,
     *,
     auth_provider: Optional[str] = None,
     scopes: Optional[List[str]] = None,
+    executor: Optional[str] = None,
+    execution: Literal["thread", "process"] = "thread",
+    max_concurrency: Optional[int] = None,
+    max_queue: Optional[int] = None,
+    timeout: Optional[float] = None,
+    cache: Optional["CachePolicy"] = None,
+    coalesce: bool = False,
 ) -> Any:
     """Decorator to create a tool from a function.
 
+    Synchronous functions are run on a thread pool so that they do not block
+    the server.
+
     Args:
         func: The function to wrap
         auth_provider: Name of the auth provider required
         scopes: List of OAuth scopes required
+        executor: Name of the thread pool to run a synchronous function on
+            (configured with `Server(executors=...)`). Defaults to the default pool.
+        execution: Where synchronous functions run: "thread" (default) or
+            "process" for CPU-bound tools, which run on the server's process
+            pool. Arguments and results of process tools must be JSON
+            serializable.
+        max_concurrency: Maximum number of concurrent calls of the tool.
+            Unlimited by default.
+        max_queue: Maximum number of calls waiting for a slot when
+            `max_concurrency` calls are running (default 0). Further calls are
+            rejected with a 429 error.
+        timeout: Time limit of a call in seconds. When it is hit, the call is
+            cancelled and a 504 error is returned. Async functions are cancelled
+            at their next await; synchronous functions cannot be interrupted and
+            run to completion in the background.
+        cache: Policy for memoizing the results of the tool (see `CachePolicy`).
+            Only for pure or nearly pure functions: calls with the same
+            arguments get the cached result until it expires.
+        coalesce: Whether concurrent calls with the same arguments share one
+            execution instead of each running the function.
 
     Usage:
         @tool
@@ -201,9 +339,64 @@ def tool(
         def authenticated_function():
             '''Function requiring auth'''
             return "authenticated result"
+
+        @tool(executor="io")
+        def blocking_function():
+            '''Function running on the "io" thread pool'''
+            return "result"
+
+        @tool(execution="process")
+        def cpu_bound_function(n: int) -> int:
+            '''Function running on the process pool'''
+            return sum(i * i for i in range(n))
+
+        @tool(max_concurrency=4, max_queue=16)
+        def slow_function():
+            '''At most 4 concurrent calls, 16 more waiting'''
+            return "result"
+
+        @tool(timeout=30)
+        async def bounded_function():
+            '''Cancelled if it takes more than 30 seconds'''
+            return "result"
+
+        @tool(cache=CachePolicy(ttl=300, max_entries=1000))
+        def pure_function(x: int) -> int:
+            '''Results reused for 5 minutes'''
+            return x * 2
+
+        @tool
+        def long_function(context: Context, n: int) -> int:
+            '''Reports its progress to MCP clients that stream the call'''
+            for i in range(n):
+                context.report_progress(i + 1, total=n)
+            return n
+
+        @tool(coalesce=True)
+        async def fetch_report(day: str) -> dict:
+            '''Concurrent calls for the same day run once'''
+            ...
     """
 
     def decorator(f: Callable) -> Tool:
+        if execution not in ("thread", "process"):
+            raise ValueError(
+                f"Tool '{f.__name__}': execution must be 'thread' or 'process', "
+                f"got '{execution}'"
+            )
+
+        if max_queue is not None and max_concurrency is None:
+            raise ValueError(
+                f"Tool '{f.__name__}': max_queue requires max_concurrency to be set"
+            )
+
+        # Validation: only synchronous functions can run on a process pool
+        if execution == "process" and inspect.iscoroutinefunction(f):
+            raise ValueError(
+                f"Tool '{f.__name__}': Only synchronous functions can use "
+                "execution='process'"
+            )
+
         # Validation: if auth_provider is given, scopes must be given with at least one scope
         if auth_provider and (not scopes or len(scopes) == 0):
             raise ValueError(
@@ -212,7 +405,6 @@ def tool(
 
         # Validation: if auth_provider is given, first parameter must be 'context: Context'
         if auth_provider:
-            import inspect
             from typing import get_type_hints
 
             sig = inspect.signature(f)
@@ -242,7 +434,18 @@ def tool(
                     f"Tool '{f.__name__}': Error validating context parameter type: {e}"
                 ) from e
 
-        return Tool(f, auth_provider=auth_provider, scopes=scopes)
+        return Tool(
+            f,
+            auth_provider=auth_provider,
+            scopes=scopes,
+            executor=executor,
+            execution=execution,
+            max_concurrency=max_concurrency,
+            max_queue=max_queue,
+            timeout=timeout,
+            cache=cache,
+            coalesce=coalesce,
+        )
 
     # Handle both @tool and @tool() syntax
     if func is None:
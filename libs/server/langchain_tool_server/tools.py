@@ -1,72 +1,119 @@
+import asyncio
+import base64
+import binascii
+import functools
+import hashlib
+import itertools
+import math
 import uuid
+from collections import OrderedDict, deque
 from typing import (
     Any,
+    AsyncIterator,
     Callable,
     Dict,
+    Hashable,
+    Iterable,
     Literal,
+    NamedTuple,
     Union,
     cast,
 )
 
 import structlog
-from fastapi import APIRouter, HTTPException, Request, status
-from fastapi.encoders import jsonable_encoder
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
 from typing_extensions import NotRequired, TypedDict
 
+from langchain_tool_server.auth.middleware import NamespacedUser
+from langchain_tool_server.cache import CachePolicy, ResultCache, SingleFlight
+from langchain_tool_server.executors import ExecutorRegistry
+from langchain_tool_server.json_schema import InvalidSchemaError, compile_schema
+from langchain_tool_server.limits import (
+    Bulkhead,
+    BulkheadFull,
+    DeadlineExceeded,
+    run_with_timeout,
+)
+from langchain_tool_server.schemas import SchemaInterner, share_definitions
+from langchain_tool_server.search import SearchIndex, tool_terms
+from langchain_tool_server.serialization import ORJSONResponse, ORJSONRoute, dumps
 from langchain_tool_server.tool import Tool
 
+InputValidator = Callable[[Dict[str, Any]], Dict[str, Any]]
+"""Validates the input of a tool call and returns the arguments to call it with."""
 
-def _validate_tool_input(args: dict, input_schema: dict) -> dict:
-    """Validate tool input against schema and return validated args."""
-    try:
-        from pydantic import ValidationError, create_model
-
-        if "properties" not in input_schema:
-            return args
-
-        # Build Pydantic model from schema
-        fields = {}
-        properties = input_schema["properties"]
-        required_fields = input_schema.get("required", [])
-
-        for field_name, field_def in properties.items():
-            field_type = field_def.get("type", "string")
-            # Convert JSON schema types to Python types
-            if field_type == "integer":
-                python_type = int
-            elif field_type == "number":
-                python_type = float
-            elif field_type == "boolean":
-                python_type = bool
-            else:
-                python_type = str
-
-            # Set default based on required status
-            default = ... if field_name in required_fields else None
-            fields[field_name] = (python_type, default)
-
-        # Validate with Pydantic
-        ValidationModel = create_model("ValidationModel", **fields)
-        validated = ValidationModel(**args)
-        return validated.model_dump(exclude_none=True)
-
-    except ValidationError as e:
-        # Convert to readable error message
-        errors = []
-        for error in e.errors():
-            field = ".".join(str(loc) for loc in error["loc"])
-            errors.append(f"{field}: {error['msg']}")
-
-        raise HTTPException(
-            status_code=400, detail=f"Invalid input: {'; '.join(errors)}"
-        ) from e
-    except Exception:
-        # If validation fails, return args as-is
+
+def _invalid_input(e: ValidationError) -> HTTPException:
+    """Convert a Pydantic validation error into a readable 400 error."""
+    errors = []
+    for error in e.errors():
+        field = ".".join(str(loc) for loc in error["loc"])
+        errors.append(f"{field}: {error['msg']}")
+
+    return HTTPException(status_code=400, detail=f"Invalid input: {'; '.join(errors)}")
+
+
+def _compile_model_validator(input_model: type[BaseModel]) -> InputValidator:
+    """Create a validator from the input model built from the function signature."""
+
+    def validate(args: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            validated = input_model.model_validate(args)
+        except ValidationError as e:
+            raise _invalid_input(e) from e
+        # Only pass the arguments that were provided, so that the function's own
+        # defaults apply to the rest.
+        return {name: getattr(validated, name) for name in validated.model_fields_set}
+
+    return validate
+
+
+def _compile_schema_validator(input_schema: dict) -> InputValidator:
+    """Create a validator from a JSON schema (e.g., tools proxied from MCP)."""
+    check = compile_schema(input_schema)
+
+    def validate(args: Dict[str, Any]) -> Dict[str, Any]:
+        errors = check(args)
+        if errors:
+            raise HTTPException(
+                status_code=400, detail=f"Invalid input: {'; '.join(errors)}"
+            )
+        # The arguments are forwarded as-is, the schema owner applies defaults.
         return args
 
+    return validate
+
+
+def _skip_validation(args: Dict[str, Any]) -> Dict[str, Any]:
+    return args
+
+
+def _compile_validator(tool: Tool) -> InputValidator | None:
+    """Compile the input validator of a tool.
+
+    Called once when the tool is registered, so that calls do not pay for
+    building a validation model. None for tools loaded on their first call
+    (see `catalog.LazyTool`), whose validator is compiled once they are loaded.
+    """
+    if getattr(tool, "lazy", False):
+        return None
+    input_model = getattr(tool, "input_model", None)
+    if input_model is not None:
+        return _compile_model_validator(input_model)
+    try:
+        return _compile_schema_validator(tool.input_schema)
+    except InvalidSchemaError as error:
+        # The owner of the schema (e.g., an MCP server) still validates the input.
+        logger.warning(
+            "Invalid input schema, input is not validated",
+            tool=tool.name,
+            error=str(error),
+        )
+        return _skip_validation
+
 
 class RegisteredTool(TypedDict):
     """A registered tool."""
@@ -83,27 +130,84 @@ class RegisteredTool(TypedDict):
     """Output schema of the tool."""
     fn: Callable
     """Function to call the tool."""
+    validator: InputValidator | None
+    """Validator for the input of the tool, compiled at registration.
+
+    None until the tool is loaded for tools loaded on their first call.
+    """
     permissions: set[str]
     """Scopes required to call the tool.
 
     If empty, not permissions are required and the tool is considered to be public.
     """
+    permission_mask: int
+    """Mask of the permissions in the scope index of the tool handler."""
+    definition: "ToolDefinition"
+    """Public definition of the tool, computed at registration."""
+    encoded_definition: bytes
+    """JSON encoding of the definition."""
+    etag: str
+    """ETag of the encoded definition."""
     metadata: NotRequired[Dict[str, Any]]
     """Optional metadata associated with the tool."""
+    namespace: NotRequired[str]
+    """Namespace of the tool (e.g., its toolkit), if registered with one."""
+    bulkhead: NotRequired[Bulkhead]
+    """Limits the concurrent calls of the tool, if configured."""
+    timeout: NotRequired[float]
+    """Time limit of a call in seconds, if configured."""
+    cache: NotRequired[ResultCache]
+    """Cache of the results of the tool, if configured."""
+    flights: NotRequired[SingleFlight]
+    """Shares executions between concurrent identical calls, if configured."""
+
+
+class ScopeIndex:
+    """Interns scope names as bits of a mask.
+
+    The permissions of each tool are converted to a mask at registration and the
+    scopes of a caller once per request, so that permission checks are a single
+    integer AND regardless of the number of scopes.
+    """
 
+    def __init__(self) -> None:
+        self._bits: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._bits)
+
+    def intern(self, scopes: Iterable[str]) -> int:
+        """Get the mask of scopes required by a tool, assigning bits to new ones."""
+        mask = 0
+        for scope in scopes:
+            bit = self._bits.get(scope)
+            if bit is None:
+                bit = self._bits[scope] = 1 << len(self._bits)
+            mask |= bit
+        return mask
+
+    def mask(self, scopes: Iterable[str]) -> int:
+        """Get the mask of scopes granted to a caller.
+
+        Scopes that no tool requires are ignored.
+        """
+        mask = 0
+        for scope in scopes:
+            mask |= self._bits.get(scope, 0)
+        return mask
 
-def _is_allowed(
-    tool: RegisteredTool, request: Request | None, auth_enabled: bool
-) -> bool:
-    """Check if the request has required permissions to see / use the tool."""
-    required_permissions = tool["permissions"]
 
-    if not auth_enabled or not required_permissions:
-        # Used to avoid request.auth attribute access raising an assertion errors
-        # when no auth middleware is enabled..
+def _is_allowed(tool: RegisteredTool, scope_mask: int | None) -> bool:
+    """Check if the caller has required permissions to see / use the tool.
+
+    Args:
+        tool: The tool.
+        scope_mask: Mask of the caller's scopes, or None if auth is disabled.
+    """
+    if scope_mask is None:
         return True
-    permissions = request.auth.scopes if hasattr(request, "auth") else set()
-    return required_permissions.issubset(permissions)
+    required = tool["permission_mask"]
+    return required & scope_mask == required
 
 
 class CallToolRequest(TypedDict):
@@ -117,6 +221,12 @@ class CallToolRequest(TypedDict):
     """Execution ID."""
     user_id: NotRequired[str]
     """User ID for tools requiring authentication."""
+    deadline_ms: NotRequired[int]
+    """Time in milliseconds the caller is willing to wait for the result.
+
+    The call is cancelled when the deadline (or the tool's own timeout, if
+    shorter) is hit. Must be at least 1.
+    """
 
 
 # Not using `class` syntax b/c $schema is not a valid attribute name.
@@ -134,6 +244,30 @@ class CallToolFullRequest(BaseModel):
     request: CallToolRequest = Field(..., description="Request to call a tool.")
 
 
+MAX_BATCH_SIZE = 100
+"""Maximum number of calls in a batch request."""
+
+
+class CallToolBatchRequest(BaseModel):
+    """Request to call several tools concurrently."""
+
+    protocol_schema: Union[Literal["urn:oxp:1.0"], str] = Field(
+        default="urn:oxp:1.0",
+        description="Protocol version.",
+        alias="$schema",
+    )
+    requests: list[CallToolRequest] = Field(
+        ..., description="Requests to call tools.", max_length=MAX_BATCH_SIZE
+    )
+    stream: bool = Field(
+        default=False,
+        description=(
+            "Whether to stream the results as newline-delimited JSON in the order "
+            "they complete, instead of returning them all at once in order."
+        ),
+    )
+
+
 class ToolError(TypedDict):
     """Error message from the tool."""
 
@@ -169,6 +303,27 @@ class ToolException(Exception):
         self.retry_after_ms = retry_after_ms
 
 
+class ToolCallError(HTTPException):
+    """A tool call that could not be completed, reported as a `ToolError`.
+
+    Raised for calls rejected by admission control (e.g., too many concurrent
+    calls) or cancelled at their time limit. The response has the shape of a
+    failed `CallToolResponse`.
+    """
+
+    def __init__(
+        self, status_code: int, error: ToolError, execution_id: str = ""
+    ) -> None:
+        headers = None
+        if "retry_after_ms" in error:
+            headers = {"Retry-After": str(math.ceil(error["retry_after_ms"] / 1000))}
+        super().__init__(
+            status_code=status_code, detail=error["message"], headers=headers
+        )
+        self.error = error
+        self.execution_id = execution_id
+
+
 class CallToolResponse(TypedDict):
     """Response from a tool execution."""
 
@@ -184,6 +339,19 @@ class CallToolResponse(TypedDict):
     error: NotRequired[ToolError]
     """Error message from the tool."""
 
+    cached: NotRequired[bool]
+    """Whether the value was served from the cache (only for cached tools)."""
+
+
+class BatchCallToolResult(CallToolResponse):
+    """Result of one call of a batch request."""
+
+    index: int
+    """Position of the call in the batch request."""
+
+    status_code: int
+    """HTTP status code the call would have returned on its own."""
+
 
 class ToolDefinition(TypedDict):
     """Used in the response of the list tools endpoint."""
@@ -210,24 +378,310 @@ class ToolDefinition(TypedDict):
     """List of OAuth scopes required for this tool."""
 
 
+MAX_LISTINGS = 256
+"""Maximum number of distinct scope masks whose listings are kept."""
+
+_SCOPE_MASK_KEY = "langchain_tool_server.scope_mask"
+"""Key of the caller's scope mask in the ASGI scope of a request."""
+
+
+MAX_PAGE_SIZE = 1000
+"""Maximum number of tools in a page of a listing."""
+
+MAX_ENCODED_PAGES = 64
+"""Maximum number of encoded pages kept per listing."""
+
+TOOL_FIELDS = frozenset(ToolDefinition.__annotations__)
+"""Fields of a tool definition that a listing can be projected on."""
+
+
+def _etag(content: bytes) -> str:
+    return f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check whether an `If-None-Match` header matches an ETag."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def encode_cursor(tool_id: str) -> str:
+    """Encode a cursor pointing after a tool."""
+    return base64.urlsafe_b64encode(tool_id.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Decode the ID of the tool a cursor points after.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        return base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def parse_fields(fields: str) -> tuple[str, ...]:
+    """Parse a comma-separated list of tool fields to project a listing on.
+
+    The `id` is always included so that the rest of a tool can be fetched later.
+
+    Raises:
+        ValueError: If a field is unknown.
+    """
+    selected = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = selected - TOOL_FIELDS
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(sorted(unknown))}. "
+            f"Available fields: {', '.join(sorted(TOOL_FIELDS))}"
+        )
+    return tuple(sorted(selected | {"id"}))
+
+
+class ToolListing:
+    """Tools visible to a set of scopes, encoded once.
+
+    The tool definitions are shared between requests and must not be modified.
+    Pages and other encodings of the listing are cached with it.
+    """
+
+    def __init__(self, tools: list[ToolDefinition]) -> None:
+        self.tools = tools
+        self.body = dumps(tools)
+        self.etag = _etag(self.body)
+        self._positions = {tool["id"]: i for i, tool in enumerate(tools)}
+        self._encoded: OrderedDict[Hashable, tuple[bytes, str]] = OrderedDict()
+
+    def encode(self, key: Hashable, encoder: Callable[[], bytes]) -> tuple[bytes, str]:
+        """Encode a page or another format of the listing, once per key.
+
+        Returns:
+            The encoded content and its ETag.
+        """
+        encoded = self._encoded.get(key)
+        if encoded is None:
+            content = encoder()
+            encoded = self._encoded[key] = (content, _etag(content))
+            if len(self._encoded) > MAX_ENCODED_PAGES:
+                self._encoded.popitem(last=False)
+        return encoded
+
+    def page(self, cursor: str | None, limit: int | None) -> tuple[int, int]:
+        """Get the bounds of a page of the listing.
+
+        Args:
+            cursor: Cursor returned with the previous page, None for the first.
+            limit: Maximum number of tools in the page, None for all the rest.
+
+        Returns:
+            The start and end positions of the page.
+
+        Raises:
+            ValueError: If the cursor is invalid.
+        """
+        start = 0
+        if cursor:
+            position = self._positions.get(decode_cursor(cursor))
+            if position is None:
+                raise ValueError(f"Invalid cursor: {cursor}")
+            start = position + 1
+        end = len(self.tools) if limit is None else min(start + limit, len(self.tools))
+        return start, end
+
+    def next_cursor(self, end: int) -> str | None:
+        """Get the cursor of the page after the one ending at `end`, if any."""
+        if end >= len(self.tools):
+            return None
+        return encode_cursor(self.tools[end - 1]["id"])
+
+
+class ToolSearchResult(ToolDefinition):
+    """Used in the response of the search tools endpoint."""
+
+    score: float
+    """Relevance of the tool to the query (BM25); higher is better."""
+
+
+MAX_SEARCH_RESULTS = 100
+"""Maximum number of results of a tool search."""
+
+
+def _tool_definition(tool: RegisteredTool) -> ToolDefinition:
+    """Build the public definition of a registered tool."""
+    tool_definition: ToolDefinition = {
+        "id": tool["id"],
+        "name": tool["name"],
+        "description": tool["description"],
+        "input_schema": tool["input_schema"],
+        "output_schema": tool["output_schema"],
+    }
+
+    # Add auth requirements if the tool requires authentication
+    tool_fn = tool["fn"]
+    if hasattr(tool_fn, "auth_provider") and tool_fn.auth_provider:
+        tool_definition["auth_provider"] = tool_fn.auth_provider
+        tool_definition["scopes"] = tool_fn.scopes or []
+
+    return tool_definition
+
+
+ChangeKind = Literal["added", "changed", "removed"]
+
+CatalogListener = Callable[[int], None]
+"""Called with the new version of the catalog when it changes."""
+
+MAX_CHANGES = 10_000
+"""Maximum number of catalog changes kept for delta sync."""
+
+
+class CatalogChange(NamedTuple):
+    """A change of a tool in the catalog."""
+
+    version: int
+    tool_id: str
+    kind: ChangeKind
+    permissions: frozenset[str]
+    previous_permissions: frozenset[str] | None
+    """Permissions of the tool before the change, None if it was added.
+
+    Kept as names rather than masks, since the scope index is rebuilt when the
+    catalog is replaced.
+    """
+
+
+class CatalogChanges(TypedDict):
+    """Changes of the catalog since a version, as seen by a caller."""
+
+    epoch: str
+    """Identifies the catalog; pass it back with the version."""
+
+    version: int
+    """Current version of the catalog."""
+
+    reset: bool
+    """Whether the changes are not known and `added` holds the full catalog."""
+
+    added: list[ToolDefinition]
+    """Tools added since the version."""
+
+    changed: list[ToolDefinition]
+    """Tools whose definition changed since the version."""
+
+    removed: list[str]
+    """IDs of the tools removed since the version."""
+
+
 class ToolHandler:
-    def __init__(self) -> None:
-        """Initializes the tool handler."""
+    def __init__(
+        self,
+        executors: ExecutorRegistry | None = None,
+        default_timeout: float | None = None,
+    ) -> None:
+        """Initializes the tool handler.
+
+        Args:
+            executors: Thread pools synchronous tools run on.
+            default_timeout: Time limit in seconds of calls to tools that do
+                not set their own.
+        """
         self.catalog: Dict[str, RegisteredTool] = {}
         self.auth_enabled = False
+        self.executors = executors or ExecutorRegistry()
+        self.default_timeout = default_timeout
+        self.scopes = ScopeIndex()
+        self.search_index = SearchIndex()
+        self.schemas = SchemaInterner()
+        self._listings: OrderedDict[int | None, ToolListing] = OrderedDict()
+        # Version of the catalog, bumped on every change. The epoch identifies
+        # this catalog so that versions from before a restart are not trusted.
+        self.version = 0
+        self.epoch = uuid.uuid4().hex
+        self._changes: deque[CatalogChange] = deque(maxlen=MAX_CHANGES)
+        self._listeners: list[CatalogListener] = []
 
     def add(
         self,
         tool: Tool,
         *,
         permissions: list[str] | None = None,
+        max_concurrency: int | None = None,
+        max_queue: int | None = None,
+        timeout: float | None = None,
+        cache: CachePolicy | None = None,
+        coalesce: bool | None = None,
+        namespace: str | None = None,
+        replace: bool = False,
     ) -> None:
         """Register a tool in the catalog.
 
         Args:
             tool: A Tool instance (created with @tool decorator).
             permissions: Permissions required to call the tool.
+            max_concurrency: Maximum number of concurrent calls. Overrides the
+                value set on the tool.
+            max_queue: Maximum number of calls waiting for a slot. Overrides the
+                value set on the tool.
+            timeout: Time limit of a call in seconds. Overrides the value set
+                on the tool.
+            cache: Policy for caching the results of the tool. Overrides the
+                value set on the tool.
+            coalesce: Whether concurrent identical calls share one execution.
+                Overrides the value set on the tool.
+            namespace: Prefix of the ID and name of the tool (e.g., the name of
+                its toolkit when a server hosts several toolkits).
+            replace: Whether to replace a tool with the same ID instead of
+                raising an error.
         """
+        registered_tool = self._register(
+            tool,
+            permissions=permissions,
+            max_concurrency=max_concurrency,
+            max_queue=max_queue,
+            timeout=timeout,
+            cache=cache,
+            coalesce=coalesce,
+            namespace=namespace,
+        )
+
+        previous_tool = self.catalog.get(registered_tool["id"])
+        if previous_tool is not None and not replace:
+            raise ValueError(f"Tool {registered_tool['id']} already exists")
+        self.catalog[registered_tool["id"]] = registered_tool
+        self._listings.clear()
+        self.search_index.add(
+            registered_tool["id"],
+            tool_terms(
+                registered_tool["name"],
+                registered_tool["description"],
+                registered_tool["input_schema"],
+            ),
+        )
+        if previous_tool is None:
+            self._record_change(registered_tool, "added")
+        else:
+            self._record_change(registered_tool, "changed", previous_tool)
+        self._notify()
+
+    def _register(
+        self,
+        tool: Tool,
+        *,
+        permissions: list[str] | None = None,
+        max_concurrency: int | None = None,
+        max_queue: int | None = None,
+        timeout: float | None = None,
+        cache: CachePolicy | None = None,
+        coalesce: bool | None = None,
+        namespace: str | None = None,
+    ) -> RegisteredTool:
+        """Prepare the registration of a tool (see `add`)."""
         if not isinstance(tool, Tool):
             # Try to get the function name for a better error message
             func_name = getattr(tool, "__name__", "unknown")
@@ -241,35 +695,259 @@ class ToolHandler:
                 f"  def {func_name}(...):"
             )
 
+        # Resolve the pool now so unknown executors fail at registration
+        if tool.execution == "process":
+            tool._executor = self.executors.get_process_pool()
+        else:
+            tool._executor = self.executors.get(tool.executor)
+
+        name = tool.name if namespace is None else f"{namespace}.{tool.name}"
         registered_tool = {
-            "id": tool.name,
-            "name": tool.name,
+            "id": name,
+            "name": name,
             "description": tool.description,
-            "input_schema": tool.input_schema,
-            "output_schema": tool.output_schema,
+            "input_schema": self.schemas.intern(tool.input_schema),
+            "output_schema": self.schemas.intern(tool.output_schema),
             "fn": tool,
+            "validator": _compile_validator(tool),
             "permissions": cast(set[str], set(permissions or [])),
+            "permission_mask": self.scopes.intern(permissions or []),
             "metadata": {},
         }
+        if namespace is not None:
+            registered_tool["namespace"] = namespace
+        # Identical schemas (and parts of schemas) are stored once across tools.
+        tool.input_schema = registered_tool["input_schema"]
+        tool.output_schema = registered_tool["output_schema"]
+        registered_tool["definition"] = _tool_definition(registered_tool)
+        registered_tool["encoded_definition"] = dumps(registered_tool["definition"])
+        registered_tool["etag"] = _etag(registered_tool["encoded_definition"])
+
+        if max_concurrency is None:
+            max_concurrency = tool.max_concurrency
+        if max_queue is None:
+            max_queue = tool.max_queue
+        if max_concurrency is not None:
+            registered_tool["bulkhead"] = Bulkhead(max_concurrency, max_queue or 0)
+        elif max_queue is not None:
+            raise ValueError(
+                f"Tool {name}: max_queue requires max_concurrency to be set"
+            )
 
-        if registered_tool["id"] in self.catalog:
-            raise ValueError(f"Tool {registered_tool['id']} already exists")
-        self.catalog[registered_tool["id"]] = registered_tool
+        if timeout is None:
+            timeout = tool.timeout
+        if timeout is not None:
+            if timeout <= 0:
+                raise ValueError(f"Tool {name}: timeout must be positive")
+            registered_tool["timeout"] = timeout
+
+        # Results of tools acting on behalf of a user are never shared.
+        per_user = bool(tool.auth_provider)
+        if cache is None:
+            cache = tool.cache
+        if cache is not None:
+            registered_tool["cache"] = ResultCache(cache, per_user=per_user)
+            per_user = per_user or cache.per_user
+
+        if coalesce is None:
+            coalesce = tool.coalesce
+        if coalesce:
+            registered_tool["flights"] = SingleFlight(per_user=per_user)
+
+        return registered_tool
+
+    def replace_all(
+        self, tools: list[tuple[Tool, Dict[str, Any]]]
+    ) -> list[CatalogChange]:
+        """Replace the whole catalog at once (e.g., when reloading a toolkit).
+
+        All the tools are prepared before the catalog is swapped, so an invalid
+        tool leaves the catalog untouched. Calls in flight finish on the tools
+        they started with.
 
-    async def call_tool(
-        self, call_tool_request: CallToolRequest, request: Request | None
-    ) -> CallToolResponse:
-        """Calls a tool by name with the provided payload."""
-        tool_id = call_tool_request["tool_id"]
-        args = call_tool_request.get("input", {})
-        execution_id = call_tool_request.get("execution_id", uuid.uuid4())
+        Args:
+            tools: Tools with the options to register them with (see `add`).
 
-        # Extract user_id from authenticated user context (set by auth middleware)
-        user_id = None
-        if self.auth_enabled and request and hasattr(request, "user"):
-            user_id = getattr(request.user, "identity", None)
+        Returns:
+            The changes of the catalog.
+
+        Raises:
+            ValueError: If a tool is invalid or two tools have the same ID.
+        """
+        catalog: Dict[str, RegisteredTool] = {}
+        # Start over, so that the schemas and scopes of removed tools are not
+        # kept across reloads.
+        schemas, scopes = self.schemas, self.scopes
+        self.schemas, self.scopes = SchemaInterner(), ScopeIndex()
+        try:
+            for tool, options in tools:
+                registered_tool = self._register(tool, **options)
+                tool_id = registered_tool["id"]
+                if tool_id in catalog:
+                    raise ValueError(f"Tool {tool_id} already exists")
+                catalog[tool_id] = registered_tool
+        except BaseException:
+            self.schemas, self.scopes = schemas, scopes
+            raise
+
+        for tool_id, registered_tool in catalog.items():
+            # Keep counting the calls in flight against the limits if unchanged.
+            previous = self.catalog.get(tool_id, {}).get("bulkhead")
+            bulkhead = registered_tool.get("bulkhead")
+            if (
+                previous is not None
+                and bulkhead is not None
+                and (previous.max_concurrency, previous.max_queue)
+                == (bulkhead.max_concurrency, bulkhead.max_queue)
+            ):
+                registered_tool["bulkhead"] = previous
+
+        search_index = SearchIndex()
+        for tool_id, registered_tool in catalog.items():
+            search_index.add(
+                tool_id,
+                tool_terms(
+                    registered_tool["name"],
+                    registered_tool["description"],
+                    registered_tool["input_schema"],
+                ),
+            )
+
+        previous_catalog = self.catalog
+        self.catalog = catalog
+        self.search_index = search_index
+        self._listings.clear()
+
+        changes = []
+        for tool_id, registered_tool in previous_catalog.items():
+            if tool_id not in catalog:
+                changes.append(
+                    self._record_change(registered_tool, "removed", registered_tool)
+                )
+        for tool_id, registered_tool in catalog.items():
+            previous_tool = previous_catalog.get(tool_id)
+            if previous_tool is None:
+                changes.append(self._record_change(registered_tool, "added"))
+            elif (
+                previous_tool["encoded_definition"]
+                != registered_tool["encoded_definition"]
+                or previous_tool["permissions"] != registered_tool["permissions"]
+            ):
+                changes.append(
+                    self._record_change(registered_tool, "changed", previous_tool)
+                )
+        if changes:
+            self._notify()
+        return changes
+
+    def remove(self, tool_id: str) -> None:
+        """Remove a tool from the catalog.
+
+        Raises:
+            ValueError: If the tool does not exist.
+        """
+        registered_tool = self.catalog.pop(tool_id, None)
+        if registered_tool is None:
+            raise ValueError(f"Tool {tool_id} not found")
+        self._listings.clear()
+        self.search_index.remove(tool_id)
+        self._record_change(registered_tool, "removed", registered_tool)
+        self._notify()
+
+    def add_listener(self, listener: CatalogListener) -> None:
+        """Register a function called with the new version when the catalog changes.
+
+        Used, for example, to notify MCP clients that the list of tools changed.
+        """
+        self._listeners.append(listener)
+
+    def _record_change(
+        self,
+        tool: RegisteredTool,
+        kind: ChangeKind,
+        previous: RegisteredTool | None = None,
+    ) -> CatalogChange:
+        """Bump the catalog version and record a change of a tool.
 
-        if tool_id not in self.catalog:
+        Args:
+            tool: The tool after the change (or the removed tool).
+            kind: The kind of change.
+            previous: The tool before the change, if it existed.
+        """
+        self.version += 1
+        change = CatalogChange(
+            self.version,
+            tool["id"],
+            kind,
+            frozenset(tool["permissions"]),
+            None if previous is None else frozenset(previous["permissions"]),
+        )
+        self._changes.append(change)
+        return change
+
+    def _notify(self) -> None:
+        """Notify the listeners that the catalog changed."""
+        for listener in self._listeners:
+            try:
+                listener(self.version)
+            except Exception:
+                logger.exception("Catalog listener failed", version=self.version)
+
+    def changes_since(
+        self, since: int, epoch: str | None, request: Request | None
+    ) -> CatalogChanges:
+        """Get the changes of the tools visible to a request since a version.
+
+        The full catalog is returned (with `reset` set) when the changes are no
+        longer known, or when `epoch` is not the one of this catalog (e.g., the
+        server restarted).
+        """
+        scope_mask = self.scope_mask(request)
+        granted = self.granted_scopes(request)
+        result: CatalogChanges = {
+            "epoch": self.epoch,
+            "version": self.version,
+            "reset": False,
+            "added": [],
+            "changed": [],
+            "removed": [],
+        }
+        oldest = self._changes[0].version if self._changes else self.version + 1
+        if (epoch is not None and epoch != self.epoch) or not (
+            oldest - 1 <= since <= self.version
+        ):
+            result["reset"] = True
+            result["added"] = list(self.get_listing(request).tools)
+            return result
+
+        # First change of each tool since the version
+        first: Dict[str, CatalogChange] = {}
+        start = since - oldest + 1
+        for change in itertools.islice(self._changes, start, None):
+            first.setdefault(change.tool_id, change)
+
+        # Tools are reported by whether the caller could see them at the version
+        # and can see them now, so permission changes add or remove tools too.
+        for tool_id, change in first.items():
+            before = change.previous_permissions
+            was_visible = before is not None and (granted is None or before <= granted)
+            tool = self.catalog.get(tool_id)
+            if tool is not None and _is_allowed(tool, scope_mask):
+                key = "changed" if was_visible else "added"
+                result[key].append(tool["definition"])
+            elif was_visible:
+                result["removed"].append(tool_id)
+        return result
+
+    def get_tool(self, tool_id: str, request: Request | None) -> RegisteredTool:
+        """Get a tool the request is allowed to see / use.
+
+        Raises:
+            HTTPException: 404 if the tool does not exist, or 403 if auth is
+                enabled and the tool does not exist or is not allowed.
+        """
+        tool = self.catalog.get(tool_id)
+        if tool is None:
             if self.auth_enabled:
                 raise HTTPException(
                     status_code=403,
@@ -278,58 +956,275 @@ class ToolHandler:
 
             raise HTTPException(status_code=404, detail=f"Tool {tool_id} not found")
 
-        tool = self.catalog[tool_id]
-
-        if not _is_allowed(tool, request, self.auth_enabled):
+        if not _is_allowed(tool, self.scope_mask(request)):
             raise HTTPException(
                 status_code=403,
                 detail="Tool either does not exist or insufficient permissions",
             )
+        return tool
+
+    async def call_tool(
+        self, call_tool_request: CallToolRequest, request: Request | None
+    ) -> CallToolResponse:
+        """Calls a tool by name with the provided payload."""
+        tool_id = call_tool_request["tool_id"]
+        args = call_tool_request.get("input", {})
+        execution_id = call_tool_request.get("execution_id", uuid.uuid4())
+        deadline_ms = call_tool_request.get("deadline_ms")
+        if deadline_ms is not None and deadline_ms < 1:
+            # Retrying would not help, unlike with a deadline that expired.
+            raise HTTPException(
+                status_code=400, detail="Invalid input: deadline_ms must be at least 1"
+            )
+
+        tool = self.get_tool(tool_id, request)
+
+        # Extract user_id from authenticated user context (set by auth middleware)
+        user_id = None
+        if self.auth_enabled and request and hasattr(request, "user"):
+            user = request.user
+            if isinstance(user, NamespacedUser):
+                # The user authenticated by the auth handler of the tool's toolkit
+                user = user.for_namespace(tool.get("namespace", ""))
+            # Unauthenticated users (e.g., of toolkits without auth) have none
+            if getattr(user, "is_authenticated", True):
+                user_id = getattr(user, "identity", None)
 
         # Validate input parameters
-        args = _validate_tool_input(args, tool["input_schema"])
+        validator = tool["validator"]
+        if validator is None:
+            validator = await self._load_validator(tool)
+        args = validator(args)
 
         # Call the tool
         fn = tool["fn"]
 
-        if isinstance(fn, Tool):
-            # Call our custom Tool instance (it handles auth hook internally)
-            # Pass user_id for auth tools
-            tool_output = await fn(user_id=user_id, **args)
-        else:
+        if not isinstance(fn, Tool):
             # This is an internal error
             raise AssertionError(f"Invalid tool implementation: {type(fn)}")
 
-        return {
+        cache = tool.get("cache")
+        if cache is not None:
+            cache_key = cache.key(args, user_id)
+            found, cached_output = cache.get(cache_key)
+            if found:
+                return {
+                    "success": True,
+                    "execution_id": str(execution_id),
+                    "value": cached_output,
+                    "cached": True,
+                }
+
+        timeout = tool.get("timeout", self.default_timeout)
+        if deadline_ms is not None:
+            deadline = deadline_ms / 1000
+            timeout = deadline if timeout is None else min(timeout, deadline)
+
+        flights = tool.get("flights")
+        if flights is None:
+            call = self._run_tool(tool, user_id, args)
+        else:
+            # Identical calls in flight share one execution; each caller keeps
+            # its own execution ID and time limit.
+            call = flights.run(
+                flights.key(args, user_id),
+                functools.partial(self._run_tool, tool, user_id, args),
+            )
+
+        try:
+            # Queueing for a slot counts against the time limit.
+            tool_output = await run_with_timeout(call, timeout)
+        except BulkheadFull as e:
+            raise ToolCallError(
+                status_code=429,
+                error={
+                    "message": f"Tool {tool_id} is at capacity, retry later.",
+                    "can_retry": True,
+                    "retry_after_ms": e.retry_after_ms,
+                },
+                execution_id=str(execution_id),
+            ) from e
+        except DeadlineExceeded as e:
+            raise ToolCallError(
+                status_code=504,
+                error={
+                    "message": f"Tool {tool_id} timed out after {e.timeout:g}s.",
+                    "can_retry": True,
+                },
+                execution_id=str(execution_id),
+            ) from e
+
+        response: CallToolResponse = {
             "success": True,
             "execution_id": str(execution_id),
             "value": tool_output,
         }
+        if cache is not None:
+            # Prompts to authenticate are not results of the tool.
+            if not (isinstance(tool_output, dict) and tool_output.get("auth_required")):
+                cache.set(cache_key, tool_output)
+            response["cached"] = False
+        return response
 
-    async def list_tools(self, request: Request | None) -> list[ToolDefinition]:
-        """Lists all available tools in the catalog."""
-        # Incorporate default permissions for the tools.
-        tool_definitions = []
-
-        for tool in self.catalog.values():
-            if _is_allowed(tool, request, self.auth_enabled):
-                tool_definition = {
-                    "id": tool["id"],
-                    "name": tool["name"],
-                    "description": tool["description"],
-                    "input_schema": tool["input_schema"],
-                    "output_schema": tool["output_schema"],
-                }
+    async def _load_validator(self, tool: RegisteredTool) -> InputValidator:
+        """Load a tool registered from a catalog and compile its validator.
+
+        The input is validated like the input of the imported tool would be.
+        """
+        loaded = await tool["fn"].load()
+        validator = _compile_validator(loaded)
+        tool["validator"] = validator
+        return validator
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get the hit/miss counters of the result caches, by tool ID."""
+        return {
+            tool_id: tool["cache"].stats()
+            for tool_id, tool in self.catalog.items()
+            if "cache" in tool
+        }
+
+    async def call_tools(
+        self, call_tool_requests: list[CallToolRequest], request: Request | None
+    ) -> AsyncIterator[BatchCallToolResult]:
+        """Calls several tools concurrently, yielding results as they complete.
+
+        Each call is checked for permissions and validated on its own; errors are
+        reported in the result of the call instead of failing the batch.
+        """
+        tasks = [
+            asyncio.ensure_future(self._call_tool_in_batch(i, call, request))
+            for i, call in enumerate(call_tool_requests)
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            # Stop calls that are still running if the caller goes away.
+            for task in tasks:
+                task.cancel()
+
+    async def _call_tool_in_batch(
+        self, index: int, call_tool_request: CallToolRequest, request: Request | None
+    ) -> BatchCallToolResult:
+        """Calls a tool, converting errors into a failed result."""
+        try:
+            response = await self.call_tool(call_tool_request, request)
+        except ToolCallError as e:
+            return {
+                "index": index,
+                "status_code": e.status_code,
+                "execution_id": e.execution_id,
+                "success": False,
+                "error": e.error,
+            }
+        except HTTPException as e:
+            error: ToolError = {"message": str(e.detail)}
+            status_code = e.status_code
+        except Exception as e:
+            logger.exception("Tool call failed", tool_id=call_tool_request["tool_id"])
+            error = {
+                "message": "Tool execution failed.",
+                "developer_message": f"{type(e).__name__}: {e}",
+            }
+            status_code = 500
+        else:
+            return {"index": index, "status_code": 200, **response}
+
+        return {
+            "index": index,
+            "status_code": status_code,
+            "execution_id": str(call_tool_request.get("execution_id", uuid.uuid4())),
+            "success": False,
+            "error": error,
+        }
+
+    async def _run_tool(
+        self, tool: RegisteredTool, user_id: str | None, args: Dict[str, Any]
+    ) -> Any:
+        """Run a tool within its concurrency limit."""
+        fn = tool["fn"]
+        bulkhead = tool.get("bulkhead")
+        if bulkhead is None:
+            # Call our custom Tool instance (it handles auth hook internally)
+            # Pass user_id for auth tools
+            return await fn(user_id=user_id, **args)
+        async with bulkhead.slot():
+            return await fn(user_id=user_id, **args)
+
+    def granted_scopes(self, request: Request | None) -> frozenset[str] | None:
+        """Get the scopes granted to a request.
+
+        Returns:
+            The scopes, or None if auth is disabled and every tool is allowed.
+        """
+        if not self.auth_enabled:
+            return None
+        if request is None or "auth" not in request.scope:
+            return frozenset()
+        return frozenset(request.auth.scopes)
 
-                # Add auth requirements if the tool requires authentication
-                tool_fn = tool["fn"]
-                if hasattr(tool_fn, "auth_provider") and tool_fn.auth_provider:
-                    tool_definition["auth_provider"] = tool_fn.auth_provider
-                    tool_definition["scopes"] = tool_fn.scopes or []
+    def scope_mask(self, request: Request | None) -> int | None:
+        """Get the mask of the scopes granted to a request.
 
-                tool_definitions.append(tool_definition)
+        Returns:
+            The mask, or None if auth is disabled and every tool is allowed.
+        """
+        if not self.auth_enabled:
+            return None
+        # Used to avoid request.auth attribute access raising an assertion error
+        # when no auth middleware is enabled.
+        if request is None or "auth" not in request.scope:
+            return 0
+        # Computed once per request, unless scopes were interned since then or
+        # the index was rebuilt.
+        cached = request.scope.get(_SCOPE_MASK_KEY)
+        if cached is not None and cached[:2] == (self.scopes, len(self.scopes)):
+            return cached[2]
+        mask = self.scopes.mask(request.auth.scopes)
+        request.scope[_SCOPE_MASK_KEY] = (self.scopes, len(self.scopes), mask)
+        return mask
+
+    def get_listing(self, request: Request | None) -> ToolListing:
+        """Get the listing of the tools visible to a request.
+
+        Listings are built and encoded once per scope mask, and rebuilt after
+        the catalog changes.
+        """
+        key = self.scope_mask(request)
+        listing = self._listings.get(key)
+        if listing is not None:
+            self._listings.move_to_end(key)
+            return listing
+
+        tool_definitions = [
+            tool["definition"]
+            for tool in self.catalog.values()
+            if _is_allowed(tool, key)
+        ]
+        listing = self._listings[key] = ToolListing(tool_definitions)
+        while len(self._listings) > MAX_LISTINGS:
+            self._listings.popitem(last=False)
+        return listing
 
-        return tool_definitions
+    async def list_tools(self, request: Request | None) -> list[ToolDefinition]:
+        """Lists all available tools in the catalog."""
+        return list(self.get_listing(request).tools)
+
+    async def search_tools(
+        self, query: str, k: int, request: Request | None
+    ) -> list[ToolSearchResult]:
+        """Finds the tools visible to a request that best match a query."""
+        scope_mask = self.scope_mask(request)
+        matches = self.search_index.search(
+            query,
+            k,
+            allowed=lambda tool_id: _is_allowed(self.catalog[tool_id], scope_mask),
+        )
+        return [
+            {**self.catalog[tool_id]["definition"], "score": score}
+            for tool_id, score in matches
+        ]
 
 
 class ValidationErrorResponse(TypedDict):
@@ -340,31 +1235,205 @@ class ValidationErrorResponse(TypedDict):
 
 def create_tools_router(tool_handler: ToolHandler) -> APIRouter:
     """Creates an API router for tools."""
-    router = APIRouter()
+    # Responses are returned as `ORJSONResponse` so that tool outputs and catalogs
+    # are encoded in a single pass; the return annotations document the schema.
+    router = APIRouter(route_class=ORJSONRoute)
 
     @router.get(
         "",
         operation_id="list-tools",
         responses={
             200: {"model": list[ToolDefinition]},
+            304: {"description": "The listing has not changed."},
             422: {"model": ValidationErrorResponse},
         },
     )
-    async def list_tools(request: Request) -> list[ToolDefinition]:
-        """Lists available tools."""
-        return await tool_handler.list_tools(request)
+    async def list_tools(
+        request: Request,
+        cursor: str | None = Query(
+            None, description="Cursor returned in `X-Next-Cursor` for the next page."
+        ),
+        limit: int | None = Query(
+            None, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of tools."
+        ),
+        fields: str | None = Query(
+            None,
+            description=(
+                "Comma-separated fields to return for each tool (e.g., "
+                "`name,description`). The `id` is always returned."
+            ),
+        ),
+        shared_defs: bool = Query(
+            False,
+            description=(
+                'Return `{"$defs": ..., "tools": [...]}`, where sub-schemas '
+                "repeated across tools are replaced with references "
+                '`{"$ref": "urn:langchain-tool-server:defs:<key>"}` to `$defs`.'
+            ),
+        ),
+    ) -> list[ToolDefinition]:
+        """Lists available tools.
+
+        When `limit` is set and more tools are available, the cursor of the next
+        page is returned in the `X-Next-Cursor` header. The response has an
+        `ETag`; requests with a matching `If-None-Match` header get a 304
+        response without a body.
+        """
+        listing = tool_handler.get_listing(request)
+        headers = {
+            "Cache-Control": "no-cache",
+            "X-Catalog-Version": str(tool_handler.version),
+            "X-Catalog-Epoch": tool_handler.epoch,
+        }
+
+        if cursor is None and limit is None and fields is None and not shared_defs:
+            body, etag = listing.body, listing.etag
+        else:
+            try:
+                start, end = listing.page(cursor, limit)
+                selected = parse_fields(fields) if fields is not None else None
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+
+            def encode_page() -> bytes:
+                tools = listing.tools[start:end]
+                if selected is not None:
+                    tools = [
+                        {field: tool[field] for field in selected if field in tool}
+                        for tool in tools
+                    ]
+                if shared_defs:
+                    return dumps(share_definitions(tools))
+                return dumps(tools)
+
+            body, etag = listing.encode(
+                ("rest", start, end, selected, shared_defs), encode_page
+            )
+            next_cursor = listing.next_cursor(end)
+            if next_cursor is not None:
+                headers["X-Next-Cursor"] = next_cursor
+
+        headers["ETag"] = etag
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    @router.get("/search", operation_id="search-tools")
+    async def search_tools(
+        request: Request,
+        q: str = Query(..., min_length=1, description="What the tools should do."),
+        k: int = Query(
+            10, ge=1, le=MAX_SEARCH_RESULTS, description="Number of tools to return."
+        ),
+    ) -> list[ToolSearchResult]:
+        """Find the available tools that best match a query, best first."""
+        return ORJSONResponse(await tool_handler.search_tools(q, k, request))
+
+    @router.get("/changes", operation_id="list-tool-changes")
+    async def list_tool_changes(
+        request: Request,
+        since: int = Query(
+            ..., ge=0, description="Version of the catalog the client has."
+        ),
+        epoch: str | None = Query(
+            None, description="Epoch returned with the version, to detect restarts."
+        ),
+    ) -> CatalogChanges:
+        """List the tools added, changed and removed since a catalog version.
+
+        The current version and epoch are also returned in the `X-Catalog-Version`
+        and `X-Catalog-Epoch` headers of the list tools endpoint.
+        """
+        return ORJSONResponse(tool_handler.changes_since(since, epoch, request))
+
+    @router.get(
+        "/definitions/{tool_id}",
+        operation_id="get-tool",
+        responses={
+            200: {"model": ToolDefinition},
+            304: {"description": "The tool has not changed."},
+        },
+    )
+    async def get_tool(tool_id: str, request: Request) -> ToolDefinition:
+        """Get the definition of a tool.
+
+        The path has a fixed prefix so that tools can be named like the other
+        routes (e.g., "search"). The response has an `ETag`; requests with a
+        matching `If-None-Match` header get a 304 response without a body.
+        """
+        tool = tool_handler.get_tool(tool_id, request)
+        headers = {"ETag": tool["etag"], "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), tool["etag"]):
+            return Response(status_code=304, headers=headers)
+        return Response(
+            tool["encoded_definition"], media_type="application/json", headers=headers
+        )
 
     @router.post("/call", operation_id="call-tool")
     async def call_tool(
         call_tool_request: CallToolFullRequest, request: Request
     ) -> CallToolResponse:
-        """Call a tool by name with the provided payload."""
+        """Call a tool by name with the provided payload.
+
+        Calls to tools with a result cache have an `X-Tool-Cache` header set to
+        `hit` or `miss`.
+        """
         if call_tool_request.protocol_schema not in {"urn:oxp:1.0", "otc://1.0"}:
             raise HTTPException(
                 status_code=400,
                 detail="Invalid protocol schema. Expected 'urn:oxp:1.0'.",
             )
-        return await tool_handler.call_tool(call_tool_request.request, request)
+        result = await tool_handler.call_tool(call_tool_request.request, request)
+        headers = None
+        if "cached" in result:
+            headers = {"X-Tool-Cache": "hit" if result["cached"] else "miss"}
+        return ORJSONResponse(result, headers=headers)
+
+    @router.post(
+        "/batch",
+        operation_id="call-tools-batch",
+        responses={
+            200: {
+                "model": list[BatchCallToolResult],
+                "content": {"application/x-ndjson": {}},
+            },
+        },
+    )
+    async def call_tools_batch(
+        batch_request: CallToolBatchRequest, request: Request
+    ) -> list[BatchCallToolResult]:
+        """Call several tools concurrently in one request.
+
+        Results are returned in the order of the requests, or streamed as
+        newline-delimited JSON as they complete if `stream` is set.
+        """
+        if batch_request.protocol_schema not in {"urn:oxp:1.0", "otc://1.0"}:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid protocol schema. Expected 'urn:oxp:1.0'.",
+            )
+        results = tool_handler.call_tools(batch_request.requests, request)
+
+        if batch_request.stream:
+
+            async def stream_results() -> AsyncIterator[bytes]:
+                try:
+                    async for result in results:
+                        yield dumps(result) + b"\n"
+                finally:
+                    await results.aclose()
+
+            return StreamingResponse(
+                stream_results(), media_type="application/x-ndjson"
+            )
+
+        ordered: list[BatchCallToolResult] = [None] * len(batch_request.requests)
+        try:
+            async for result in results:
+                ordered[result["index"]] = result
+        finally:
+            await results.aclose()
+        return ORJSONResponse(ordered)
 
     return router
 
@@ -394,7 +1463,7 @@ logger = structlog.getLogger(__name__)
 
 async def validation_exception_handler(
     request: Request, exc: RequestValidationError
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Exception translation for validation errors.
 
     This will match the shape of the error response to the one implemented by
@@ -403,7 +1472,23 @@ async def validation_exception_handler(
     msg = ", ".join(str(e) for e in exc.errors())
     if exc.body:
         msg = f"{exc.body}: {msg}"
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content=jsonable_encoder({"message": msg}),
+        content={"message": msg},
+    )
+
+
+async def tool_call_error_handler(
+    request: Request, exc: ToolCallError
+) -> ORJSONResponse:
+    """Render a tool call error as a failed call response with a `ToolError`."""
+    response: CallToolResponse = {
+        "execution_id": exc.execution_id,
+        "success": False,
+        "error": exc.error,
+    }
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content=response,
+        headers=exc.headers,
     )
@@ -0,0 +1,16 @@
+from langchain_tool_server import tool
+
+
+@tool
+def hello() -> str:
+    """Say hello."""
+    return "Hello, world!"
+
+
+@tool
+def add(x: int, y: int) -> int:
+    """Add two numbers."""
+    return x + y
+
+
+TOOLS = [hello, add]
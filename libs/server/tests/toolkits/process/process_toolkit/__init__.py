@@ -0,0 +1,26 @@
+"""Test toolkit with tools running on the process pool."""
+
+import os
+
+from langchain_tool_server import tool
+
+
+@tool(execution="process")
+def worker_pid() -> int:
+    """Return the ID of the process running the tool."""
+    return os.getpid()
+
+
+@tool(execution="process")
+def sum_of_squares(n: int) -> dict:
+    """Sum the squares of the numbers below n."""
+    return {"n": n, "sum": sum(i * i for i in range(n))}
+
+
+@tool(execution="process")
+def crash() -> None:
+    """Exit the worker abruptly."""
+    os._exit(1)
+
+
+TOOLS = [worker_pid, sum_of_squares, crash]
@@ -3,8 +3,10 @@
 from pathlib import Path
 
 from httpx import ASGITransport, AsyncClient
+from starlette.requests import HTTPConnection
 
-from langchain_tool_server import Server
+from langchain_tool_server import Auth, Server
+from langchain_tool_server.auth.middleware import NamespacedAuthenticationBackend
 
 
 async def test_custom_auth_called():
@@ -196,3 +198,102 @@ async def test_tool_with_auth_provider():
                     scopes=["scopeA", "scopeB"],
                     user_id="test_user_provider_token",
                 )
+
+
+async def test_toolkits_with_their_own_auth(tmp_path):
+    """Test that several toolkits are served with namespaced tools and permissions."""
+    notes = tmp_path / "notes"
+    (notes / "notes_toolkit").mkdir(parents=True)
+    (notes / "toolkit.toml").write_text(
+        "[toolkit]\n"
+        'tools = "./notes_toolkit/__init__.py:TOOLS"\n'
+        "[tools.secret]\n"
+        'permissions = ["test"]\n'
+    )
+    (notes / "notes_toolkit" / "__init__.py").write_text(
+        "from langchain_tool_server import tool\n\n\n"
+        "@tool\n"
+        "def public() -> str:\n"
+        '    """Public note."""\n'
+        '    return "public"\n\n\n'
+        "@tool\n"
+        "def secret() -> str:\n"
+        '    """Secret note."""\n'
+        '    return "secret"\n\n\n'
+        "TOOLS = [public, secret]\n"
+    )
+    auth_dir = Path(__file__).parent.parent / "toolkits" / "auth"
+    (tmp_path / "toolkits.toml").write_text(
+        f'[[toolkits]]\npath = "{auth_dir.as_posix()}"\n\n'
+        '[[toolkits]]\npath = "./notes"\nnamespace = "notes"\n'
+    )
+
+    server = Server.from_toolkit(str(tmp_path))
+    assert set(server.tool_handler.catalog) == {
+        "auth_toolkit.test_tool",
+        "auth_toolkit.test_tool_with_auth_provider",
+        "notes.public",
+        "notes.secret",
+    }
+    # Permissions of a toolkit are only granted by its own auth handler
+    assert server.tool_handler.catalog["auth_toolkit.test_tool"]["permissions"] == {
+        "auth_toolkit"
+    }
+    # Toolkits without auth are served without permissions, as on their own
+    assert server.tool_handler.catalog["notes.secret"]["permissions"] == set()
+
+    transport = ASGITransport(app=server, raise_app_exceptions=True)
+    async with AsyncClient(base_url="http://localhost", transport=transport) as client:
+        response = await client.get("/tools")
+        assert response.status_code == 200
+        assert [tool["name"] for tool in response.json()] == [
+            "notes.public",
+            "notes.secret",
+        ]
+        response = await client.post(
+            "/tools/call",
+            json={"request": {"tool_id": "notes.secret", "input": {}}},
+        )
+        assert response.json()["value"] == "secret"
+        response = await client.post(
+            "/tools/call",
+            json={
+                "request": {
+                    "tool_id": "auth_toolkit.test_tool",
+                    "input": {"message": "hi"},
+                }
+            },
+        )
+        assert response.status_code == 403
+
+        headers = {"Authorization": "Bearer token"}
+        response = await client.get("/tools", headers=headers)
+        assert response.status_code == 200
+        assert [tool["name"] for tool in response.json()] == [
+            "auth_toolkit.test_tool",
+            "auth_toolkit.test_tool_with_auth_provider",
+            "notes.public",
+            "notes.secret",
+        ]
+
+
+async def test_namespaced_users():
+    """Test that each toolkit keeps the user authenticated by its own handler."""
+    alice, bob = Auth(), Auth()
+
+    @alice.authenticate
+    async def authenticate_alice() -> dict:
+        return {"identity": "alice", "permissions": ["read"]}
+
+    @bob.authenticate
+    async def authenticate_bob() -> str:
+        return "bob"
+
+    backend = NamespacedAuthenticationBackend({"a": alice, "b": bob})
+    credentials, user = await backend.authenticate(
+        HTTPConnection({"type": "http", "headers": []})
+    )
+    assert credentials.scopes == ["a", "a:read", "b"]
+    assert user.identity == "alice"
+    assert user.for_namespace("b").identity == "bob"
+    assert user.for_namespace("c") is None
@@ -0,0 +1,94 @@
+"""Test the precompiled catalog of toolkits."""
+
+import shutil
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient
+
+from langchain_tool_server import Server
+from langchain_tool_server.catalog import (
+    LazyTool,
+    build_catalog,
+    main,
+    read_catalog,
+    write_catalog,
+)
+
+TOOLKITS = Path(__file__).parent.parent / "toolkits"
+
+
+async def test_server_from_catalog(tmp_path):
+    """Test that tools are served from the catalog and loaded on first call."""
+    catalog_path = tmp_path / "catalog.json"
+    write_catalog(
+        await build_catalog(str(TOOLKITS / "options"), mcp=False), str(catalog_path)
+    )
+    catalog = read_catalog(str(catalog_path))
+    assert catalog["toolkits"][0]["path"] == (TOOLKITS / "options").resolve()
+
+    server = Server.from_catalog(str(catalog_path))
+    add = server.tool_handler.catalog["add"]["fn"]
+    assert isinstance(add, LazyTool)
+    assert add._tool is None
+    # Options from toolkit.toml still apply
+    assert server.tool_handler.catalog["add"]["bulkhead"].max_concurrency == 8
+
+    expected = Server.from_toolkit(str(TOOLKITS / "options"))
+    transport = ASGITransport(app=server, raise_app_exceptions=True)
+    async with AsyncClient(base_url="http://localhost", transport=transport) as client:
+        response = await client.get("/tools")
+        assert response.json() == [
+            tool["definition"] for tool in expected.tool_handler.catalog.values()
+        ]
+        assert add._tool is None
+
+        response = await client.post(
+            "/tools/call",
+            json={"request": {"tool_id": "add", "input": {"x": 2, "y": 3}}},
+        )
+        assert response.json()["value"] == 5
+        assert add._tool is not None
+
+
+def test_stale_catalog(tmp_path):
+    """Test that toolkits changed since the catalog was built are imported."""
+    toolkit = tmp_path / "basic"
+    shutil.copytree(TOOLKITS / "basic", toolkit)
+    catalog_path = tmp_path / "catalog.json"
+    main([str(toolkit), "-o", str(catalog_path), "--no-mcp"])
+
+    tools_file = toolkit / "basic_toolkit" / "__init__.py"
+    tools_file.write_text(tools_file.read_text() + "\n# Changed\n")
+    server = Server.from_catalog(str(catalog_path))
+    assert not isinstance(server.tool_handler.catalog["add"]["fn"], LazyTool)
+
+
+async def test_catalog_and_toolkit_validate_the_same(tmp_path):
+    """Test that calls are validated the same way as with the imported toolkit."""
+    catalog_path = tmp_path / "catalog.json"
+    write_catalog(
+        await build_catalog(str(TOOLKITS / "basic"), mcp=False), str(catalog_path)
+    )
+    servers = [
+        Server.from_toolkit(str(TOOLKITS / "basic")),
+        Server.from_catalog(str(catalog_path)),
+    ]
+
+    results = []
+    for server in servers:
+        transport = ASGITransport(app=server, raise_app_exceptions=True)
+        async with AsyncClient(
+            base_url="http://localhost", transport=transport
+        ) as client:
+            for arguments in ({"x": "2", "y": 3}, {"x": "two", "y": 3}):
+                response = await client.post(
+                    "/tools/call",
+                    json={"request": {"tool_id": "add", "input": arguments}},
+                )
+                body = response.json()
+                body.pop("execution_id", None)
+                results.append((response.status_code, body))
+
+    assert results[:2] == results[2:]
+    assert results[0] == (200, {"success": True, "value": 5})
+    assert results[1][0] == 400
@@ -0,0 +1,150 @@
+"""Test compiled JSON schema validation."""
+
+import pytest
+
+from langchain_tool_server.json_schema import (
+    InvalidSchemaError,
+    _compile_canonical,
+    compile_schema,
+)
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "query": {"type": "string", "minLength": 1},
+        "limit": {"type": "integer", "minimum": 1, "maximum": 100},
+        "order": {"enum": ["asc", "desc"]},
+        "since": {"type": "string", "format": "date-time"},
+        "tags": {"type": "array", "items": {"type": "string"}, "uniqueItems": True},
+        "filter": {"$ref": "#/$defs/Filter"},
+    },
+    "required": ["query"],
+    "additionalProperties": False,
+    "$defs": {
+        "Filter": {
+            "type": "object",
+            "properties": {
+                "field": {"type": "string"},
+                "value": {"anyOf": [{"type": "string"}, {"type": "number"}]},
+                "and": {"type": "array", "items": {"$ref": "#/$defs/Filter"}},
+            },
+            "required": ["field", "value"],
+        }
+    },
+}
+
+
+def test_valid_input():
+    """Test that valid input produces no errors."""
+    validate = compile_schema(SCHEMA)
+    assert validate({"query": "x"}) == []
+    assert (
+        validate(
+            {
+                "query": "x",
+                "limit": 10,
+                "order": "asc",
+                "since": "2024-01-01T00:00:00Z",
+                "tags": ["a", "b"],
+                "filter": {
+                    "field": "a",
+                    "value": 1,
+                    "and": [{"field": "b", "value": "c"}],
+                },
+            }
+        )
+        == []
+    )
+
+
+def test_invalid_input():
+    """Test that errors are reported with the path of the invalid value."""
+    validate = compile_schema(SCHEMA)
+    assert validate({}) == ["'query' is a required property"]
+    assert validate({"query": "x", "limit": True}) == [
+        "limit: True is not of type 'integer'"
+    ]
+    assert validate({"query": "x", "limit": 0}) == [
+        "limit: 0 is less than the minimum of 1"
+    ]
+    assert validate({"query": "x", "order": "up"}) == [
+        "order: 'up' is not one of ['asc', 'desc']"
+    ]
+    assert validate({"query": "x", "since": "yesterday"}) == [
+        "since: 'yesterday' is not a 'date-time'"
+    ]
+    assert validate({"query": "x", "tags": ["a", "a"]}) == [
+        "tags: ['a', 'a'] has non-unique elements"
+    ]
+    assert validate({"query": "x", "other": 1}) == [
+        "Additional properties are not allowed ('other' was unexpected)"
+    ]
+    assert validate(["query"]) == ["['query'] is not of type 'object'"]
+
+
+def test_recursive_reference():
+    """Test that recursive references are validated at every depth."""
+    validate = compile_schema(SCHEMA)
+    errors = validate(
+        {
+            "query": "x",
+            "filter": {"field": "a", "value": 1, "and": [{"field": "b"}]},
+        }
+    )
+    assert errors == ["filter.and.0: 'value' is a required property"]
+
+
+def test_reference_cycles_accept_any_value():
+    """Test that references leading back to themselves constrain nothing."""
+    assert compile_schema({"$ref": "#"})({"any": "value"}) == []
+    validate = compile_schema(
+        {
+            "$defs": {"A": {"anyOf": [{"$ref": "#/$defs/A"}, {"type": "string"}]}},
+            "type": "object",
+            "properties": {"a": {"$ref": "#/$defs/A"}, "b": {"type": "integer"}},
+        }
+    )
+    assert validate({"a": 1, "b": 2}) == []
+    assert validate({"a": 1, "b": "2"}) == ["b: '2' is not of type 'integer'"]
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [
+        {"type": "any"},
+        {"type": "string", "pattern": "("},
+        {"properties": {"a": {"$ref": "#/$defs/Missing"}}},
+        {"$ref": "https://example.com/schema.json"},
+    ],
+)
+def test_invalid_schema(schema):
+    """Test that invalid schemas and unresolvable references fail to compile."""
+    with pytest.raises(InvalidSchemaError):
+        compile_schema(schema)
+
+
+def test_references_resolve_against_nested_ids():
+    """Test that references resolve against the `$id` of the enclosing schema."""
+    validate = compile_schema(
+        {
+            "$defs": {
+                "Item": {
+                    "$id": "https://example.com/item.json",
+                    "properties": {"name": {"$ref": "#/$defs/Name"}},
+                    "$defs": {"Name": {"type": "string"}},
+                }
+            },
+            "properties": {"item": {"$ref": "https://example.com/item.json"}},
+        }
+    )
+    assert validate({"item": {"name": 1}}) == ["item.name: 1 is not of type 'string'"]
+
+
+def test_compiled_schema_is_cached():
+    """Test that equal schemas are compiled only once."""
+    _compile_canonical.cache_clear()
+    compile_schema(SCHEMA)
+    # Same schema with a different key order
+    compile_schema(dict(reversed(list(SCHEMA.items()))))
+    assert _compile_canonical.cache_info().hits == 1
+    assert _compile_canonical.cache_info().misses == 1
@@ -1,10 +1,16 @@
 """Test MCP functionality."""
 
+import asyncio
 from pathlib import Path
 
+import pytest
 from httpx import ASGITransport, AsyncClient
 
-from langchain_tool_server import Server
+from langchain_tool_server import Server, tool
+from langchain_tool_server.context import Context
+from langchain_tool_server.mcp import MCPStreamableHandler
+from langchain_tool_server.serialization import loads
+from langchain_tool_server.tools import ToolHandler
 
 
 async def test_simple():
@@ -115,3 +121,184 @@ async def test_invalid_params():
         assert data["id"] == 1
         assert "error" in data
         assert "Invalid input" in data["error"]["message"]
+
+
+async def test_sessions():
+    """Test that sessions are created by initialize only."""
+    server = Server(enable_mcp=True)
+    transport = ASGITransport(app=server, raise_app_exceptions=True)
+    async with AsyncClient(base_url="http://localhost", transport=transport) as client:
+        request = {"jsonrpc": "2.0", "id": 1, "method": "tools/list", "params": {}}
+        response = await client.post("/mcp", json=request)
+        assert response.status_code == 200
+        assert "Mcp-Session-Id" not in response.headers
+
+        response = await client.post(
+            "/mcp", json={"jsonrpc": "2.0", "id": 2, "method": "initialize"}
+        )
+        session_id = response.headers["Mcp-Session-Id"]
+
+        headers = {"Mcp-Session-Id": session_id}
+        response = await client.post("/mcp", json=request, headers=headers)
+        assert response.status_code == 200
+        assert response.headers["Mcp-Session-Id"] == session_id
+
+        response = await client.delete("/mcp", headers=headers)
+        assert response.status_code == 204
+        response = await client.post("/mcp", json=request, headers=headers)
+        assert response.status_code == 404
+        assert response.json()["error"]["message"] == "Session not found"
+
+
+async def test_batch():
+    """Test that the requests of a batch are answered in one array."""
+    test_dir = Path(__file__).parent.parent / "toolkits" / "basic"
+    server = Server.from_toolkit(str(test_dir), enable_mcp=True)
+    transport = ASGITransport(app=server, raise_app_exceptions=True)
+    async with AsyncClient(base_url="http://localhost", transport=transport) as client:
+        response = await client.post(
+            "/mcp",
+            json=[
+                {
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "tools/call",
+                    "params": {"name": "add", "arguments": {"x": 1, "y": 2}},
+                },
+                {"jsonrpc": "2.0", "method": "notifications/initialized"},
+                {"jsonrpc": "2.0", "method": "notifications/cancelled"},
+                {
+                    "jsonrpc": "2.0",
+                    "method": "tools/call",
+                    "params": {"name": "add", "arguments": {"x": 1, "y": 2}},
+                },
+                {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+                {"jsonrpc": "2.0", "id": 3, "method": "initialize"},
+                {"jsonrpc": "2.0", "id": 4, "method": "unknown"},
+                "not a message",
+            ],
+        )
+        assert response.status_code == 200
+        results = response.json()
+        assert [result["id"] for result in results] == [1, 2, 3, 4, None]
+        assert results[0]["result"]["content"][0]["text"] == "3"
+        assert "add" in [tool["name"] for tool in results[1]["result"]["tools"]]
+        assert [result["error"]["code"] for result in results[2:]] == [
+            -32600,
+            -32601,
+            -32600,
+        ]
+
+        response = await client.post("/mcp", json=[])
+        assert response.json()["error"]["code"] == -32600
+
+        response = await client.post(
+            "/mcp",
+            json=[
+                {"jsonrpc": "2.0", "method": "notifications/initialized"},
+                {"jsonrpc": "2.0", "method": "notifications/cancelled"},
+            ],
+        )
+        assert response.status_code == 202
+
+
+async def test_streamed_call():
+    """Test that progress and the result of a call are streamed as events."""
+    server = Server(enable_mcp=True)
+
+    @tool
+    def count(context: Context, n: int) -> int:
+        """Count up to n."""
+        for i in range(n):
+            context.report_progress(i + 1, total=n, message=f"Counted {i + 1}")
+        return n
+
+    server._add_tool(count)
+    assert "context" not in count.input_schema["properties"]
+
+    transport = ASGITransport(app=server, raise_app_exceptions=True)
+    async with AsyncClient(base_url="http://localhost", transport=transport) as client:
+        request = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "tools/call",
+            "params": {
+                "name": "count",
+                "arguments": {"n": 2},
+                "_meta": {"progressToken": "t"},
+            },
+        }
+        headers = {"Accept": "application/json, text/event-stream"}
+        response = await client.post("/mcp", json=request, headers=headers)
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [
+            loads(line[len("data: ") :])
+            for line in response.text.splitlines()
+            if line.startswith("data: ")
+        ]
+        assert [event.get("method") for event in events] == [
+            "notifications/progress",
+            "notifications/progress",
+            None,
+        ]
+        assert events[1]["params"] == {
+            "progressToken": "t",
+            "progress": 2,
+            "total": 2,
+            "message": "Counted 2",
+        }
+        assert events[2]["result"]["content"][0]["text"] == "2"
+
+        # Without Accept: text/event-stream, the response is plain JSON.
+        response = await client.post("/mcp", json=request)
+        assert response.json()["result"]["content"][0]["text"] == "2"
+
+
+async def test_event_stream():
+    """Test that sessions are notified on their stream when the tools change."""
+    tool_handler = ToolHandler()
+    handler = MCPStreamableHandler(tool_handler)
+    session = await handler.create_session()
+    stream = handler.open_stream(session.session_id)
+    next_event = asyncio.ensure_future(stream.__anext__())
+    # Let the stream open
+    await asyncio.sleep(0)
+
+    @tool
+    def add(x: int, y: int) -> int:
+        """Add two numbers."""
+        return x + y
+
+    tool_handler.add(add)
+    event = await asyncio.wait_for(next_event, 1)
+    assert loads(event.split(b"data: ")[1]) == {
+        "jsonrpc": "2.0",
+        "method": "notifications/tools/list_changed",
+    }
+
+    # Terminating the session ends its stream
+    await handler.delete_session(session.session_id)
+    with pytest.raises(StopAsyncIteration):
+        await asyncio.wait_for(stream.__anext__(), 1)
+    assert not handler._streams
+
+
+async def test_event_stream_requests():
+    """Test the requests that cannot open an event stream."""
+    server = Server(enable_mcp=True)
+    transport = ASGITransport(app=server, raise_app_exceptions=True)
+    async with AsyncClient(base_url="http://localhost", transport=transport) as client:
+        response = await client.post(
+            "/mcp", json={"jsonrpc": "2.0", "id": 1, "method": "initialize"}
+        )
+        capabilities = response.json()["result"]["capabilities"]
+        assert capabilities["tools"] == {"listChanged": True}
+
+        response = await client.get("/mcp")
+        assert response.status_code == 405
+        headers = {"Accept": "text/event-stream"}
+        response = await client.get("/mcp", headers=headers)
+        assert response.status_code == 400
+        headers["Mcp-Session-Id"] = "unknown"
+        response = await client.get("/mcp", headers=headers)
+        assert response.status_code == 404
@@ -1,5 +1,6 @@
 """Test REST API functionality."""
 
+import json
 from pathlib import Path
 
 from httpx import ASGITransport, AsyncClient
@@ -91,3 +92,48 @@ async def test_invalid_params():
         # Should return error details
         assert "detail" in data
         assert "Invalid input" in data["detail"]
+
+
+async def test_batch():
+    """Test calling several tools in one request."""
+    test_dir = Path(__file__).parent.parent / "toolkits" / "basic"
+    server = Server.from_toolkit(str(test_dir), enable_mcp=False)
+
+    requests = [
+        {"tool_id": "add", "input": {"x": 1, "y": 2}},
+        {"tool_id": "hello"},
+        {"tool_id": "add", "input": {"x": "one"}, "execution_id": "invalid"},
+        {"tool_id": "missing"},
+    ]
+
+    transport = ASGITransport(app=server, raise_app_exceptions=True)
+    async with AsyncClient(base_url="http://localhost", transport=transport) as client:
+        response = await client.post("/tools/batch", json={"requests": requests})
+
+        assert response.status_code == 200
+        results = response.json()
+        # Results are in the order of the requests
+        assert [r["index"] for r in results] == [0, 1, 2, 3]
+        assert [r["status_code"] for r in results] == [200, 200, 400, 404]
+        assert results[0]["value"] == 3
+        assert results[1]["value"] == "Hello, world!"
+        assert results[2]["success"] is False
+        assert results[2]["execution_id"] == "invalid"
+        assert "Invalid input" in results[2]["error"]["message"]
+        assert results[3]["error"]["message"] == "Tool missing not found"
+
+        # Stream results as they complete
+        response = await client.post(
+            "/tools/batch", json={"requests": requests, "stream": True}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        streamed = [json.loads(line) for line in response.text.splitlines()]
+        assert sorted(r["index"] for r in streamed) == [0, 1, 2, 3]
+        assert {r["index"]: r["status_code"] for r in streamed} == {
+            0: 200,
+            1: 200,
+            2: 400,
+            3: 404,
+        }
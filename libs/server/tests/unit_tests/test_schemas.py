@@ -0,0 +1,97 @@
+"""Test schema deduplication."""
+
+import orjson
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+
+from langchain_tool_server import Server, tool
+from langchain_tool_server.schemas import (
+    DEFS_PREFIX,
+    SchemaInterner,
+    expand_definitions,
+    share_definitions,
+)
+
+
+class Address(BaseModel):
+    street: str
+    city: str
+    postal_code: str
+
+
+@tool
+def ship(address: Address, weight: float) -> str:
+    """Ship a parcel."""
+    return "shipped"
+
+
+@tool
+def geocode(address: Address) -> dict:
+    """Get the coordinates of an address."""
+    return {}
+
+
+def test_interner_stores_identical_schemas_once():
+    """Test that identical schemas and sub-schemas share the same objects."""
+    interner = SchemaInterner()
+    first = interner.intern(ship.input_schema)
+    second = interner.intern(geocode.input_schema)
+
+    assert first == ship.input_schema
+    assert first["$defs"]["Address"] is second["$defs"]["Address"]
+    assert interner.intern(dict(ship.input_schema)) is first
+
+
+def test_interner_keeps_the_order_of_keys():
+    """Test that schemas with the same keys in another order are not shared."""
+
+    @tool
+    def f1(b: int, a: str) -> str:
+        """F1."""
+        return a
+
+    @tool
+    def f2(a: str, b: int) -> str:
+        """F2."""
+        return a
+
+    interner = SchemaInterner()
+    interner.intern(f1.input_schema)
+    schema = interner.intern(f2.input_schema)
+    assert list(schema["properties"]) == ["a", "b"]
+    assert schema == f2.input_schema
+
+
+def test_shared_definitions_round_trip():
+    """Test that repeated sub-schemas are hoisted and can be expanded back."""
+    tools = [
+        {"id": t.name, "input_schema": t.input_schema, "output_schema": t.output_schema}
+        for t in (ship, geocode)
+    ]
+    document = share_definitions(tools)
+
+    assert len(document["$defs"]) == 1
+    (address,) = document["$defs"].values()
+    assert address == ship.input_schema["$defs"]["Address"]
+    ref = document["tools"][0]["input_schema"]["$defs"]["Address"]
+    assert ref["$ref"].startswith(DEFS_PREFIX)
+    # Schemas that are not repeated are left in place
+    assert document["tools"][0]["output_schema"] == ship.output_schema
+
+    assert expand_definitions(document) == tools
+
+
+async def test_listing_with_shared_definitions():
+    """Test the listing mode with shared definitions."""
+    server = Server()
+    server._add_tools(ship, geocode)
+
+    transport = ASGITransport(app=server, raise_app_exceptions=True)
+    async with AsyncClient(base_url="http://localhost", transport=transport) as client:
+        full = (await client.get("/tools")).json()
+        response = await client.get("/tools", params={"shared_defs": True})
+
+    document = response.json()
+    assert len(document["$defs"]) == 1
+    assert len(response.content) < len(orjson.dumps(full))
+    assert expand_definitions(document) == full
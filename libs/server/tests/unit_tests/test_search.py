@@ -0,0 +1,83 @@
+"""Test ranked tool search."""
+
+from httpx import ASGITransport, AsyncClient
+
+from langchain_tool_server import Server, tool
+from langchain_tool_server.search import SearchIndex, tokenize, tool_terms
+
+
+@tool
+def get_weather(city: str, units: str = "metric") -> str:
+    """Get the current weather forecast for a city."""
+    return f"Sunny in {city}"
+
+
+@tool
+def send_email(recipient: str, subject: str, body: str) -> str:
+    """Send an email message."""
+    return "sent"
+
+
+@tool
+def convert_currency(amount: float, currency: str) -> float:
+    """Convert an amount of money to another currency."""
+    return amount
+
+
+def test_tokenize():
+    """Test that names are split into words."""
+    assert tokenize("getWeather") == ["get", "weather"]
+    assert tokenize("send_email v2") == ["send", "email", "v", "2"]
+    assert tokenize("HTTPRequest") == ["http", "request"]
+
+
+def test_index_is_updated_incrementally():
+    """Test that tools can be added and removed without rebuilding the index."""
+    index = SearchIndex()
+    for t in (get_weather, send_email, convert_currency):
+        index.add(t.name, tool_terms(t.name, t.description, t.input_schema))
+
+    assert [tool_id for tool_id, _ in index.search("weather in Paris")] == [
+        "get_weather"
+    ]
+    # Property names are indexed too
+    assert index.search("recipient")[0][0] == "send_email"
+    assert index.search("nothing matches") == []
+
+    index.remove("get_weather")
+    assert index.search("weather") == []
+    assert len(index) == 2
+
+    results = index.search("send money", k=1)
+    assert len(results) == 1
+
+
+async def test_search_endpoints():
+    """Test that searches return the best matching tools over REST and MCP."""
+    server = Server(enable_mcp=True)
+    server._add_tools(get_weather, send_email, convert_currency)
+
+    transport = ASGITransport(app=server, raise_app_exceptions=True)
+    async with AsyncClient(base_url="http://localhost", transport=transport) as client:
+        response = await client.get("/tools/search", params={"q": "email", "k": 2})
+        assert response.status_code == 200
+        results = response.json()
+        assert [r["name"] for r in results] == ["send_email"]
+        assert results[0]["input_schema"] == send_email.input_schema
+        assert results[0]["score"] > 0
+
+        response = await client.get("/tools/search", params={"q": ""})
+        assert response.status_code == 422
+
+        response = await client.post(
+            "/mcp",
+            json={
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "tools/search",
+                "params": {"query": "currency conversion", "k": 1},
+            },
+        )
+        tools = response.json()["result"]["tools"]
+        assert [t["name"] for t in tools] == ["convert_currency"]
+        assert "inputSchema" in tools[0]
@@ -0,0 +1,78 @@
+"""Test the stores of MCP sessions."""
+
+import pytest
+
+from langchain_tool_server.sessions import InMemorySessionStore, SQLiteSessionStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    stores = []
+
+    def make(**kwargs):
+        if request.param == "memory":
+            store = InMemorySessionStore(**kwargs)
+        else:
+            store = SQLiteSessionStore(str(tmp_path / "sessions.db"), **kwargs)
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        if isinstance(store, SQLiteSessionStore):
+            store.close()
+
+
+def test_sessions_are_bounded(make_store, mocker):
+    """Test that the least recently used sessions are evicted and idle ones expire."""
+    clock = mocker.patch("langchain_tool_server.sessions.time")
+    clock.monotonic.return_value = clock.time.return_value = 1000.0
+    store = make_store(max_sessions=2, session_ttl=60)
+
+    first, second = store.create(), store.create()
+    clock.monotonic.return_value = clock.time.return_value = 1010.0
+    assert store.get(first.session_id) is not None
+    third = store.create()
+    assert store.get(second.session_id) is None
+    assert len(store) == 2
+
+    first.initialized = True
+    store.save(first)
+    assert store.get(first.session_id).initialized
+
+    assert store.delete(first.session_id)
+    assert not store.delete(first.session_id)
+
+    clock.monotonic.return_value = clock.time.return_value = 1071.0
+    assert store.get(third.session_id) is None
+
+
+def test_sessions_are_shared_between_sqlite_stores(tmp_path):
+    """Test that workers with their own store see the same sessions."""
+    path = str(tmp_path / "sessions.db")
+    worker1, worker2 = SQLiteSessionStore(path), SQLiteSessionStore(path)
+    try:
+        session = worker1.create()
+        session.initialized = True
+        worker1.save(session)
+        assert worker2.get(session.session_id).initialized
+        assert worker2.delete(session.session_id)
+        assert worker1.get(session.session_id) is None
+    finally:
+        worker1.close()
+        worker2.close()
+
+
+def test_sqlite_store_writes_last_use_sparingly(tmp_path, mocker):
+    """Test that the last use is only written once older than a fraction of the TTL."""
+    clock = mocker.patch("langchain_tool_server.sessions.time")
+    clock.time.return_value = 1000.0
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"), session_ttl=60)
+    try:
+        session = store.create()
+        clock.time.return_value = 1005.0
+        assert store.get(session.session_id).last_seen == 1000.0
+        clock.time.return_value = 1007.0
+        assert store.get(session.session_id).last_seen == 1007.0
+    finally:
+        store.close()
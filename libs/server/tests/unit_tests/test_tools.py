@@ -0,0 +1,1074 @@
+"""Test the tool handler."""
+
+import asyncio
+import json
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from fastapi import HTTPException
+from httpx import ASGITransport, AsyncClient
+
+from langchain_tool_server import CachePolicy, Server, tool
+from langchain_tool_server.executors import ExecutorRegistry
+from langchain_tool_server.tools import ToolCallError, ToolHandler
+
+
+@tool
+def add(x: int, y: int = 1) -> int:
+    """Add two numbers."""
+    return x + y
+
+
+@tool
+def greet(name: str, greeting: Optional[str] = "Hello") -> str:
+    """Greet someone."""
+    return f"{greeting}, {name}!"
+
+
+async def test_validator_compiled_at_registration():
+    """Test that the input validator is built once and reused for every call."""
+    handler = ToolHandler()
+    handler.add(add)
+
+    validator = handler.catalog["add"]["validator"]
+    assert validator({"x": "5"}) == {"x": 5}
+
+    response = await handler.call_tool({"tool_id": "add", "input": {"x": 2}}, None)
+    assert response["value"] == 3
+    # The validator is not rebuilt by calls
+    assert handler.catalog["add"]["validator"] is validator
+
+
+async def test_validator_uses_function_defaults():
+    """Test that arguments that are not provided use the function defaults."""
+    handler = ToolHandler()
+    handler.add(greet)
+
+    response = await handler.call_tool(
+        {"tool_id": "greet", "input": {"name": "Ada"}}, None
+    )
+    assert response["value"] == "Hello, Ada!"
+
+    response = await handler.call_tool(
+        {"tool_id": "greet", "input": {"name": "Ada", "greeting": "Hi"}}, None
+    )
+    assert response["value"] == "Hi, Ada!"
+
+
+async def test_validator_rejects_invalid_input():
+    """Test that invalid input raises a 400 error."""
+    handler = ToolHandler()
+    handler.add(add)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await handler.call_tool({"tool_id": "add", "input": {"x": "abc"}}, None)
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail.startswith("Invalid input: x:")
+
+
+async def test_schema_validator_for_json_schema_tools():
+    """Test that tools without an input model are validated with their schema."""
+    from unittest.mock import MagicMock
+
+    from langchain_tool_server.mcp_loader import MCPToolAdapter
+
+    base_tool = MagicMock()
+    base_tool.name = "search"
+    base_tool.description = "Search."
+    base_tool.args_schema = {
+        "type": "object",
+        "properties": {
+            "query": {"type": "string"},
+            "filters": {"type": "array", "items": {"type": "object"}},
+        },
+        "required": ["query"],
+    }
+
+    handler = ToolHandler()
+    handler.add(MCPToolAdapter(base_tool))
+    validator = handler.catalog["search"]["validator"]
+
+    args = {"query": "x", "filters": [{"a": 1}]}
+    assert validator(args) == args
+
+    with pytest.raises(HTTPException) as exc_info:
+        validator({"filters": ["a"]})
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == (
+        "Invalid input: 'query' is a required property; "
+        "filters.0: 'a' is not of type 'object'"
+    )
+
+
+async def test_invalid_json_schema_passes_input_through():
+    """Test that a tool with an invalid schema is registered without validation."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    from langchain_tool_server.mcp_loader import MCPToolAdapter
+
+    base_tool = MagicMock()
+    base_tool.name = "search"
+    base_tool.description = "Search."
+    base_tool.args_schema = {
+        "type": "object",
+        "properties": {"query": {"type": "any"}},
+    }
+    base_tool.ainvoke = AsyncMock(return_value="found")
+
+    handler = ToolHandler()
+    handler.add(MCPToolAdapter(base_tool))
+
+    response = await handler.call_tool(
+        {"tool_id": "search", "input": {"query": 1}}, None
+    )
+    assert response["value"] == "found"
+    base_tool.ainvoke.assert_awaited_once_with({"query": 1})
+
+
+async def test_sync_tools_run_off_the_event_loop():
+    """Test that a blocking sync tool does not block the event loop."""
+    started = threading.Event()
+    release = threading.Event()
+
+    @tool
+    def blocking() -> str:
+        """Block until released."""
+        started.set()
+        release.wait(timeout=5)
+        return threading.current_thread().name
+
+    handler = ToolHandler()
+    handler.add(blocking)
+    handler.add(add)
+
+    task = asyncio.create_task(handler.call_tool({"tool_id": "blocking"}, None))
+    await asyncio.to_thread(started.wait, 5)
+    # Other tools can be called while the sync tool is blocked
+    response = await handler.call_tool({"tool_id": "add", "input": {"x": 1}}, None)
+    assert response["value"] == 2
+    assert not task.done()
+
+    release.set()
+    response = await task
+    assert response["value"].startswith("tool-default")
+    handler.executors.shutdown()
+
+
+async def test_named_executor():
+    """Test that tools can opt into a named thread pool."""
+
+    @tool(executor="io")
+    def where() -> str:
+        """Return the name of the thread."""
+        return threading.current_thread().name
+
+    handler = ToolHandler(executors=ExecutorRegistry(executors={"io": 1}))
+    handler.add(where)
+
+    response = await handler.call_tool({"tool_id": "where"}, None)
+    assert response["value"].startswith("tool-io")
+    handler.executors.shutdown()
+
+    with pytest.raises(ValueError, match="Unknown executor 'io'"):
+        ToolHandler().add(where)
+
+
+async def test_process_execution():
+    """Test that process tools run on the process pool of the server."""
+    test_dir = Path(__file__).parent.parent / "toolkits" / "process"
+    server = Server.from_toolkit(str(test_dir), process_workers=1)
+    handler = server.tool_handler
+
+    try:
+        response = await handler.call_tool({"tool_id": "worker_pid"}, None)
+        assert response["value"] != os.getpid()
+
+        response = await handler.call_tool(
+            {"tool_id": "sum_of_squares", "input": {"n": "4"}}, None
+        )
+        assert response["value"] == {"n": 4, "sum": 14}
+    finally:
+        handler.executors.shutdown()
+
+
+async def test_process_pool_recovers_from_crashed_worker():
+    """Test that calls succeed again after a worker exits abruptly."""
+    test_dir = Path(__file__).parent.parent / "toolkits" / "process"
+    server = Server.from_toolkit(str(test_dir), process_workers=1)
+    handler = server.tool_handler
+
+    try:
+        with pytest.raises(BrokenProcessPool):
+            await handler.call_tool({"tool_id": "crash"}, None)
+
+        response = await handler.call_tool(
+            {"tool_id": "sum_of_squares", "input": {"n": 3}}, None
+        )
+        assert response["value"] == {"n": 3, "sum": 5}
+    finally:
+        handler.executors.shutdown()
+
+
+def test_process_execution_requires_sync_function():
+    """Test that async functions cannot run on the process pool."""
+    with pytest.raises(ValueError, match="Only synchronous functions"):
+
+        @tool(execution="process")
+        async def async_tool() -> str:
+            """An async tool."""
+            return "result"
+
+
+async def test_bulkhead_rejects_calls_when_queue_is_full():
+    """Test that calls beyond max_concurrency + max_queue are rejected with 429."""
+    release = asyncio.Event()
+
+    @tool(max_concurrency=1, max_queue=1)
+    async def slow() -> str:
+        """Wait until released."""
+        await release.wait()
+        return "done"
+
+    server = Server()
+    server._add_tool(slow)
+    handler = server.tool_handler
+
+    running = asyncio.create_task(handler.call_tool({"tool_id": "slow"}, None))
+    queued = asyncio.create_task(handler.call_tool({"tool_id": "slow"}, None))
+    await asyncio.sleep(0)
+    assert handler.catalog["slow"]["bulkhead"].waiting == 1
+
+    transport = ASGITransport(app=server, raise_app_exceptions=True)
+    async with AsyncClient(base_url="http://localhost", transport=transport) as client:
+        response = await client.post(
+            "/tools/call",
+            json={"request": {"tool_id": "slow", "execution_id": "rejected"}},
+        )
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    data = response.json()
+    assert data["execution_id"] == "rejected"
+    assert data["success"] is False
+    assert data["error"]["can_retry"] is True
+    assert data["error"]["retry_after_ms"] == 1000
+
+    release.set()
+    assert (await running)["value"] == "done"
+    assert (await queued)["value"] == "done"
+
+
+def test_tool_options_from_toolkit():
+    """Test that per-tool options are read from toolkit.toml."""
+    test_dir = Path(__file__).parent.parent / "toolkits" / "options"
+    server = Server.from_toolkit(str(test_dir))
+
+    bulkhead = server.tool_handler.catalog["add"]["bulkhead"]
+    assert bulkhead.max_concurrency == 8
+    assert bulkhead.max_queue == 32
+    assert "bulkhead" not in server.tool_handler.catalog["hello"]
+    assert server.tool_handler.catalog["add"]["cache"].policy.max_entries == 100
+
+
+async def test_timeout_cancels_the_call():
+    """Test that calls are cancelled at the tool timeout with a 504 error."""
+    cancelled = asyncio.Event()
+
+    @tool(timeout=0.05)
+    async def hang() -> str:
+        """Never return."""
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "done"
+
+    handler = ToolHandler()
+    handler.add(hang)
+
+    with pytest.raises(ToolCallError) as exc_info:
+        await handler.call_tool({"tool_id": "hang", "execution_id": "1"}, None)
+
+    assert exc_info.value.status_code == 504
+    assert exc_info.value.execution_id == "1"
+    assert exc_info.value.error["can_retry"] is True
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+
+async def test_timed_out_sync_calls_keep_their_slot():
+    """Test that sync calls still running after a timeout count against the limit."""
+    lock = threading.Lock()
+    release = threading.Event()
+    running = 0
+    peak = 0
+
+    @tool(max_concurrency=1, max_queue=2, timeout=0.05)
+    def block() -> str:
+        """Block until released."""
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        release.wait(timeout=5)
+        with lock:
+            running -= 1
+        return "done"
+
+    handler = ToolHandler()
+    handler.add(block)
+
+    # The first call times out but keeps running, so the next ones wait for it.
+    for _ in range(3):
+        with pytest.raises(ToolCallError) as exc_info:
+            await handler.call_tool({"tool_id": "block"}, None)
+        assert exc_info.value.status_code == 504
+
+    release.set()
+    response = await handler.call_tool({"tool_id": "block", "deadline_ms": 5000}, None)
+    assert response["value"] == "done"
+    assert peak == 1
+    handler.executors.shutdown()
+
+
+async def test_client_deadline_and_default_timeout():
+    """Test that the shortest of the deadline and the default timeout applies."""
+
+    @tool
+    async def nap(seconds: float) -> str:
+        """Sleep for a while."""
+        await asyncio.sleep(seconds)
+        return "rested"
+
+    handler = ToolHandler(default_timeout=0.5)
+    handler.add(nap)
+
+    response = await handler.call_tool(
+        {"tool_id": "nap", "input": {"seconds": 0.01}, "deadline_ms": 200}, None
+    )
+    assert response["value"] == "rested"
+
+    with pytest.raises(ToolCallError, match="timed out after 0.05s"):
+        await handler.call_tool(
+            {"tool_id": "nap", "input": {"seconds": 0.3}, "deadline_ms": 50}, None
+        )
+
+    with pytest.raises(ToolCallError, match="timed out after 0.5s"):
+        await handler.call_tool({"tool_id": "nap", "input": {"seconds": 1}}, None)
+
+    for deadline_ms in (0, -5):
+        with pytest.raises(HTTPException) as exc_info:
+            await handler.call_tool(
+                {"tool_id": "nap", "input": {"seconds": 0}, "deadline_ms": deadline_ms},
+                None,
+            )
+        assert exc_info.value.status_code == 400
+
+
+async def test_cached_results():
+    """Test that results are reused for calls with the same arguments."""
+    calls = []
+
+    @tool(cache=CachePolicy(ttl=60, max_entries=2))
+    def double(x: int, scale: int = 2) -> int:
+        """Double a number."""
+        calls.append(x)
+        return x * scale
+
+    handler = ToolHandler()
+    handler.add(double)
+
+    response = await handler.call_tool({"tool_id": "double", "input": {"x": 1}}, None)
+    assert response["value"] == 2
+    assert response["cached"] is False
+
+    # Same arguments after validation, in a different form
+    response = await handler.call_tool(
+        {"tool_id": "double", "input": {"x": "1"}, "execution_id": "again"}, None
+    )
+    assert response == {
+        "success": True,
+        "execution_id": "again",
+        "value": 2,
+        "cached": True,
+    }
+    assert calls == [1]
+
+    # The least recently used result is evicted
+    await handler.call_tool({"tool_id": "double", "input": {"x": 2}}, None)
+    await handler.call_tool({"tool_id": "double", "input": {"x": 3}}, None)
+    await handler.call_tool({"tool_id": "double", "input": {"x": 1}}, None)
+    assert calls == [1, 2, 3, 1]
+    assert handler.cache_stats() == {"double": {"hits": 1, "misses": 4, "size": 2}}
+
+
+async def test_integers_beyond_64_bits():
+    """Test that integers beyond 64 bits are passed and returned exactly."""
+    calls = []
+
+    @tool(cache=CachePolicy(ttl=60))
+    def square(x: int) -> int:
+        """Square a number."""
+        calls.append(x)
+        return x * x
+
+    server = Server()
+    server._add_tool(square)
+
+    big = 12345678901234567890123
+    body = '{"request": {"tool_id": "square", "input": {"x": %d}}}' % big
+    transport = ASGITransport(app=server, raise_app_exceptions=True)
+    async with AsyncClient(base_url="http://localhost", transport=transport) as client:
+        for _ in range(2):
+            response = await client.post(
+                "/tools/call",
+                content=body,
+                headers={"Content-Type": "application/json"},
+            )
+            assert response.status_code == 200
+            assert response.json()["value"] == big * big
+
+        # Integers differing beyond 64 bits are different calls
+        response = await client.post(
+            "/tools/call",
+            json={"request": {"tool_id": "square", "input": {"x": big + 1}}},
+        )
+        assert response.json()["value"] == (big + 1) ** 2
+
+    assert calls == [big, big + 1]
+
+
+async def test_cached_results_expire(mocker):
+    """Test that cached results are not reused after their time to live."""
+    clock = mocker.patch("langchain_tool_server.cache.time.monotonic")
+    clock.return_value = 100.0
+    calls = []
+
+    @tool(cache=CachePolicy(ttl=10))
+    def now() -> int:
+        """Count calls."""
+        calls.append(1)
+        return len(calls)
+
+    handler = ToolHandler()
+    handler.add(now)
+
+    assert (await handler.call_tool({"tool_id": "now"}, None))["value"] == 1
+    clock.return_value = 109.0
+    assert (await handler.call_tool({"tool_id": "now"}, None))["value"] == 1
+    clock.return_value = 111.0
+    assert (await handler.call_tool({"tool_id": "now"}, None))["value"] == 2
+
+
+def test_cache_key_per_user():
+    """Test that results are only keyed by user when configured."""
+    from langchain_tool_server.cache import ResultCache
+
+    shared = ResultCache(CachePolicy())
+    assert shared.key({"a": 1, "b": 2}, "alice") == shared.key({"b": 2, "a": 1}, "bob")
+
+    per_user = ResultCache(CachePolicy(per_user=True))
+    assert per_user.key({"a": 1}, "alice") != per_user.key({"a": 1}, "bob")
+    assert per_user.key({"a": 1}, "alice") == per_user.key({"a": 1}, "alice")
+
+
+async def test_cache_header():
+    """Test that hits and misses are reported in the X-Tool-Cache header."""
+    server = Server()
+    server._add_tool(add, cache=CachePolicy())
+
+    transport = ASGITransport(app=server, raise_app_exceptions=True)
+    async with AsyncClient(base_url="http://localhost", transport=transport) as client:
+        payload = {"request": {"tool_id": "add", "input": {"x": 1}}}
+        first = await client.post("/tools/call", json=payload)
+        second = await client.post("/tools/call", json=payload)
+
+    assert first.headers["X-Tool-Cache"] == "miss"
+    assert second.headers["X-Tool-Cache"] == "hit"
+    assert second.json()["cached"] is True
+
+
+async def test_coalesced_calls():
+    """Test that concurrent identical calls share one execution."""
+    release = asyncio.Event()
+    calls = []
+
+    @tool(coalesce=True)
+    async def fetch(key: str) -> str:
+        """Fetch a value."""
+        calls.append(key)
+        await release.wait()
+        return key.upper()
+
+    handler = ToolHandler()
+    handler.add(fetch)
+
+    requests = [
+        {"tool_id": "fetch", "input": {"key": "a"}, "execution_id": "1"},
+        {"tool_id": "fetch", "input": {"key": "a"}, "execution_id": "2"},
+        {"tool_id": "fetch", "input": {"key": "b"}, "execution_id": "3"},
+    ]
+    tasks = [asyncio.create_task(handler.call_tool(r, None)) for r in requests]
+    await asyncio.sleep(0.01)
+    release.set()
+    responses = await asyncio.gather(*tasks)
+
+    assert [r["execution_id"] for r in responses] == ["1", "2", "3"]
+    assert [r["value"] for r in responses] == ["A", "A", "B"]
+    assert sorted(calls) == ["a", "b"]
+    assert handler.catalog["fetch"]["flights"].coalesced == 1
+
+    # Calls made after the execution completed run again
+    await handler.call_tool({"tool_id": "fetch", "input": {"key": "a"}}, None)
+    assert len(calls) == 3
+
+
+async def test_coalesced_call_outlives_callers_that_give_up():
+    """Test that the shared execution is only cancelled when nobody waits."""
+    release = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    @tool(coalesce=True)
+    async def fetch() -> str:
+        """Fetch a value."""
+        try:
+            await release.wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "value"
+
+    handler = ToolHandler()
+    handler.add(fetch)
+
+    waiting = asyncio.create_task(handler.call_tool({"tool_id": "fetch"}, None))
+    with pytest.raises(ToolCallError):
+        await handler.call_tool({"tool_id": "fetch", "deadline_ms": 10}, None)
+    assert not cancelled.is_set()
+
+    release.set()
+    assert (await waiting)["value"] == "value"
+
+    release.clear()
+    with pytest.raises(ToolCallError):
+        await handler.call_tool({"tool_id": "fetch", "deadline_ms": 10}, None)
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+
+async def test_coalesced_mcp_calls():
+    """Test that proxied MCP calls can be coalesced."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    from langchain_tool_server.mcp_loader import MCPToolAdapter
+
+    release = asyncio.Event()
+
+    async def ainvoke(args):
+        await release.wait()
+        return "sunny"
+
+    base_tool = MagicMock()
+    base_tool.name = "weather.forecast"
+    base_tool.description = "Forecast."
+    base_tool.args_schema = {"type": "object", "properties": {"city": {}}}
+    base_tool.ainvoke = AsyncMock(side_effect=ainvoke)
+
+    handler = ToolHandler()
+    handler.add(MCPToolAdapter(base_tool), coalesce=True)
+
+    request = {"tool_id": "weather.forecast", "input": {"city": "Paris"}}
+    tasks = [asyncio.create_task(handler.call_tool(request, None)) for _ in range(5)]
+    await asyncio.sleep(0.01)
+    release.set()
+
+    assert [r["value"] for r in await asyncio.gather(*tasks)] == ["sunny"] * 5
+    assert base_tool.ainvoke.await_count == 1
+
+
+async def test_orjson_encoding():
+    """Test that outputs are encoded with orjson, including Pydantic models."""
+    from datetime import datetime
+
+    from pydantic import BaseModel
+
+    class Event(BaseModel):
+        name: str
+        at: datetime
+
+    @tool
+    async def next_event() -> Event:
+        """Get the next event."""
+        return Event(name="launch", at=datetime(2025, 1, 1, 12))
+
+    server = Server()
+    server._add_tool(next_event)
+
+    transport = ASGITransport(app=server, raise_app_exceptions=True)
+    async with AsyncClient(base_url="http://localhost", transport=transport) as client:
+        response = await client.post(
+            "/tools/call", json={"request": {"tool_id": "next_event"}}
+        )
+        assert response.status_code == 200
+        assert response.json()["value"] == {
+            "name": "launch",
+            "at": "2025-01-01T12:00:00",
+        }
+
+        response = await client.post(
+            "/tools/call",
+            content=b'{"request": ',
+            headers={"Content-Type": "application/json"},
+        )
+        assert response.status_code == 422
+
+
+async def test_listing_is_cached_until_the_catalog_changes():
+    """Test that listings are built once and rebuilt when a tool is added."""
+    handler = ToolHandler()
+    handler.add(add)
+
+    listing = handler.get_listing(None)
+    assert handler.get_listing(None) is listing
+    assert [t["name"] for t in await handler.list_tools(None)] == ["add"]
+
+    handler.add(greet)
+    new_listing = handler.get_listing(None)
+    assert new_listing is not listing
+    assert new_listing.etag != listing.etag
+    assert [t["name"] for t in new_listing.tools] == ["add", "greet"]
+
+
+async def test_listing_etag():
+    """Test that unchanged listings are answered with 304 Not Modified."""
+    server = Server()
+    server._add_tool(add)
+
+    transport = ASGITransport(app=server, raise_app_exceptions=True)
+    async with AsyncClient(base_url="http://localhost", transport=transport) as client:
+        response = await client.get("/tools")
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert [t["name"] for t in response.json()] == ["add"]
+
+        response = await client.get("/tools", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+        server._add_tool(greet)
+        response = await client.get("/tools", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+
+async def test_permissions_are_checked_with_scope_masks():
+    """Test that tools are filtered by the scopes of the caller."""
+    from types import SimpleNamespace
+
+    from starlette.authentication import AuthCredentials
+    from starlette.requests import Request
+
+    def request_with(*scopes: str) -> Request:
+        return Request(
+            {
+                "type": "http",
+                "headers": [],
+                "auth": AuthCredentials(scopes),
+                "user": SimpleNamespace(identity="ada"),
+            }
+        )
+
+    handler = ToolHandler()
+    handler.auth_enabled = True
+    handler.add(add, permissions=["math"])
+    handler.add(greet, permissions=["math", "chat"])
+
+    assert handler.catalog["add"]["permission_mask"] == 0b01
+    assert handler.catalog["greet"]["permission_mask"] == 0b11
+
+    def visible(request: Request) -> list[str]:
+        return [t["name"] for t in handler.get_listing(request).tools]
+
+    assert visible(request_with()) == []
+    assert visible(request_with("math", "unrelated")) == ["add"]
+    assert visible(request_with("chat", "math")) == ["add", "greet"]
+    # Scopes that no tool requires do not create distinct listings
+    assert handler.get_listing(request_with("math")) is handler.get_listing(
+        request_with("math", "other")
+    )
+
+    response = await handler.call_tool(
+        {"tool_id": "add", "input": {"x": 1}}, request_with("math")
+    )
+    assert response["value"] == 2
+    with pytest.raises(HTTPException) as exc_info:
+        await handler.call_tool(
+            {"tool_id": "greet", "input": {"name": "Ada"}}, request_with("math")
+        )
+    assert exc_info.value.status_code == 403
+
+
+async def test_listing_pagination_and_projection():
+    """Test that listings can be paged with cursors and projected on fields."""
+    from langchain_tool_server.mcp import MCPStreamableHandler
+
+    server = Server(enable_mcp=True)
+    server._add_tools(add, greet)
+
+    transport = ASGITransport(app=server, raise_app_exceptions=True)
+    async with AsyncClient(base_url="http://localhost", transport=transport) as client:
+        response = await client.get("/tools", params={"limit": 1, "fields": "name"})
+        assert response.json() == [{"id": "add", "name": "add"}]
+        cursor = response.headers["X-Next-Cursor"]
+
+        response = await client.get("/tools", params={"limit": 1, "cursor": cursor})
+        assert [t["name"] for t in response.json()] == ["greet"]
+        assert "input_schema" in response.json()[0]
+        assert "X-Next-Cursor" not in response.headers
+        etag = response.headers["ETag"]
+
+        response = await client.get(
+            "/tools",
+            params={"limit": 1, "cursor": cursor},
+            headers={"If-None-Match": etag},
+        )
+        assert response.status_code == 304
+
+        response = await client.get("/tools", params={"fields": "name,schema"})
+        assert response.status_code == 400
+        assert "Unknown field(s): schema" in response.json()["detail"]
+
+        response = await client.get("/tools", params={"cursor": "bm9wZQ"})
+        assert response.status_code == 400
+
+    handler = MCPStreamableHandler(server.tool_handler, page_size=1)
+    pages = []
+    cursor = None
+    while True:
+        params = {"cursor": cursor} if cursor else {}
+        response = await handler.handle_tools_list(
+            None, {"id": 1, "params": params}, None
+        )
+        result = json.loads(response.body)["result"]
+        pages.append([t["name"] for t in result["tools"]])
+        cursor = result.get("nextCursor")
+        if cursor is None:
+            break
+    assert pages == [["add"], ["greet"]]
+
+
+async def test_catalog_changes_since_version():
+    """Test that clients can sync the catalog from a version."""
+    versions = []
+    handler = ToolHandler()
+    handler.add_listener(versions.append)
+    handler.add(add)
+    assert handler.version == 1
+
+    changes = handler.changes_since(1, handler.epoch, None)
+    assert changes["added"] == changes["changed"] == changes["removed"] == []
+
+    handler.add(greet)
+    handler.add(add, permissions=["math"], replace=True)
+    changes = handler.changes_since(1, handler.epoch, None)
+    assert changes["version"] == 3
+    assert not changes["reset"]
+    assert [t["id"] for t in changes["added"]] == ["greet"]
+    assert [t["id"] for t in changes["changed"]] == ["add"]
+
+    handler.remove("add")
+    handler.remove("greet")
+    changes = handler.changes_since(1, handler.epoch, None)
+    # Tools added and removed since the version are not reported
+    assert changes["added"] == changes["changed"] == []
+    assert changes["removed"] == ["add"]
+    assert versions == [1, 2, 3, 4, 5]
+
+    with pytest.raises(ValueError, match="Tool add not found"):
+        handler.remove("add")
+
+    # Unknown versions and epochs get the full catalog
+    handler.add(add)
+    assert handler.changes_since(99, None, None)["reset"]
+    changes = handler.changes_since(5, "other", None)
+    assert changes["reset"]
+    assert [t["id"] for t in changes["added"]] == ["add"]
+
+
+async def test_catalog_changes_follow_permissions():
+    """Test that tools whose permissions change are added or removed per caller."""
+    from types import SimpleNamespace
+
+    from starlette.authentication import AuthCredentials
+    from starlette.requests import Request
+
+    def request_with(*scopes: str) -> Request:
+        return Request(
+            {
+                "type": "http",
+                "headers": [],
+                "auth": AuthCredentials(scopes),
+                "user": SimpleNamespace(identity="ada"),
+            }
+        )
+
+    handler = ToolHandler()
+    handler.auth_enabled = True
+    handler.add(add, permissions=["math"])
+    handler.add(greet, permissions=["chat"])
+    since = handler.version
+
+    # Tightened: the caller can no longer see the tool
+    handler.add(add, permissions=["math", "admin"], replace=True)
+    # Loosened: the caller can now see the tool
+    handler.add(greet, permissions=["math"], replace=True)
+
+    changes = handler.changes_since(since, handler.epoch, request_with("math"))
+    assert changes["removed"] == ["add"]
+    assert [t["id"] for t in changes["added"]] == ["greet"]
+    assert changes["changed"] == []
+
+    # A caller who can see both tools before and after gets them as changed
+    changes = handler.changes_since(
+        since, handler.epoch, request_with("math", "chat", "admin")
+    )
+    assert [t["id"] for t in changes["changed"]] == ["add", "greet"]
+    assert changes["added"] == changes["removed"] == []
+
+
+async def test_catalog_changes_endpoint():
+    """Test the delta sync endpoint."""
+    server = Server()
+    server._add_tool(add)
+
+    transport = ASGITransport(app=server, raise_app_exceptions=True)
+    async with AsyncClient(base_url="http://localhost", transport=transport) as client:
+        response = await client.get("/tools")
+        version = response.headers["X-Catalog-Version"]
+        epoch = response.headers["X-Catalog-Epoch"]
+
+        server._add_tool(greet)
+        response = await client.get(
+            "/tools/changes", params={"since": version, "epoch": epoch}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["version"] == int(version) + 1
+        assert [t["name"] for t in data["added"]] == ["greet"]
+
+
+async def test_get_tool():
+    """Test that a single tool definition can be fetched by ID."""
+    server = Server()
+
+    @tool
+    def search(query: str) -> str:
+        """Search, named like the search route."""
+        return query
+
+    server._add_tools(add, search)
+
+    transport = ASGITransport(app=server, raise_app_exceptions=True)
+    async with AsyncClient(base_url="http://localhost", transport=transport) as client:
+        response = await client.get("/tools/definitions/add")
+        assert response.status_code == 200
+        assert response.json() == (await client.get("/tools")).json()[0]
+
+        response = await client.get(
+            "/tools/definitions/add",
+            headers={"If-None-Match": response.headers["ETag"]},
+        )
+        assert response.status_code == 304
+
+        response = await client.get("/tools/definitions/search")
+        assert response.json()["name"] == "search"
+
+        response = await client.get("/tools/definitions/missing")
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Tool missing not found"
+
+
+async def test_replace_all_swaps_the_catalog():
+    """Test that calls in flight finish on the tools they started with."""
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    @tool
+    async def slow() -> str:
+        """Slow tool."""
+        started.set()
+        await release.wait()
+        return "v1"
+
+    slow_v1 = slow
+
+    @tool
+    async def slow() -> str:
+        """Slow tool, improved."""
+        return "v2"
+
+    slow_v2 = slow
+
+    handler = ToolHandler()
+    handler.add(slow_v1)
+    handler.add(add)
+    call = asyncio.create_task(
+        handler.call_tool({"tool_id": "slow", "input": {}}, None)
+    )
+    await started.wait()
+
+    changes = handler.replace_all([(slow_v2, {}), (greet, {})])
+    assert [(c.tool_id, c.kind) for c in changes] == [
+        ("add", "removed"),
+        ("slow", "changed"),
+        ("greet", "added"),
+    ]
+    assert set(handler.catalog) == {"slow", "greet"}
+    assert [r[0] for r in handler.search_index.search("greet")] == ["greet"]
+
+    release.set()
+    assert (await call)["value"] == "v1"
+    assert (await handler.call_tool({"tool_id": "slow", "input": {}}, None))[
+        "value"
+    ] == "v2"
+
+    # Invalid tools leave the catalog untouched
+    with pytest.raises(ValueError, match="already exists"):
+        handler.replace_all([(greet, {}), (greet, {})])
+    assert set(handler.catalog) == {"slow", "greet"}
+    assert handler.replace_all([(slow_v2, {}), (greet, {})]) == []
+
+
+async def test_replace_all_forgets_removed_schemas_and_scopes():
+    """Test that reloading does not keep the schemas and scopes of old tools."""
+    from types import SimpleNamespace
+
+    from starlette.authentication import AuthCredentials
+    from starlette.requests import Request
+
+    request = Request(
+        {
+            "type": "http",
+            "headers": [],
+            "auth": AuthCredentials(["math"]),
+            "user": SimpleNamespace(identity="ada"),
+        }
+    )
+
+    handler = ToolHandler()
+    handler.auth_enabled = True
+    handler.replace_all([(add, {"permissions": ["math"]})])
+    schemas = len(handler.schemas)
+    since = handler.version
+    assert [t["id"] for t in handler.get_listing(request).tools] == ["add"]
+
+    for release in range(3):
+        handler.replace_all(
+            [
+                (add, {"permissions": ["math"]}),
+                (greet, {"permissions": [f"r{release}"]}),
+            ]
+        )
+    handler.replace_all([(add, {"permissions": ["admin", "math"]})])
+    assert len(handler.schemas) == schemas
+    assert len(handler.scopes) == 2
+
+    # Masks of the request are computed again against the rebuilt index
+    assert handler.get_listing(request).tools == []
+    assert handler.changes_since(since, handler.epoch, request)["removed"] == ["add"]
+
+
+TOOLKIT_SOURCE = '''
+from langchain_tool_server import tool
+
+
+@tool
+def echo(text: str) -> str:
+    """Echo text."""
+    return {result}
+
+
+TOOLS = [echo]
+'''
+
+
+def _write_toolkit(path: Path, result: str) -> None:
+    (path / "toolkit.toml").write_text(
+        '[toolkit]\ntools = "./echo_toolkit/__init__.py:TOOLS"\n'
+    )
+    package = path / "echo_toolkit"
+    package.mkdir(exist_ok=True)
+    (package / "__init__.py").write_text(TOOLKIT_SOURCE.format(result=result))
+
+
+async def test_reload_toolkit(tmp_path):
+    """Test that the tools of a toolkit can be reloaded."""
+    _write_toolkit(tmp_path, "text")
+    server = Server.from_toolkit(str(tmp_path))
+    handler = server.tool_handler
+    call = {"tool_id": "echo", "input": {"text": "hi"}}
+    assert (await handler.call_tool(call, None))["value"] == "hi"
+
+    _write_toolkit(tmp_path, "text.upper()")
+    changes = await server.reload()
+    assert changes == []  # The definition of the tool is the same
+    assert (await handler.call_tool(call, None))["value"] == "HI"
+
+    # Broken toolkits keep the current tools
+    (tmp_path / "echo_toolkit" / "__init__.py").write_text("TOOLS = 'echo'\n")
+    with pytest.raises(ValueError, match="Expected a list of tools"):
+        await server.reload()
+    assert (await handler.call_tool(call, None))["value"] == "HI"
+
+    with pytest.raises(ValueError, match="created from a toolkit"):
+        await Server().reload()
+
+
+async def test_unknown_tool_options_are_reported(tmp_path, mocker):
+    """Test that options for a tool the toolkit does not have are reported."""
+    import langchain_tool_server
+
+    warning = mocker.patch.object(langchain_tool_server.logger, "warning")
+    _write_toolkit(tmp_path, "text")
+    with open(tmp_path / "toolkit.toml", "a") as f:
+        f.write("[tools.echo]\nmax_concurrency = 2\n[tools.ecoh]\ntimeout = 5\n")
+
+    server = Server.from_toolkit(str(tmp_path))
+    assert server.tool_handler.catalog["echo"]["bulkhead"].max_concurrency == 2
+    warning.assert_called_once()
+    assert "'ecoh'" in warning.call_args.args[0]
+
+    warning.reset_mock()
+    await server.reload()
+    warning.assert_called_once()
+    assert "'ecoh'" in warning.call_args.args[0]
+
+    # Options name the tools of namespaced toolkits without their namespace
+    warning.reset_mock()
+    toolkits = Path(__file__).parent.parent / "toolkits"
+    Server.from_toolkit([str(toolkits / "options"), str(toolkits / "basic")])
+    warning.assert_not_called()
+
+
+async def test_watch_toolkit(tmp_path):
+    """Test that toolkits are reloaded when their files change."""
+    _write_toolkit(tmp_path, "text")
+    server = Server.from_toolkit(str(tmp_path), watch_interval=0.01)
+    watcher = asyncio.create_task(server._watch_toolkit())
+    try:
+        await asyncio.sleep(0.05)
+        (tmp_path / "toolkit.toml").write_text(
+            '[toolkit]\ntools = "./echo_toolkit/__init__.py:TOOLS"\n'
+            "[tools.echo]\nmax_concurrency = 2\n"
+        )
+        for _ in range(100):
+            if server.tool_handler.catalog["echo"].get("bulkhead"):
+                break
+            await asyncio.sleep(0.02)
+        assert server.tool_handler.catalog["echo"]["bulkhead"].max_concurrency == 2
+    finally:
+        watcher.cancel()